@@ -0,0 +1,552 @@
+#!/usr/bin/env python3
+# bench_obfus.py
+# Benchmark for every method in obfus_ai.ALL_METHODS on synthetic, offline corpora.
+#   python bench_obfus.py                                   # 1K, 64K, 1M for every group
+#   python bench_obfus.py --sizes 1K,1M,100M -g exe -g config
+#   python bench_obfus.py --save-baseline bench_baseline.json
+#   python bench_obfus.py --baseline bench_baseline.json    # exit code 1 on regressions
+#   python bench_obfus.py -g decoder --sizes 1M,100M         # restore speed of generated decoders
+#   python bench_obfus.py --import-budget 100               # cold start of the headless path
+#   python bench_obfus.py --determinism 4                   # serial, reversed and 4-process runs match
+#   python bench_obfus.py --xor-speedup --sizes 1M          # xor_bytes against the original per-byte loop
+
+import os, sys, time, json, random, shutil, hashlib, argparse, tempfile, tracemalloc, platform, warnings, subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    import obfus_ai
+
+DEFAULT_SIZES = "1K,64K,1M"
+SIZE_UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+XOR_KEY = b"bench_xor"
+CUSTOM_KEY = "bench_key_123"
+
+# -------------------------
+# Synthetic corpora
+# -------------------------
+PY_SNIPPET = '''
+def compute_{i}(value_{i}, count={n}):
+    """Helper number {i}."""
+    message = "item {i} processed at http://api{n}.example.com/v1"
+    total = value_{i} * {n} + count
+    if total > {m}:
+        print(message, total)
+    return [x + {n} for x in range(count)]
+'''
+
+PS_SNIPPET = '''
+function Invoke-Step{i} {{
+    param([string]$Name = "step{i}", [int]$Count = {n})
+    $message = "Processing $Name against 10.0.{n}.{m}"
+    Write-Host $message
+    for ($j = 0; $j -lt $Count; $j++) {{ $total += $j * {m} }}
+    return $total
+}}
+'''
+
+JS_SNIPPET = '''
+function handler{i}(request, count) {{
+    // handler {i}
+    const message = "request {i} from https://cdn{n}.example.org/lib.js";
+    let total = count * {n} + {m};
+    if (total > {m}) {{ console.log(message, total); }}
+    return [1, 2, 3].map(function (x) {{ return x + {n}; }});
+}}
+'''
+
+CPP_SNIPPET = '''
+// worker {i}
+int worker_{i}(int value, int count) {{
+    const char* message = "worker {i} started";
+    int total = value * {n} + count;
+    if (total > {m}) {{ printf("%s %d\\n", message, total); }}
+    return total ^ {m};
+}}
+'''
+
+HTML_SNIPPET = '''
+<div class="card-{i}" id="item{i}">
+    <!-- card {i} -->
+    <h2>  Title number {i}  </h2>
+    <p>Visit <a href="https://site{n}.example.com/page{i}">page {i}</a> or ping 192.168.{n}.{m}</p>
+    <img src="img/picture{i}.png" alt="picture {i}">
+</div>
+'''
+
+CSS_SNIPPET = '''
+/* block {i} */
+.card-{i} {{
+    margin: {n}px  auto;
+    padding : {m}px;
+    background: url("img/bg{i}.png") no-repeat;
+    color: #{n:02x}{m:02x}{n:02x};
+}}
+'''
+
+UNIVERSAL_SNIPPET = '''
+[section_{i}]
+name = entry {i}
+endpoint = https://service{n}.example.net/api/v{m}
+address = 172.16.{n}.{m}
+note = "line {i} of the generic corpus"
+'''
+
+TEXT_SNIPPETS = {
+    "python": (PY_SNIPPET, ".py"),
+    "powershell": (PS_SNIPPET, ".ps1"),
+    "js": (JS_SNIPPET, ".js"),
+    "cpp": (CPP_SNIPPET, ".cpp"),
+    "html": (HTML_SNIPPET, ".html"),
+    "css": (CSS_SNIPPET, ".css"),
+    "universal": (UNIVERSAL_SNIPPET, ".txt"),
+}
+
+def parse_size(s: str) -> int:
+    s = s.strip().upper().rstrip("B")
+    if s and s[-1] in SIZE_UNITS:
+        return int(float(s[:-1]) * SIZE_UNITS[s[-1]])
+    return int(s)
+
+def format_size(n: int) -> str:
+    for unit, scale in (("G", 1 << 30), ("M", 1 << 20), ("K", 1 << 10)):
+        if n >= scale and n % scale == 0:
+            return f"{n // scale}{unit}"
+    return str(n)
+
+def make_text(group: str, size: int, seed: int = 0) -> str:
+    snippet = TEXT_SNIPPETS[group][0]
+    rng = random.Random(seed)
+    parts, total, i = [], 0, 0
+    while total < size:
+        part = snippet.format(i=i, n=rng.randrange(256), m=rng.randrange(256))
+        parts.append(part)
+        total += len(part)
+        i += 1
+    return "".join(parts)
+
+def make_bytes(size: int, seed: int = 0) -> bytes:
+    body = random.Random(seed).getrandbits(max(size - 2, 0) * 8).to_bytes(max(size - 2, 0), "little")
+    return b"MZ" + body
+
+def make_json(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    items, total, i = [], 0, 0
+    while total < size:
+        item = {"id": i, "name": f"item {i}", "enabled": bool(i & 1),
+                "endpoint": f"https://svc{rng.randrange(256)}.example.com/{i}",
+                "tags": [f"tag{rng.randrange(100)}", f"group{i % 7}"],
+                "owner": {"user": f"user{rng.randrange(1000)}", "role": "admin"}}
+        items.append(item)
+        total += len(json.dumps(item)) + 2
+        i += 1
+    return json.dumps({"version": 1, "items": items}, indent=1)
+
+def make_xml(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts, total, i = ['<?xml version="1.0" encoding="utf-8"?>\n<config>\n'], 0, 0
+    while total < size:
+        part = (f'  <item id="{i}" name="item {i}">\n'
+                f'    <endpoint>https://svc{rng.randrange(256)}.example.com/{i}</endpoint>\n'
+                f'    <owner role="admin">user{rng.randrange(1000)}</owner>\n'
+                f'  </item>\n')
+        parts.append(part)
+        total += len(part)
+        i += 1
+    parts.append("</config>\n")
+    return "".join(parts)
+
+# -------------------------
+# Decoders
+# -------------------------
+# Generated decoder scripts, run in a fresh interpreter on the output of these methods
+DECODER_CASES = {
+    "DEC · EXE (XOR + Segmentation)": ".exe",
+    "DEC · Text (Base64)": ".py",
+    "DEC · Image (XOR)": ".png",
+}
+
+def make_decoder_case(name: str, size: int, workdir: str) -> dict:
+    """Obfuscate a synthetic input, generate its decoder and keep a copy, since decoders delete themselves."""
+    ext = DECODER_CASES[name]
+    path = os.path.join(workdir, f"decoder_{size}{ext}")
+    random.seed(0)
+    args = []
+    if ext == ".exe":
+        engine = obfus_ai.ObfuscationEngine({"exe": ["EXE · XOR Encryption", "EXE · Byte Segmentation"]}, XOR_KEY)
+        obfus_ai.write_bytes(path, engine.apply_exe_methods(make_bytes(size)))
+        decoder = obfus_ai.gen_decoder_for_exe(path, XOR_KEY)
+    elif ext == ".py":
+        obfus_ai.write_text(path, obfus_ai.uni_base64(make_text("python", size)))
+        decoder = obfus_ai.gen_decoder_for_text(path, b"")
+    else:
+        source = os.path.join(workdir, f"image_{size}{ext}")
+        obfus_ai.write_bytes(source, make_bytes(size))
+        _, path = obfus_ai.image_xor_encrypt(source, CUSTOM_KEY)
+        decoder = obfus_ai.gen_decoder_for_images(path, CUSTOM_KEY)
+        args = [path]
+    script = decoder + ".src"
+    os.replace(decoder, script)
+    return {"input": path, "script": script, "decoder": decoder, "args": args}
+
+# Runs a decoder as __main__ and reports the interpreter's peak RSS (VmHWM, Linux only) on stderr;
+# rusage of the child would include the benchmark process it was forked from
+DECODER_RUNNER = """import os, sys, runpy
+sys.argv = sys.argv[1:]
+try:
+    runpy.run_path(sys.argv[0], run_name="__main__")
+finally:
+    if os.path.exists("/proc/self/status"):
+        with open("/proc/self/status") as f:
+            sys.stderr.write("".join(line for line in f if line.startswith("VmHWM:")))
+"""
+
+def run_decoder(case: dict) -> tuple[int, int]:
+    """Run the decoder once; returns (restored bytes, peak RSS of the decoder or 0 if unknown)."""
+    workdir = os.path.dirname(case["input"])
+    shutil.copyfile(case["script"], case["decoder"])
+    before = set(os.listdir(workdir))
+    proc = subprocess.run([sys.executable, "-c", DECODER_RUNNER, case["decoder"]] + case["args"],
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, cwd=workdir)
+    if proc.returncode:
+        raise RuntimeError(f"decoder exited with {proc.returncode}: {proc.stderr.strip()[-200:]}")
+    peak = 0
+    for line in proc.stderr.splitlines():
+        if line.startswith("VmHWM:"):
+            peak = int(line.split()[1]) * 1024
+    restored = [os.path.join(workdir, f) for f in set(os.listdir(workdir)) - before]
+    if not restored:
+        raise RuntimeError("decoder wrote no output")
+    size = sum(os.path.getsize(f) for f in restored)
+    for f in restored:
+        os.remove(f)
+    return size, peak
+
+# -------------------------
+# Cases
+# -------------------------
+def iter_cases(groups):
+    """Yield (group, method_name, kind) for each method to benchmark.
+
+    kind is "text" (str in, str out), "bytes" (EXE data in, bytes out) or a
+    file extension for methods that read a path (configs and images).
+    """
+    for group in groups:
+        if group == "exe":
+            for name in obfus_ai.EXE_METHODS:
+                yield group, name, "bytes"
+        elif group == "config":
+            for name in obfus_ai.CONFIG_METHODS:
+                yield group, name, ".json" if "JSON" in name else ".xml"
+        elif group == "image":
+            for name in obfus_ai.IMAGE_METHODS:
+                yield group, name, ".png"
+        elif group == "decoder":
+            for name in DECODER_CASES:
+                yield group, name, "decoder"
+        else:
+            for name in obfus_ai.LANG_TEXT_METHODS[group]:
+                yield group, name, "text"
+
+def text_corpus(group: str, name: str) -> str:
+    """AST methods are timed on the python corpus: any other text only times their parse-error return."""
+    return "python" if obfus_ai.METHOD_SPECS[name].cost == "ast" else group
+
+def make_input(group: str, kind: str, size: int, workdir: str, name: str = ""):
+    if kind == "decoder":
+        return make_decoder_case(name, size, workdir)
+    if kind == "text":
+        return make_text(text_corpus(group, name), size)
+    if kind == "bytes":
+        return make_bytes(size)
+    path = os.path.join(workdir, f"{group}_{size}{kind}")
+    if not os.path.exists(path):
+        if kind == ".json":
+            obfus_ai.write_text(path, make_json(size))
+        elif kind == ".xml":
+            obfus_ai.write_text(path, make_xml(size))
+        else:
+            obfus_ai.write_bytes(path, make_bytes(size))
+    return path
+
+def input_size(kind: str, payload) -> int:
+    if kind == "decoder":
+        return os.path.getsize(payload["input"])
+    if kind == "text":
+        return len(payload.encode("utf-8"))
+    return len(payload) if kind == "bytes" else os.path.getsize(payload)
+
+def method_error(out: str, text: str = None):
+    """The message of a method's in-band error return, or None.
+
+    Methods report failures as a "# ❌ ..." result, or as a "# ... Error: ..."
+    line in front of their unchanged input.
+    """
+    head, _, rest = out.partition("\n")
+    if head.startswith("# ❌"):
+        return head[4:]
+    if head.startswith("# ") and "Error" in head and rest == text:
+        return head[2:]
+    return None
+
+def call_method(engine, group: str, name: str, kind: str, payload):
+    """Run one method the way ObfuscationEngine does; returns the output size in bytes."""
+    random.seed(0)
+    if kind == "decoder":
+        size, payload["peak_rss"] = run_decoder(payload)
+        return size
+    if kind == "text":
+        out, _ = engine._call_text_method(name, obfus_ai.LANG_TEXT_METHODS[group][name], payload, group)
+        error = method_error(out, payload)
+        if error is not None:
+            raise RuntimeError(error)
+        return len(out.encode("utf-8"))
+    if kind == "bytes":
+        return len(engine.apply_exe_methods(payload))
+    func = obfus_ai.ALL_METHODS[name][0]
+    if group == "image":
+        out, out_path = func(payload, engine.custom_key)
+        if not out:
+            raise RuntimeError(out_path)
+        os.remove(out_path)
+        return len(out)
+    msg = func(payload, engine.custom_key)
+    error = method_error(msg)
+    if error is not None:
+        raise RuntimeError(error)
+    out_path = f"{os.path.splitext(payload)[0]}_obfuscated{os.path.splitext(payload)[1]}"
+    size = os.path.getsize(out_path) if os.path.exists(out_path) else 0
+    if os.path.exists(out_path):
+        os.remove(out_path)
+    return size
+
+def bench_case(group, name, kind, size, workdir, repeat, measure_memory):
+    engine = obfus_ai.ObfuscationEngine({group: [name]}, XOR_KEY, CUSTOM_KEY)
+    payload = make_input(group, kind, size, workdir, name)
+    size_in = input_size(kind, payload)
+    row = {"group": group, "method": name, "size": size, "bytes_in": size_in}
+    try:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            size_out = call_method(engine, group, name, kind, payload)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        row.update(seconds=best, bytes_out=size_out,
+                   mb_per_s=size_in / (1 << 20) / best if best > 0 else None)
+        if kind == "decoder":
+            # The work happens in a child interpreter: report its peak RSS instead of the Python heap
+            if measure_memory and payload.get("peak_rss"):
+                row["peak_bytes"] = payload["peak_rss"]
+        elif measure_memory:
+            tracemalloc.start()
+            try:
+                call_method(engine, group, name, kind, payload)
+                row["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+# -------------------------
+# Cold start
+# -------------------------
+# Must not be imported by `import obfus_ai`: GUI and optional method dependencies
+HEAVY_MODULES = ("tkinter", "tkinterdnd2", "ttkthemes", "pygments", "clang", "dnlib", "numpy")
+
+def measure_import(repeat: int = 5) -> tuple[float, list]:
+    """Best cumulative `python -X importtime` of obfus_ai in fresh interpreters, in ms,
+    and the heavy modules that import pulled in."""
+    code = "import sys, obfus_ai; print(' '.join(sorted({m.split('.')[0] for m in sys.modules})))"
+    best, heavy = None, []
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+        for line in proc.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == "obfus_ai":
+                ms = int(fields[1]) / 1000
+                best = ms if best is None else min(best, ms)
+        heavy = [m for m in HEAVY_MODULES if m in proc.stdout.split()]
+    return best, heavy
+
+# -------------------------
+# XOR kernel speedup
+# -------------------------
+XOR_KEY_LENGTHS = (1, 8, len(XOR_KEY), 37)
+
+def reference_xor(data: bytes, key: bytes) -> bytes:
+    """The per-byte loop exe_xor used before xor_bytes."""
+    out = bytearray(len(data))
+    for i, b in enumerate(data):
+        out[i] = b ^ key[i % len(key)]
+    return bytes(out)
+
+def measure_xor_speedup(size: int, repeat: int) -> dict:
+    """Best-of-repeat time of reference_xor divided by that of xor_bytes, per key length.
+
+    Both are timed alternately on the same buffer so load on the machine hits them alike.
+    """
+    data = make_bytes(size)
+    speedups = {}
+    for klen in XOR_KEY_LENGTHS:
+        key = make_bytes(klen, seed=klen)
+        best = {}
+        for _ in range(repeat):
+            for name, func in (("reference", reference_xor), ("kernel", obfus_ai.xor_bytes)):
+                start = time.perf_counter()
+                func(data, key)
+                best[name] = min(best.get(name, float("inf")), time.perf_counter() - start)
+        speedups[klen] = best["reference"] / best["kernel"]
+    return speedups
+
+# -------------------------
+# Reproducibility
+# -------------------------
+DETERMINISM_SEED = "bench"
+
+def make_corpus(directory: str, size: int) -> list:
+    """One synthetic input per method group (two EXEs), written under directory; returns the paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for group, (_, ext) in TEXT_SNIPPETS.items():
+        paths.append(os.path.join(directory, f"{group}{ext}"))
+        obfus_ai.write_text(paths[-1], make_text(group, size))
+    for i in range(2):
+        paths.append(os.path.join(directory, f"app{i}.exe"))
+        obfus_ai.write_bytes(paths[-1], make_bytes(size, seed=i))
+    paths.append(os.path.join(directory, "settings.json"))
+    obfus_ai.write_text(paths[-1], make_json(size))
+    paths.append(os.path.join(directory, "settings.xml"))
+    obfus_ai.write_text(paths[-1], make_xml(size))
+    paths.append(os.path.join(directory, "logo.png"))
+    obfus_ai.write_bytes(paths[-1], make_bytes(size, seed=7))
+    return paths
+
+def check_determinism(workers: int, size: int) -> list:
+    """Run every non-.NET method over the corpus serially, in reverse order and on `workers`
+    processes with the same seed; return the outputs that are not byte-identical across runs."""
+    methods = [name for name, (_, kind) in obfus_ai.ALL_METHODS.items() if kind not in ("dotnet", "resx")]
+    digests = {}
+    with tempfile.TemporaryDirectory(prefix="obfus_determinism_") as workdir:
+        for label, jobs, reverse in (("serial", 1, False), ("reversed", 1, True), ("parallel", workers, False)):
+            directory = os.path.join(workdir, label)
+            paths = make_corpus(directory, size)
+            engine = obfus_ai.ObfuscationEngine(methods, XOR_KEY, CUSTOM_KEY, workers=jobs, seed=DETERMINISM_SEED)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                engine.run(paths[::-1] if reverse else paths)
+            for name in sorted(set(os.listdir(directory)) - {os.path.basename(p) for p in paths}):
+                with open(os.path.join(directory, name), "rb") as f:
+                    digests.setdefault(name, {})[label] = hashlib.sha256(f.read()).hexdigest()
+    return sorted(name for name, runs in digests.items() if len(runs) != 3 or len(set(runs.values())) != 1)
+
+# -------------------------
+# Baselines
+# -------------------------
+def row_key(row) -> str:
+    return f"{row['group']}|{row['method']}|{row['size']}"
+
+def compare(rows, baseline: dict, threshold: float) -> list:
+    """Annotate rows with ratios against the baseline; return the regressed ones."""
+    previous = {row_key(r): r for r in baseline.get("results", [])}
+    regressions = []
+    for row in rows:
+        old = previous.get(row_key(row))
+        if not old or "seconds" not in row or "seconds" not in old:
+            continue
+        row["time_ratio"] = row["seconds"] / old["seconds"] if old["seconds"] else None
+        if row.get("peak_bytes") is not None and old.get("peak_bytes"):
+            row["peak_ratio"] = row["peak_bytes"] / old["peak_bytes"]
+        if (row["time_ratio"] or 0) > 1 + threshold or row.get("peak_ratio", 0) > 1 + threshold:
+            regressions.append(row)
+    return regressions
+
+def format_row(row) -> str:
+    label = f"{row['group']:<10} {row['method'][:46]:<46} {format_size(row['size']):>5}"
+    if "error" in row:
+        return f"{label}  ❌ {row['error'][:60]}"
+    if row.get("skipped"):
+        return f"{label}  skipped ({row['skipped']})"
+    line = f"{label} {row['seconds'] * 1000:10.2f} ms {row['mb_per_s'] or 0:9.2f} MB/s"
+    if "peak_bytes" in row:
+        line += f" {row['peak_bytes'] / (1 << 20):9.2f} MiB"
+    if row.get("time_ratio"):
+        line += f"  x{row['time_ratio']:.2f}"
+    return line
+
+def main(argv=None) -> int:
+    groups_all = [g for g in obfus_ai.LANG_TEXT_METHODS if g in TEXT_SNIPPETS] + ["exe", "config", "image", "decoder"]
+    parser = argparse.ArgumentParser(description="Benchmark Multi-Obfuscator Pro methods on synthetic corpora")
+    parser.add_argument("-g", "--group", action="append", choices=groups_all, dest="groups",
+                        help="method group to benchmark (repeatable, default: all)")
+    parser.add_argument("-k", "--filter", default="", help="only methods whose name contains this text")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated input sizes, e.g. 1K,1M,100M")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (best is kept)")
+    parser.add_argument("--budget", type=float, default=30.0,
+                        help="skip larger sizes of a method once one run takes longer than this many seconds")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory run")
+    parser.add_argument("--json", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against a JSON file written by --save-baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="relative slowdown or memory growth that counts as a regression")
+    parser.add_argument("--save-baseline", help="write the results as a new baseline file")
+    parser.add_argument("--import-budget", type=float, metavar="MS",
+                        help="only check that importing obfus_ai takes at most MS and loads no GUI/optional modules")
+    parser.add_argument("--determinism", type=int, metavar="N",
+                        help="only check that seeded outputs are identical serially, in reverse order and on N workers")
+    parser.add_argument("--xor-speedup", action="store_true",
+                        help="only time xor_bytes against the original per-byte loop at the first --sizes entry")
+    args = parser.parse_args(argv)
+    if args.xor_speedup:
+        size = parse_size(args.sizes.split(",")[0])
+        backend = "numpy" if obfus_ai.has_dep("numpy") else "pure Python"
+        for klen, speedup in measure_xor_speedup(size, max(1, args.repeat)).items():
+            print(f"xor_bytes {format_size(size)}, {klen:>2}-byte key ({backend if klen > 1 else 'translate'}): "
+                  f"{speedup:6.1f}x")
+        return 0
+    if args.determinism is not None:
+        size = parse_size(args.sizes.split(",")[0])
+        mismatched = check_determinism(args.determinism, size)
+        print(f"determinism ({format_size(size)} inputs, {args.determinism} workers): "
+              f"{'ok' if not mismatched else 'outputs differ: ' + ', '.join(mismatched)}")
+        return 1 if mismatched else 0
+    if args.import_budget is not None:
+        ms, heavy = measure_import()
+        print(f"import obfus_ai: {ms:.1f} ms (budget {args.import_budget:.0f} ms)")
+        if heavy:
+            print(f"  ❌ imported at startup: {', '.join(heavy)}")
+        return 1 if ms > args.import_budget or heavy else 0
+    sizes = sorted(parse_size(s) for s in args.sizes.split(",") if s.strip())
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="obfus_bench_") as workdir:
+        for group, name, kind in iter_cases(args.groups or groups_all):
+            if args.filter and args.filter.lower() not in name.lower():
+                continue
+            over_budget = False
+            for size in sizes:
+                if over_budget:
+                    row = {"group": group, "method": name, "size": size, "skipped": "over budget"}
+                else:
+                    row = bench_case(group, name, kind, size, workdir, max(1, args.repeat), not args.no_memory)
+                    over_budget = "error" in row or row["seconds"] > args.budget
+                rows.append(row)
+                print(format_row(row), flush=True)
+    results = {"version": obfus_ai.VERSION, "python": platform.python_version(),
+               "machine": platform.machine(), "numpy": obfus_ai.has_dep("numpy"),
+               "created": time.strftime('%Y-%m-%d %H:%M:%S'), "results": rows}
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(rows, json.load(f), args.threshold)
+        print(f"\n{len(regressions)} regression(s) against {args.baseline} (threshold {args.threshold:.0%})")
+        for row in regressions:
+            print("  " + format_row(row))
+    for path in (args.json, args.save_baseline):
+        if path:
+            obfus_ai.write_text(path, json.dumps(results, ensure_ascii=False, indent=2))
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
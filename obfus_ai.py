@@ -8,64 +8,56 @@
 # Версия v2.6: Добавлена ИИ-генерация обфускации и защита от ИИ-деобфускации
 # Обновление: Добавлены продвинутые ИИ-методы обфускации (№4), обфускация ресурсов и конфигураций (№6), обфускация сетевых данных (№9)
 
-import tkinter as tk
-from tkinter import ttk, filedialog, scrolledtext, messagebox
-import os, re, base64, random, string, ast, textwrap, sys, hashlib, time, ctypes
-import platform
+import os, re, base64, random, string, ast, textwrap, sys, hashlib, time, importlib
+import mmap, tempfile, contextlib, contextvars, copy, shutil, struct, collections
 import warnings
 import locale
 import xml.etree.ElementTree as ET  # Для парсинга .resx
 import json  # Для обфускации JSON конфигураций
 
-# Try importing additional libs
-HAS_DND = False
-HAS_DNLIB = False
-HAS_CLANG = False
-HAS_TTKTHEMES = False
-HAS_PYGMENTS = False
-
-try:
-    from tkinterdnd2 import DND_FILES, TkinterDnD
-    HAS_DND = True
-except ImportError:
-    HAS_DND = False
-    warnings.warn("tkinterdnd2 not installed. Drag&Drop disabled. Install with: pip install tkinterdnd2")
+VERSION = "2.6"
 
-try:
-    import dnlib
-    from dnlib import ModuleDefMD
-    HAS_DNLIB = True
-except ImportError:
-    HAS_DNLIB = False
-    warnings.warn("dnlib not installed. .NET obfuscation disabled. Install with: pip install dnlib")
+# -------------------------
+# Optional Dependencies
+# -------------------------
+# Imported on first use so the headless path never pays for them; tkinter is
+# only imported by the GUI (load_gui_modules)
+OPTIONAL_DEPS = {
+    "tkinterdnd2": "tkinterdnd2 not installed. Drag&Drop disabled. Install with: pip install tkinterdnd2",
+    "dnlib": "dnlib not installed. .NET obfuscation disabled. Install with: pip install dnlib",
+    "clang.cindex": "clang not installed. Advanced C++ obfuscation limited. Install with: pip install clang",
+    "ttkthemes": "ttkthemes not installed. Theme support limited. Install with: pip install ttkthemes",
+    "pygments": "pygments not installed. Syntax highlighting disabled. Install with: pip install pygments",
+    # NumPy only speeds up xor_bytes; the pure-Python path is used silently without it
+    "numpy": None,
+}
+_LOADED_DEPS = {}
 
-try:
-    import clang.cindex
-    HAS_CLANG = True
-except ImportError:
-    HAS_CLANG = False
-    warnings.warn("clang not installed. Advanced C++ obfuscation limited. Install with: pip install clang")
+def optional_import(name: str):
+    """Return an optional module, importing it on first use; None (warned once) if missing."""
+    if name not in _LOADED_DEPS:
+        try:
+            _LOADED_DEPS[name] = importlib.import_module(name)
+        except ImportError:
+            _LOADED_DEPS[name] = None
+            if OPTIONAL_DEPS.get(name):
+                warnings.warn(OPTIONAL_DEPS[name])
+    return _LOADED_DEPS[name]
 
-try:
-    import ttkthemes
-    HAS_TTKTHEMES = True
-except ImportError:
-    HAS_TTKTHEMES = False
-    warnings.warn("ttkthemes not installed. Theme support limited. Install with: pip install ttkthemes")
+def has_dep(name: str) -> bool:
+    return optional_import(name) is not None
 
-try:
-    from pygments import highlight
-    from pygments.lexers import PythonLexer, CppLexer, JavascriptLexer, PowerShellLexer, HtmlLexer, CssLexer
-    from pygments.formatters import HtmlFormatter
-    HAS_PYGMENTS = True
-except ImportError:
-    HAS_PYGMENTS = False
-    warnings.warn("pygments not installed. Syntax highlighting disabled. Install with: pip install pygments")
+def load_gui_modules():
+    global tk, ttk, filedialog, scrolledtext, messagebox
+    import tkinter as tk
+    from tkinter import ttk, filedialog, scrolledtext, messagebox
 
 # -------------------------
 # Multilingual Support
 # -------------------------
-LANG = locale.getdefaultlocale()[0][:2].lower()  # Auto-detect: 'ru' or 'en'
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    LANG = (locale.getdefaultlocale()[0] or "")[:2].lower()  # Auto-detect: 'ru' or 'en'
 if LANG not in ['ru', 'en']:
     LANG = 'en'  # Default to English
 
@@ -109,6 +101,7 @@ TRANSLATIONS = {
         'size_change': "📏 Length: {:,} → {:,} chars",
         'size_delta': "📈 Change: {:.1f}%",
         'decoder_file': "🔑 Decoder: {}",
+        'decoder_manifest': "🗂️ Manifest: {} ({} files)",
         'preview_truncated': "\n... [truncated] ...",
         'error_processing': "💥 PROCESSING ERROR {}",
         'error_type': "Type: {}",
@@ -134,6 +127,11 @@ TRANSLATIONS = {
         'json_obf_success': "✅ JSON Configuration Obfuscation",
         'xml_obf_success': "✅ XML Configuration Obfuscation",
         'network_obf_success': "✅ Network Data Obfuscation",
+        'cache_hit': "♻️ Reused cached result (input unchanged)",
+        'method_stats': "⏱️ {}: {:.3f}s in {} call(s)",
+        'cancel': "⛔ Cancel",
+        'obf_cancelled': "⛔ Cancelled after {} of {} files",
+        'progress_stats': "{}/{} files · {:.1f} files/s · {:.2f} MB/s",
     },
     'ru': {
         'title': "🔒 Multi-Obfuscator Pro v2.6 - .NET, C++, ИИ & Anti-ИИ",
@@ -174,6 +172,7 @@ TRANSLATIONS = {
         'size_change': "📏 Длина: {:,} → {:,} символов",
         'size_delta': "📈 Изменение: {:.1f}%",
         'decoder_file': "🔑 Декодер: {}",
+        'decoder_manifest': "🗂️ Манифест: {} (файлов: {})",
         'preview_truncated': "\n... [сокращено] ...",
         'error_processing': "💥 ОШИБКА ОБРАБОТКИ {}",
         'error_type': "Тип: {}",
@@ -199,6 +198,11 @@ TRANSLATIONS = {
         'json_obf_success': "✅ Обфускация конфигурации JSON",
         'xml_obf_success': "✅ Обфускация конфигурации XML",
         'network_obf_success': "✅ Обфускация сетевых данных",
+        'cache_hit': "♻️ Использован кэшированный результат (вход не изменился)",
+        'method_stats': "⏱️ {}: {:.3f}с за {} вызов(ов)",
+        'cancel': "⛔ Отмена",
+        'obf_cancelled': "⛔ Отменено после {} из {} файлов",
+        'progress_stats': "{}/{} файлов · {:.1f} файл/с · {:.2f} МБ/с",
     }
 }
 
@@ -208,6 +212,53 @@ def t(key, *args):
 # -------------------------
 # Utility helpers
 # -------------------------
+PE_CLI_HEADER_INDEX = 14  # IMAGE_DIRECTORY_ENTRY_COM_DESCRIPTOR
+_CLR_CACHE = {}
+
+def _read_clr_flag(path: str) -> bool:
+    """True when the PE optional header has a non-empty CLI header data directory."""
+    with open(path, "rb") as f:
+        dos = f.read(64)
+        if len(dos) < 64 or dos[:2] != b"MZ":
+            return False
+        e_lfanew = struct.unpack_from("<I", dos, 0x3C)[0]
+        f.seek(e_lfanew)
+        nt = f.read(24 + 240)
+    if len(nt) < 24 + 2 or nt[:4] != b"PE\0\0":
+        return False
+    opt_size = struct.unpack_from("<H", nt, 20)[0]
+    opt = nt[24:24 + opt_size]
+    magic = struct.unpack_from("<H", opt, 0)[0] if len(opt) >= 2 else 0
+    if magic == 0x10B:
+        count_at, dirs_at = 92, 96
+    elif magic == 0x20B:
+        count_at, dirs_at = 108, 112
+    else:
+        return False
+    entry = dirs_at + PE_CLI_HEADER_INDEX * 8
+    if len(opt) < entry + 8 or struct.unpack_from("<I", opt, count_at)[0] <= PE_CLI_HEADER_INDEX:
+        return False
+    rva, size = struct.unpack_from("<II", opt, entry)
+    return rva != 0 and size != 0
+
+def is_clr_assembly(path: str) -> bool:
+    """Cheap .NET check for EXE/DLL files, memoized per (path, mtime, size)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    stamp = (st.st_mtime_ns, st.st_size)
+    key = os.path.abspath(path)
+    cached = _CLR_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    try:
+        result = _read_clr_flag(path)
+    except (OSError, struct.error):
+        result = False
+    _CLR_CACHE[key] = (stamp, result)
+    return result
+
 def detect_lang(path: str) -> str:
     ext = os.path.splitext(path)[1].lower()
     if ext == ".py": return "python"
@@ -219,14 +270,7 @@ def detect_lang(path: str) -> str:
     if ext == ".xml": return "xml"
     if ext in (".png", ".jpg", ".jpeg", ".gif"): return "image"
     if ext in (".exe", ".dll"):
-        if HAS_DNLIB:
-            try:
-                module = ModuleDefMD.Load(path)
-                if hasattr(module, 'IsClr') and module.IsClr:
-                    return "dotnet"
-            except:
-                pass
-        return ext
+        return "dotnet" if is_clr_assembly(path) else ext[1:]
     if ext in (".html", ".htm"): return "html"
     if ext in (".css",): return "css"
     return "universal"
@@ -236,7 +280,7 @@ def all_same_lang(files):
     return len(langs) == 1, (list(langs)[0] if langs else "universal")
 
 def gen_name(n=8):
-    return ''.join(random.choices(string.ascii_lowercase, k=n))
+    return ''.join(rng.choices(string.ascii_lowercase, k=n))
 
 def read_text(path):
     with open(path, "r", encoding="utf-8", errors="ignore") as f:
@@ -254,6 +298,28 @@ def write_bytes(path, data: bytes):
     with open(path, "wb") as f:
         f.write(data)
 
+def _output_size(path):
+    return os.path.getsize(path) if os.path.exists(path) else None
+
+def file_digest(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+_CODE_VERSION = None
+
+def code_version() -> str:
+    """VERSION plus a digest of this module's source, so cached outputs expire whenever any method changes."""
+    global _CODE_VERSION
+    if _CODE_VERSION is None:
+        try:
+            _CODE_VERSION = f"{VERSION}+{file_digest(__file__)[:16]}"
+        except OSError:
+            _CODE_VERSION = VERSION
+    return _CODE_VERSION
+
 def extract_string_placeholders(text, lang="generic"):
     literals = []
     def _rep(m):
@@ -263,140 +329,637 @@ def extract_string_placeholders(text, lang="generic"):
         pattern = r'(`(?:\\`|\\.|[^`])*`)|("(?:\\.|[^"\\])*")|(\'(?:\\.|[^\'\\])*\')'
     else:
         pattern = r'("(?:\\.|[^"\\])*")|(\'(?:\\.|[^\'\\])*\')'
-    new = re.sub(pattern, lambda m: _rep(m), text, flags=re.S)
+    new = regex_sub(pattern, lambda m: _rep(m), text, flags=re.S)
     return new, literals
 
 def restore_string_placeholders(text, literals):
     def _rep(m):
         idx = int(m.group(1))
         return literals[idx]
-    return re.sub(r'__STR(\d+)__', _rep, text)
+    return regex_sub(r'__STR(\d+)__', _rep, text)
+
+# -------------------------
+# XOR Kernel
+# -------------------------
+XOR_BLOCK = 1 << 16
+_XOR_TABLES = {}
+
+def xor_bytes(data, key: bytes) -> bytes:
+    """XOR a buffer with a repeating key: out[i] = data[i] ^ key[i % len(key)].
+
+    Works on whole buffers instead of per-byte Python loops: bytes.translate
+    for one-byte keys, NumPy when installed, otherwise big-integer XOR of
+    64 KiB blocks against a pre-tiled key.
+    """
+    if not key:
+        return bytes(data)
+    if len(key) == 1:
+        table = _XOR_TABLES.get(key[0])
+        if table is None:
+            table = _XOR_TABLES[key[0]] = bytes(b ^ key[0] for b in range(256))
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return bytes(data.translate(table))
+    n = len(data)
+    np = optional_import("numpy")
+    if np is not None:
+        buf = np.frombuffer(data, dtype=np.uint8)
+        return (buf ^ np.resize(np.frombuffer(key, dtype=np.uint8), n)).tobytes()
+    klen = len(key)
+    block = max(klen, XOR_BLOCK // klen * klen)
+    tile = key * (block // klen)
+    tile_int = int.from_bytes(tile, "little")
+    view = memoryview(data)
+    parts = []
+    for start in range(0, n, block):
+        chunk = view[start:start + block]
+        m = len(chunk)
+        k = tile_int if m == block else int.from_bytes(tile[:m], "little")
+        parts.append((int.from_bytes(chunk, "little") ^ k).to_bytes(m, "little"))
+    return b"".join(parts)
+
+# Same kernel for generated decoder scripts, which must not depend on this module
+DECODER_XOR_SNIPPET = '''def _xor(data, key):
+    if not key:
+        return bytes(data)
+    if len(key) == 1:
+        return bytes(data.translate(bytes(b ^ key[0] for b in range(256))))
+    n = len(data)
+    tile = (key * (n // len(key) + 1))[:n]
+    return (int.from_bytes(data, "big") ^ int.from_bytes(tile, "big")).to_bytes(n, "big")
+'''
+
+# Chunked I/O for generated decoders: memory stays bounded by CHUNK whatever the file size
+DECODER_STREAM_SNIPPET = '''import base64
+import codecs
+
+CHUNK = 1 << 20
+B64_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
+
+def _read_chunks(f, limit=None):
+    while limit is None or limit > 0:
+        chunk = f.read(CHUNK if limit is None else min(CHUNK, limit))
+        if not chunk:
+            return
+        if limit is not None:
+            limit -= len(chunk)
+        yield chunk
+
+def _read_file(path):
+    with open(path, 'rb') as f:
+        yield from _read_chunks(f)
+
+def _is_base64(chunks):
+    size = 0
+    for chunk in chunks:
+        if chunk.translate(None, B64_ALPHABET):
+            return False
+        size += len(chunk)
+    return size > 0 and size % 4 == 0
+
+def _b64_stream(chunks):
+    carry = b""
+    for chunk in chunks:
+        chunk = carry + chunk
+        cut = len(chunk) - len(chunk) % 4
+        yield base64.b64decode(chunk[:cut], validate=True)
+        carry = chunk[cut:]
+    if carry:
+        raise ValueError("truncated Base64 data")
+
+def _xor_stream(chunks, key):
+    if not key:
+        yield from chunks
+        return
+    offset = 0
+    for chunk in chunks:
+        phase = offset % len(key)
+        yield _xor(chunk, key[phase:] + key[:phase])
+        offset += len(chunk)
+
+def _utf8_clean(chunks):
+    """Drop invalid UTF-8 sequences, like reading the file with errors='ignore'"""
+    decoder = codecs.getincrementaldecoder('utf-8')('ignore')
+    for chunk in chunks:
+        yield decoder.decode(chunk).encode('utf-8')
+    yield decoder.decode(b"", True).encode('utf-8')
+
+def _write_chunks(path, chunks):
+    written = 0
+    with open(path, 'wb') as f:
+        for chunk in chunks:
+            f.write(chunk)
+            written += len(chunk)
+    return written
+
+def _write_text(path, chunks, errors='strict'):
+    decoder = codecs.getincrementaldecoder('utf-8')(errors)
+    with open(path, 'w', encoding='utf-8') as f:
+        for chunk in chunks:
+            f.write(decoder.decode(chunk))
+        f.write(decoder.decode(b"", True))
+'''
+
+# Reassembly of EXE · Byte Segmentation output (see segment_header) by seeking
+DECODER_SEGMENT_SNIPPET = '''def _segment_table(head, size):
+    """(offset, length) of each segment in source order for a SEG:<count>:<size>:<order>: file, else None"""
+    if not head.startswith(b"SEG:"):
+        return None
+    header_end = 0
+    for _ in range(4):
+        header_end = head.index(b":", header_end) + 1
+    _, num_segs, seg_size, order = head[:header_end - 1].decode("ascii").split(":")
+    seg_size = int(seg_size)
+    payload_size = size - header_end
+    slots, pos = {}, header_end
+    for index in map(int, order.split(",")):
+        slots[index] = (pos, min(seg_size, payload_size - index * seg_size))
+        pos += slots[index][1]
+    return [slots[index] for index in range(int(num_segs))]
+
+def _payload(path, table):
+    """Yield the payload in source order, seeking to each segment"""
+    with open(path, 'rb') as f:
+        for start, length in table or [(0, None)]:
+            f.seek(start)
+            yield from _read_chunks(f, length)
+'''
+
+# Self-check of generated decoders; seal_decoder() fills in the hash of the sealed script
+DECODER_INTEGRITY_SNIPPET = '''EXPECTED_HASH = ""
+
+def check_integrity():
+    """Verify decoder script integrity using SHA-256 hash"""
+    with open(__file__, 'rb') as f:
+        code = f.read()
+    if hashlib.sha256(code.replace(EXPECTED_HASH.encode(), b"", 1)).hexdigest() != EXPECTED_HASH:
+        print("⚠️ Decoder tampering detected!")
+        os.remove(__file__)
+        sys.exit(1)
+'''
+
+def seal_decoder(code: str) -> bytes:
+    """Embed the SHA-256 of the script (with an empty hash) for check_integrity()."""
+    digest = hashlib.sha256(code.encode("utf-8")).hexdigest()
+    return code.replace('EXPECTED_HASH = ""', f'EXPECTED_HASH = "{digest}"', 1).encode("utf-8")
+
+# -------------------------
+# Instrumentation
+# -------------------------
+# Method-specific counters of the invocation being traced (reset by trace_method)
+METHOD_COUNTERS = collections.Counter()
+
+def regex_sub(pattern, repl, text: str, flags: int = 0) -> str:
+    text, n = re.subn(pattern, repl, text, flags=flags)
+    METHOD_COUNTERS["regex_subs"] += n
+    return text
+
+class CountingTransformer(ast.NodeTransformer):
+    def visit(self, node):
+        METHOD_COUNTERS["ast_nodes"] += 1
+        return super().visit(node)
+
+@contextlib.contextmanager
+def trace_method(trace, method: str, size_in=None):
+    """Time one method invocation and append its entry to the trace list.
+
+    The caller may set entry["size_out"] inside the block. Sizes are characters
+    for text and bytes for binary data. With trace=None nothing is recorded.
+    """
+    entry = {"method": method, "seconds": 0.0, "size_in": size_in, "size_out": None,
+             "counters": {}, "error": None}
+    if trace is None:
+        yield entry
+        return
+    METHOD_COUNTERS.clear()
+    start = time.perf_counter()
+    try:
+        yield entry
+    except Exception as e:
+        entry["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        entry["seconds"] = time.perf_counter() - start
+        entry["counters"] = dict(METHOD_COUNTERS)
+        trace.append(entry)
+
+def summarize_trace(entries) -> dict:
+    """Aggregate trace entries per method, slowest first."""
+    summary = {}
+    for entry in entries:
+        s = summary.setdefault(entry["method"], {"calls": 0, "seconds": 0.0, "size_in": 0,
+                                                 "size_out": 0, "errors": 0, "counters": {}})
+        s["calls"] += 1
+        s["seconds"] += entry["seconds"]
+        s["size_in"] += entry["size_in"] or 0
+        s["size_out"] += entry["size_out"] or 0
+        s["errors"] += 1 if entry["error"] else 0
+        for name, value in entry["counters"].items():
+            s["counters"][name] = s["counters"].get(name, 0) + value
+    return dict(sorted(summary.items(), key=lambda kv: kv[1]["seconds"], reverse=True))
+
+# -------------------------
+# Deterministic RNG streams
+# -------------------------
+# Seed material of the file job being run ("<seed>:<content digests>"), None when unseeded
+JOB_SEED = contextvars.ContextVar("job_seed", default=None)
+_METHOD_RNG = contextvars.ContextVar("method_rng", default=None)
+
+class _MethodRandom:
+    """Module-level `rng`: forwards to the random.Random of the method being run (see method_rng),
+    or to the global `random` functions outside a seeded job."""
+
+    def __getattr__(self, name):
+        return getattr(_METHOD_RNG.get() or random, name)
+
+rng = _MethodRandom()
+
+def method_random(method: str):
+    """A random.Random seeded from (job seed, method), or None when the job is unseeded."""
+    material = JOB_SEED.get()
+    return None if material is None else random.Random(f"{material}:{method}")
+
+@contextlib.contextmanager
+def method_rng(method: str):
+    """Give one method invocation its own RNG stream, independent of what ran before it.
+
+    Nested calls keep the outer stream, so a registry method that runs an
+    internal helper draws the same numbers whether it is fused or replayed.
+    """
+    generator = None if _METHOD_RNG.get() is not None else method_random(method)
+    if generator is None:
+        yield
+        return
+    token = _METHOD_RNG.set(generator)
+    try:
+        yield
+    finally:
+        _METHOD_RNG.reset(token)
+
+def bind_method_rng(method: str, chunks):
+    """Lazy-stage counterpart of method_rng: every pull of the stage draws from the method's stream."""
+    generator = method_random(method)
+    if generator is None:
+        yield from chunks
+        return
+    chunks = iter(chunks)
+    while True:
+        token = _METHOD_RNG.set(generator)
+        try:
+            chunk = next(chunks, None)
+        finally:
+            _METHOD_RNG.reset(token)
+        if chunk is None:
+            return
+        yield chunk
 
 # -------------------------
 # Advanced Obfuscation Helpers
 # -------------------------
-def custom_encrypt_string(text: str, key: str) -> str:
-    key_bytes = key.encode("utf-8")
+def _encrypt_string_reference(text: str, key_bytes: bytes) -> str:
     result = bytearray(len(text))
     for i, char in enumerate(text.encode("utf-8")):
         shift = key_bytes[i % len(key_bytes)] % 32
         result[i] = (char + shift) ^ key_bytes[i % len(key_bytes)]
     return base64.b64encode(result).decode("ascii")
 
+class StringCipher:
+    """Custom XOR + Base64 string encryption with per-key lookup tables.
+
+    out[i] = (b[i] + key[i % n] % 32) ^ key[i % n] becomes one 256-byte
+    translate table per key position. encrypt_many() pads every string to a
+    multiple of the key length, joins them and translates each key position
+    of the whole batch at once. Non-ASCII text and empty keys go through the
+    per-byte reference loop so they fail exactly as before.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.key_bytes = key.encode("utf-8")
+        self.tables = [bytes(((c + k % 32) ^ k) & 0xFF for c in range(256)) for k in self.key_bytes]
+
+    def encrypt(self, text: str) -> str:
+        return self.encrypt_many([text])[0]
+
+    def encrypt_many(self, texts) -> list:
+        texts = list(texts)
+        METHOD_COUNTERS["strings_encrypted"] += len(texts)
+        if self.key_bytes and all(s.isascii() for s in texts):
+            return self._translate([s.encode("ascii") for s in texts])
+        return [self._translate([s.encode("ascii")])[0] if self.key_bytes and s.isascii()
+                else _encrypt_string_reference(s, self.key_bytes) for s in texts]
+
+    def _translate(self, raw: list) -> list:
+        n = len(self.key_bytes)
+        buf = b"".join(b + bytes(-len(b) % n) for b in raw)
+        out = bytearray(len(buf))
+        for j, table in enumerate(self.tables):
+            out[j::n] = buf[j::n].translate(table)
+        view = memoryview(out)
+        results = []
+        pos = 0
+        for b in raw:
+            results.append(base64.b64encode(view[pos:pos + len(b)]).decode("ascii"))
+            pos += len(b) + (-len(b) % n)
+        return results
+
+_STRING_CIPHERS = {}
+
+def string_cipher(key: str) -> StringCipher:
+    cipher = _STRING_CIPHERS.get(key)
+    if cipher is None:
+        cipher = _STRING_CIPHERS[key] = StringCipher(key)
+    return cipher
+
+def custom_encrypt_string(text: str, key: str) -> str:
+    return string_cipher(key).encrypt(text)
+
+class BatchedWriter:
+    """Buffered text writer whose encrypted pieces are filled in one batch per flush.
+
+    A flush happens every `batch` strings to encrypt, 4 * batch pieces or
+    max_chars buffered characters, whichever comes first.
+    """
+
+    def __init__(self, out, cipher: StringCipher, batch: int = 4096, max_chars: int = 1 << 20):
+        self.out = out
+        self.cipher = cipher
+        self.batch = batch
+        self.max_chars = max_chars
+        self.pending = []  # text pieces, None where the next encrypted string goes
+        self.plain = []
+        self.chars = 0
+        self.count = 0
+
+    def write(self, text: str):
+        self.pending.append(text)
+        self.chars += len(text)
+        if len(self.pending) >= 4 * self.batch or self.chars >= self.max_chars:
+            self.flush()
+
+    def write_encrypted(self, text: str):
+        self.pending.append(None)
+        self.plain.append(text)
+        self.count += 1
+        if len(self.plain) >= self.batch:
+            self.flush()
+
+    def flush(self):
+        encrypted = iter(self.cipher.encrypt_many(self.plain))
+        self.out.write("".join(next(encrypted) if p is None else p for p in self.pending))
+        self.pending.clear()
+        self.plain.clear()
+        self.chars = 0
+
+def xml_escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+def _escape_xml_attrib(value: str) -> str:
+    return (xml_escape(value).replace('"', "&quot;").replace("\r", "&#13;")
+            .replace("\n", "&#10;").replace("\t", "&#09;"))
+
+def rewrite_xml_stream(src_path: str, out_path: str, key: str, text_rule, encrypt_attrs: bool = False) -> int:
+    """Encrypt an XML document incrementally and return how many strings were encrypted.
+
+    Elements are written as soon as their start tag, text or end tag is
+    known and cleared afterwards, so only the open path is kept in memory.
+    text_rule(elem, parent, depth) returns None to keep elem.text or the
+    (prefix, plain) pair to write as prefix + encrypted plain. Output matches
+    ElementTree.write except that namespace declarations stay on the
+    elements that declared them, with their original prefixes.
+    """
+    parser = ET.XMLPullParser(events=("start-ns", "start", "end"))
+    stack = []  # frames: [elem, opened, {uri: prefix}]
+    declared = []
+    last = None  # closed element whose tail is not known yet
+
+    with open(src_path, "rb") as src, open(out_path, "w", encoding="utf-8") as out:
+        w = BatchedWriter(out, string_cipher(key))
+        w.write("<?xml version='1.0' encoding='utf-8'?>\n")
+
+        def qualify(name, scope, decls, is_attr):
+            if name[:1] != "{":
+                return name
+            uri, local = name[1:].split("}", 1)
+            if uri == "http://www.w3.org/XML/1998/namespace":
+                return f"xml:{local}"
+            for frame_scope in reversed([f[2] for f in stack] + [scope]):
+                prefix = frame_scope.get(uri)
+                if prefix is not None and (prefix or not is_attr):
+                    return f"{prefix}:{local}" if prefix else local
+            prefix = f"ns{sum(len(f[2]) for f in stack) + len(scope)}"
+            scope[uri] = prefix
+            decls.append((prefix, uri))
+            return f"{prefix}:{local}"
+
+        def write_text(elem, depth):
+            if not elem.text:
+                return
+            rule = text_rule(elem, stack[-2][0] if len(stack) > 1 else None, depth)
+            if rule is None:
+                w.write(xml_escape(elem.text))
+            else:
+                w.write(rule[0])
+                w.write_encrypted(rule[1])
+
+        def open_parent():
+            frame = stack[-1]
+            if not frame[1]:
+                frame[1] = True
+                w.write(">")
+                write_text(frame[0], len(stack) - 1)
+
+        def emit_tail():
+            nonlocal last
+            if last is not None:
+                if last.tail:
+                    w.write(xml_escape(last.tail))
+                last.clear()
+                last = None
+
+        def handle(event, item):
+            nonlocal last
+            if event == "start-ns":
+                declared.append(item)
+                return
+            emit_tail()
+            if event == "start":
+                if stack:
+                    open_parent()
+                decls = list(declared)
+                scope = {uri: prefix for prefix, uri in declared}
+                declared.clear()
+                tag = qualify(item.tag, scope, decls, False)
+                attrs = [(qualify(name, scope, decls, True), value) for name, value in item.attrib.items()]
+                stack.append([item, False, scope])
+                w.write(f"<{tag}")
+                for name, value in attrs:
+                    w.write(f' {name}="')
+                    if encrypt_attrs and value.strip():
+                        w.write_encrypted(value)
+                    else:
+                        w.write(_escape_xml_attrib(value))
+                    w.write('"')
+                for prefix, uri in decls:
+                    w.write(f' xmlns:{prefix}="{_escape_xml_attrib(uri)}"' if prefix
+                            else f' xmlns="{_escape_xml_attrib(uri)}"')
+            else:
+                elem, opened, scope = stack[-1]
+                tag = qualify(elem.tag, scope, [], False)
+                if opened:
+                    w.write(f"</{tag}>")
+                elif elem.text:
+                    w.write(">")
+                    write_text(elem, len(stack) - 1)
+                    w.write(f"</{tag}>")
+                else:
+                    w.write(" />")
+                stack.pop()
+                if stack:
+                    del stack[-1][0][:]
+                last = elem
+
+        for chunk in iter(lambda: src.read(STREAM_CHUNK), b""):
+            parser.feed(chunk)
+            for event, item in parser.read_events():
+                handle(event, item)
+        parser.close()
+        for event, item in parser.read_events():
+            handle(event, item)
+        emit_tail()
+        w.flush()
+    return w.count
+
 def hash_name(name: str, seed: str = "secret") -> str:
     return "v_" + hashlib.md5((name + seed).encode()).hexdigest()[:8]
 
 # -------------------------
 # AI-Powered Obfuscation Methods (№4: Advanced AI methods)
 # -------------------------
+class AIObfuscator(CountingTransformer):
+    def visit_BinOp(self, node):
+        if isinstance(node.op, (ast.Add, ast.Sub, ast.Mult)):
+            # Operands appear twice; copy them so later passes never see one node in two places
+            new_node = ast.BinOp(
+                left=ast.BinOp(node.left, ast.BitXor(), node.right),
+                op=ast.Add(),
+                right=ast.BinOp(
+                    left=ast.BinOp(copy.deepcopy(node.left), ast.BitAnd(), copy.deepcopy(node.right)),
+                    op=ast.Mult(),
+                    right=ast.Num(n=2)
+                )
+            )
+            ast.fix_missing_locations(new_node)
+            return new_node
+        return self.generic_visit(node)
+
+    def visit_FunctionDef(self, node):
+        # Visit the original body first: the injected trap is itself a FunctionDef
+        self.generic_visit(node)
+        trap_code = textwrap.dedent(f"""
+            import time
+            def _ai_trap_{rng.randint(1000, 9999)}():
+                start = time.time()
+                for _ in range({rng.randint(5000, 15000)}):
+                    _ = {rng.randint(1, 100)} ** 2
+                if time.time() - start > {rng.uniform(0.1, 0.5)}:
+                    import sys; sys.exit(1)
+            _ai_trap_{rng.randint(1000, 9999)}()
+        """)
+        trap_nodes = ast.parse(trap_code).body
+        node.body = trap_nodes + node.body
+        return node
+
+class AntiAITraps(CountingTransformer):
+    def visit_Module(self, node):
+        self.generic_visit(node)
+        trap_code = textwrap.dedent("""
+            import os
+            if 'AI_ANALYSIS' in os.environ:
+                raise Exception('AI analysis detected')
+        """)
+        node.body.insert(0, ast.parse(trap_code).body[0])
+        return node
+
+    def visit_FunctionDef(self, node):
+        self.generic_visit(node)
+        fake_func_name = f"fake_{gen_name(8)}"
+        fake_code = textwrap.dedent(f"""
+            def {fake_func_name}():
+                import random
+                return random.randint(0, 100) * {rng.randint(1, 10)}
+            {fake_func_name}()
+        """)
+        fake_nodes = ast.parse(fake_code).body
+        node.body = fake_nodes + node.body
+        return node
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, (ast.Store, ast.Load)):
+            node.id = f"v_{hash_name(node.id, str(rng.randint(1000, 9999)))}"
+        return node
+
+class AdvancedAIObfuscator(CountingTransformer):
+    def __init__(self, key: str = "secret"):
+        self.key = key
+
+    def visit_If(self, node):
+        # Morph if-else to ternary or switch-like
+        new_node = ast.IfExp(
+            test=node.test,
+            body=node.body[0] if node.body else ast.Pass(),
+            orelse=node.orelse[0] if node.orelse else ast.Pass()
+        )
+        ast.fix_missing_locations(new_node)
+        return new_node
+
+    def visit_Assign(self, node):
+        # Add redundant operations
+        if isinstance(node.value, ast.Num):
+            new_value = ast.BinOp(
+                left=ast.Num(n=node.value.n ^ ord(self.key[0])),
+                op=ast.BitXor(),
+                right=ast.Num(n=ord(self.key[0]))
+            )
+            node.value = new_value
+            ast.fix_missing_locations(node)
+        return self.generic_visit(node)
+
+def run_ast_passes(text: str, passes, trace: list = None) -> str:
+    """Parse once, run each (name, NodeTransformer) pass in order on the same tree, unparse once.
+
+    When a trace list is given, parse, each pass and unparse get their own
+    entries ("ast.parse", <name>, "ast.unparse"), passes with an ast_nodes count.
+    """
+    with trace_method(trace, "ast.parse", len(text)):
+        tree = ast.parse(text)
+    for name, transformer in passes:
+        with trace_method(trace, name), method_rng(name):
+            tree = transformer.visit(tree)
+    with trace_method(trace, "ast.unparse") as entry:
+        ast.fix_missing_locations(tree)
+        result = ast.unparse(tree)
+        entry["size_out"] = len(result)
+    return result
+
 def ai_obfuscate(text: str, *_args) -> str:
     """AI-generated obfuscation with randomized mathematical transformations"""
     try:
-        tree = ast.parse(text)
-        
-        class AIObfuscator(ast.NodeTransformer):
-            def visit_BinOp(self, node):
-                if isinstance(node.op, (ast.Add, ast.Sub, ast.Mult)):
-                    new_node = ast.BinOp(
-                        left=ast.BinOp(node.left, ast.BitXor(), node.right),
-                        op=ast.Add(),
-                        right=ast.BinOp(
-                            left=ast.BinOp(node.left, ast.BitAnd(), node.right),
-                            op=ast.Mult(),
-                            right=ast.Num(n=2)
-                        )
-                    )
-                    ast.fix_missing_locations(new_node)
-                    return new_node
-                return self.generic_visit(node)
-            
-            def visit_FunctionDef(self, node):
-                trap_code = textwrap.dedent(f"""
-                    import time
-                    def _ai_trap_{random.randint(1000, 9999)}():
-                        start = time.time()
-                        for _ in range({random.randint(5000, 15000)}):
-                            _ = {random.randint(1, 100)} ** 2
-                        if time.time() - start > {random.uniform(0.1, 0.5)}:
-                            import sys; sys.exit(1)
-                    _ai_trap_{random.randint(1000, 9999)}()
-                """)
-                trap_nodes = ast.parse(trap_code).body
-                node.body = trap_nodes + node.body
-                return self.generic_visit(node)
-        
-        tree = AIObfuscator().visit(tree)
-        ast.fix_missing_locations(tree)
-        return ast.unparse(tree)
+        return run_ast_passes(text, [("ai_obfuscate", AIObfuscator())])
     except Exception as e:
         return f"# AI Obfuscation Error: {str(e)}\n{text}"
 
 def anti_ai_deobfuscation(text: str, *_args) -> str:
     """Add traps to confuse AI-based deobfuscators"""
     try:
-        tree = ast.parse(text)
-        
-        class AntiAITraps(ast.NodeTransformer):
-            def visit_FunctionDef(self, node):
-                fake_func_name = f"fake_{gen_name(8)}"
-                fake_code = textwrap.dedent(f"""
-                    def {fake_func_name}():
-                        import random
-                        return random.randint(0, 100) * {random.randint(1, 10)}
-                    {fake_func_name}()
-                """)
-                fake_nodes = ast.parse(fake_code).body
-                node.body = fake_nodes + node.body
-                return self.generic_visit(node)
-            
-            def visit_Name(self, node):
-                if isinstance(node.ctx, (ast.Store, ast.Load)):
-                    node.id = f"v_{hash_name(node.id, str(random.randint(1000, 9999)))}"
-                return node
-        
-        tree = AntiAITraps().visit(tree)
-        ast.fix_missing_locations(tree)
-        trap_code = textwrap.dedent("""
-            import os
-            if 'AI_ANALYSIS' in os.environ:
-                raise Exception('AI analysis detected')
-        """)
-        tree.body.insert(0, ast.parse(trap_code).body[0])
-        return ast.unparse(tree)
+        return run_ast_passes(text, [("anti_ai_deobfuscation", AntiAITraps())])
     except Exception as e:
         return f"# Anti-AI Deobfuscation Error: {str(e)}\n{text}"
 
 def ai_advanced_obfuscate(text: str, key: str = "secret") -> str:
     """Advanced AI obfuscation: code morphing with semantic preservation"""
     try:
-        tree = ast.parse(text)
-        
-        class AdvancedAIObfuscator(ast.NodeTransformer):
-            def visit_If(self, node):
-                # Morph if-else to ternary or switch-like
-                new_node = ast.IfExp(
-                    test=node.test,
-                    body=node.body[0] if node.body else ast.Pass(),
-                    orelse=node.orelse[0] if node.orelse else ast.Pass()
-                )
-                ast.fix_missing_locations(new_node)
-                return new_node
-            
-            def visit_Assign(self, node):
-                # Add redundant operations
-                if isinstance(node.value, ast.Num):
-                    new_value = ast.BinOp(
-                        left=ast.Num(n=node.value.n ^ ord(key[0])),
-                        op=ast.BitXor(),
-                        right=ast.Num(n=ord(key[0]))
-                    )
-                    node.value = new_value
-                    ast.fix_missing_locations(node)
-                return self.generic_visit(node)
-        
-        tree = AdvancedAIObfuscator().visit(tree)
-        ast.fix_missing_locations(tree)
-        return ast.unparse(tree)
+        return run_ast_passes(text, [("ai_advanced_obfuscate", AdvancedAIObfuscator(key))])
     except Exception as e:
         return f"# Advanced AI Obfuscation Error: {str(e)}\n{text}"
 
@@ -404,11 +967,11 @@ def ai_advanced_obfuscate(text: str, key: str = "secret") -> str:
 # .NET Obfuscation Methods
 # -------------------------
 def dotnet_rename_members(module_path: str, key: str = "secret") -> str:
-    if not HAS_DNLIB:
+    if not has_dep("dnlib"):
         return f"# ❌ .NET obfuscation requires dnlib: pip install dnlib\n# File: {os.path.basename(module_path)}"
     try:
-        module = ModuleDefMD.Load(module_path)
-        renamed_count = random.randint(10, 50)
+        module = optional_import("dnlib").ModuleDefMD.Load(module_path)
+        renamed_count = rng.randint(10, 50)
         base_path = os.path.splitext(module_path)[0]
         out_path = f"{base_path}_renamed{os.path.splitext(module_path)[1]}"
         module.Assembly.Name = f"{hash_name(module.Assembly.Name, key)}"
@@ -419,19 +982,19 @@ def dotnet_rename_members(module_path: str, key: str = "secret") -> str:
 🔢 Renamed: {renamed_count} elements
 🔐 Key: {key[:8]}...
 ---
-Types: {random.randint(2, 10)} → v_xxx...
-Methods: {random.randint(5, 30)} → v_xxx...
-Fields: {random.randint(3, 15)} → v_xxx...
+Types: {rng.randint(2, 10)} → v_xxx...
+Methods: {rng.randint(5, 30)} → v_xxx...
+Fields: {rng.randint(3, 15)} → v_xxx...
 """
     except Exception as e:
         return f"# ❌ .NET renaming error: {str(e)}\n# Install dnlib: pip install dnlib"
 
 def dotnet_encrypt_strings(module_path: str, key: str = "secret") -> str:
-    if not HAS_DNLIB:
+    if not has_dep("dnlib"):
         return f"# ❌ .NET obfuscation requires dnlib: pip install dnlib\n# File: {os.path.basename(module_path)}"
     try:
-        module = ModuleDefMD.Load(module_path)
-        encrypted_count = random.randint(5, 25)
+        module = optional_import("dnlib").ModuleDefMD.Load(module_path)
+        encrypted_count = rng.randint(5, 25)
         base_path = os.path.splitext(module_path)[0]
         out_path = f"{base_path}_strings{os.path.splitext(module_path)[1]}"
         module.Write(out_path)
@@ -452,12 +1015,12 @@ Decoder automatically added to assembly
         return f"# ❌ .NET string encryption error: {str(e)}"
 
 def dotnet_add_junk(module_path: str, key: str = "secret") -> str:
-    if not HAS_DNLIB:
+    if not has_dep("dnlib"):
         return f"# ❌ .NET obfuscation requires dnlib: pip install dnlib\n# File: {os.path.basename(module_path)}"
     try:
-        module = ModuleDefMD.Load(module_path)
-        junk_types = random.randint(3, 8)
-        junk_methods = random.randint(10, 30)
+        module = optional_import("dnlib").ModuleDefMD.Load(module_path)
+        junk_types = rng.randint(3, 8)
+        junk_methods = rng.randint(10, 30)
         base_path = os.path.splitext(module_path)[0]
         out_path = f"{base_path}_junk{os.path.splitext(module_path)[1]}"
         module.Write(out_path)
@@ -467,9 +1030,9 @@ def dotnet_add_junk(module_path: str, key: str = "secret") -> str:
 🗑️ Added junk:
    Types: {junk_types} (v_xxx...)
    Methods: {junk_methods} (empty)
-   Fields: {random.randint(5, 15)} (int32)
+   Fields: {rng.randint(5, 15)} (int32)
 ---
-Size increased by ~{random.randint(5, 20)}%
+Size increased by ~{rng.randint(5, 20)}%
 Junk types complicate analysis
 ---
 Saved: {out_path}
@@ -478,11 +1041,11 @@ Saved: {out_path}
         return f"# ❌ .NET junk code error: {str(e)}"
 
 def dotnet_anti_debug(module_path: str, key: str = "secret") -> str:
-    if not HAS_DNLIB:
+    if not has_dep("dnlib"):
         return f"# ❌ .NET obfuscation requires dnlib: pip install dnlib\n# File: {os.path.basename(module_path)}"
     try:
-        module = ModuleDefMD.Load(module_path)
-        checks_added = random.randint(3, 6)
+        module = optional_import("dnlib").ModuleDefMD.Load(module_path)
+        checks_added = rng.randint(3, 6)
         base_path = os.path.splitext(module_path)[0]
         out_path = f"{base_path}_antidebug{os.path.splitext(module_path)[1]}"
         module.Write(out_path)
@@ -508,12 +1071,12 @@ Saved: {out_path}
         return f"# ❌ .NET anti-debug error: {str(e)}"
 
 def dotnet_compress_metadata(module_path: str, key: str = "secret") -> str:
-    if not HAS_DNLIB:
+    if not has_dep("dnlib"):
         return f"# ❌ .NET obfuscation requires dnlib: pip install dnlib\n# File: {os.path.basename(module_path)}"
     try:
-        module = ModuleDefMD.Load(module_path)
+        module = optional_import("dnlib").ModuleDefMD.Load(module_path)
         original_size = os.path.getsize(module_path)
-        compressed_size = int(original_size * random.uniform(0.7, 0.95))
+        compressed_size = int(original_size * rng.uniform(0.7, 0.95))
         reduction = ((original_size - compressed_size) / original_size * 100)
         base_path = os.path.splitext(module_path)[0]
         out_path = f"{base_path}_compressed{os.path.splitext(module_path)[1]}"
@@ -530,7 +1093,7 @@ def dotnet_compress_metadata(module_path: str, key: str = "secret") -> str:
 🗑️ Removed:
    Debug information
    Excess attributes
-   Empty types: {random.randint(1, 5)}
+   Empty types: {rng.randint(1, 5)}
    PDB symbols
 ---
 Saved: {out_path}
@@ -542,13 +1105,11 @@ def resx_encrypt_strings(resx_path: str, key: str = "secret") -> str:
     try:
         tree = ET.parse(resx_path)
         root = tree.getroot()
-        encrypted_count = 0
-        for data in root.findall(".//data[@name]/value"):
-            text = data.text
-            if text and isinstance(text, str) and len(text.strip()) > 0:
-                encrypted = custom_encrypt_string(text, key)
-                data.text = f"__ENCRYPTED__{encrypted}"
-                encrypted_count += 1
+        values = [data for data in root.findall(".//data[@name]/value")
+                  if data.text and isinstance(data.text, str) and len(data.text.strip()) > 0]
+        for data, encrypted in zip(values, string_cipher(key).encrypt_many(d.text for d in values)):
+            data.text = f"__ENCRYPTED__{encrypted}"
+        encrypted_count = len(values)
         base_path = os.path.splitext(resx_path)[0]
         out_path = f"{base_path}_encrypted.resx"
         tree.write(out_path, encoding='utf-8', xml_declaration=True)
@@ -564,6 +1125,31 @@ Saved: {out_path}
     except Exception as e:
         return f"# ❌ .RESX encryption error: {str(e)}"
 
+def _resx_value_rule(elem, parent, depth):
+    # Same elements as findall(".//data[@name]/value") on the root
+    if (depth >= 2 and elem.tag == "value" and parent.tag == "data" and "name" in parent.attrib
+            and elem.text.strip()):
+        return "__ENCRYPTED__", elem.text
+    return None
+
+def resx_encrypt_strings_stream(resx_path: str, key: str = "secret") -> str:
+    """Streaming resx_encrypt_strings for large .resx files."""
+    try:
+        base_path = os.path.splitext(resx_path)[0]
+        out_path = f"{base_path}_encrypted.resx"
+        encrypted_count = rewrite_xml_stream(resx_path, out_path, key, _resx_value_rule)
+        return f"""✅ .RESX String Encryption
+📁 Source file: {os.path.basename(resx_path)}
+📁 Obfuscated: {os.path.basename(out_path)}
+{t('strings_encrypted', encrypted_count)}
+🔐 Algorithm: Custom XOR + Base64 (streamed)
+🔑 Decoder key: {key[:8]}...
+---
+Saved: {out_path}
+"""
+    except Exception as e:
+        return f"# ❌ .RESX encryption error: {str(e)}"
+
 # -------------------------
 # Obfuscation of Resources and Configurations (№6)
 # -------------------------
@@ -571,19 +1157,22 @@ def json_obfuscate(path: str, key: str = "secret") -> str:
     try:
         with open(path, 'r') as f:
             data = json.load(f)
+        slots = []
         def encrypt_dict(d):
             for k, v in list(d.items()):
                 if isinstance(v, str):
-                    d[k] = custom_encrypt_string(v, key)
+                    slots.append((d, k))
                 elif isinstance(v, dict):
                     encrypt_dict(v)
                 elif isinstance(v, list):
                     for i, item in enumerate(v):
                         if isinstance(item, str):
-                            v[i] = custom_encrypt_string(item, key)
+                            slots.append((v, i))
                         elif isinstance(item, dict):
                             encrypt_dict(item)
         encrypt_dict(data)
+        for (container, k), encrypted in zip(slots, string_cipher(key).encrypt_many(c[k] for c, k in slots)):
+            container[k] = encrypted
         base_path = os.path.splitext(path)[0]
         out_path = f"{base_path}_obfuscated.json"
         with open(out_path, 'w') as f:
@@ -599,19 +1188,159 @@ Saved: {out_path}
     except Exception as e:
         return f"# ❌ JSON obfuscation error: {str(e)}"
 
+_JSON_TOKEN = re.compile(r'\s*(?:([{}\[\]:,])|("(?:[^"\\]|\\.)*")|'
+                         r'(-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null|NaN|-?Infinity))', re.S)
+
+def iter_json_tokens(f, chunk_size: int = 1 << 16):
+    """Tokenize a JSON text stream incrementally.
+
+    Yields ("punct", char), ("str", value) or ("lit", value) with values already
+    decoded. Only the current token is buffered, never the whole document.
+    """
+    buf, pos, eof = "", 0, False
+    while True:
+        m = _JSON_TOKEN.match(buf, pos)
+        if m is None or (m.end() == len(buf) and not eof):
+            if eof:
+                if buf[pos:].strip():
+                    raise ValueError(f"invalid JSON near: {buf[pos:pos + 40]!r}")
+                return
+            buf = buf[pos:]
+            pos = 0
+            more = f.read(max(chunk_size, len(buf)))
+            eof = not more
+            buf += more
+            continue
+        pos = m.end()
+        punct, string, literal = m.groups()
+        if punct:
+            yield "punct", punct
+        elif string:
+            yield "str", json.loads(string)
+        else:
+            yield "lit", json.loads(literal)
+
+# What json_obfuscate_stream accepts next inside a container, as json.load would
+_JSON_OPEN, _JSON_KEY, _JSON_COLON, _JSON_VALUE, _JSON_NEXT = range(5)
+_JSON_EXPECTING = {
+    _JSON_OPEN: "Expecting value or closing bracket",
+    _JSON_KEY: "Expecting property name enclosed in double quotes",
+    _JSON_COLON: "Expecting ':' delimiter",
+    _JSON_VALUE: "Expecting value",
+    _JSON_NEXT: "Expecting ',' delimiter or closing bracket",
+}
+
+def json_obfuscate_stream(path: str, key: str = "secret", indent=4) -> str:
+    """Streaming json_obfuscate: same values encrypted, bounded memory at any size or depth.
+
+    Tokens are rewritten as they are read and string values are encrypted in
+    batches. indent=None writes compact output.
+    """
+    try:
+        base_path = os.path.splitext(path)[0]
+        out_path = f"{base_path}_obfuscated.json"
+        key_sep = ": " if indent is not None else ":"
+        # frames: [is_dict, active, items, expect]; expect is what the grammar allows next
+        stack = []
+
+        def newline(depth):
+            return "" if indent is None else "\n" + " " * (indent * depth)
+
+        with open(path, "r", encoding="utf-8") as src, open(out_path, "w", encoding="utf-8") as out:
+            w = BatchedWriter(out, string_cipher(key))
+            done = False
+            for kind, value in iter_json_tokens(src):
+                if done:
+                    raise ValueError("extra data after the top-level object")
+                frame = stack[-1] if stack else None
+                expect = frame[3] if frame else _JSON_VALUE
+                if kind == "punct" and value == ":":
+                    if expect != _JSON_COLON:
+                        raise ValueError(_JSON_EXPECTING[expect])
+                    w.write(key_sep)
+                    frame[3] = _JSON_VALUE
+                    continue
+                if kind == "punct" and value == ",":
+                    if expect != _JSON_NEXT:
+                        raise ValueError(_JSON_EXPECTING[expect])
+                    frame[3] = _JSON_KEY if frame[0] else _JSON_VALUE
+                    continue
+                if kind == "punct" and value in "}]":
+                    if expect not in (_JSON_OPEN, _JSON_NEXT) or frame[0] != (value == "}"):
+                        raise ValueError(_JSON_EXPECTING[expect] if frame else f"unexpected {value!r}")
+                    stack.pop()
+                    w.write((newline(len(stack)) if frame[2] else "") + value)
+                    done = not stack
+                    continue
+                if frame is None:
+                    if value != "{" or kind != "punct":
+                        raise TypeError("top-level JSON value must be an object")
+                elif frame[0] and expect in (_JSON_OPEN, _JSON_KEY):
+                    if kind != "str":
+                        raise ValueError(_JSON_EXPECTING[_JSON_KEY])
+                    w.write(("," if frame[2] else "") + newline(len(stack)))
+                    frame[2] += 1
+                    frame[3] = _JSON_COLON
+                    w.write(json.dumps(value))
+                    continue
+                elif expect == _JSON_OPEN or expect == _JSON_VALUE:
+                    if not frame[0]:
+                        w.write(("," if frame[2] else "") + newline(len(stack)))
+                        frame[2] += 1
+                    frame[3] = _JSON_NEXT
+                else:
+                    raise ValueError(_JSON_EXPECTING[expect])
+                if kind == "punct":
+                    if frame is None:
+                        active = True
+                    elif value == "[" and not frame[0]:
+                        active = False
+                    else:
+                        active = frame[1]
+                    stack.append([value == "{", active, 0, _JSON_OPEN])
+                    w.write(value)
+                elif kind == "str" and frame[1]:
+                    w.write('"')
+                    w.write_encrypted(value)
+                    w.write('"')
+                else:
+                    w.write(json.dumps(value))
+            if stack or not done:
+                raise ValueError("unexpected end of JSON data")
+            w.flush()
+        return f"""✅ JSON Configuration Obfuscation
+📁 Source file: {os.path.basename(path)}
+📁 Obfuscated: {os.path.basename(out_path)}
+🔐 Algorithm: Custom XOR + Base64 (streamed)
+🔑 Key: {key[:8]}...
+---
+Saved: {out_path}
+"""
+    except Exception as e:
+        # Like json.load, invalid input leaves no output behind
+        with contextlib.suppress(OSError):
+            os.remove(f"{os.path.splitext(path)[0]}_obfuscated.json")
+        return f"# ❌ JSON obfuscation error: {str(e)}"
+
 def xml_obfuscate(path: str, key: str = "secret") -> str:
     try:
         tree = ET.parse(path)
         root = tree.getroot()
-        encrypted_count = 0
+        slots, values = [], []
         for elem in root.iter():
             if elem.text and len(elem.text.strip()) > 0:
-                elem.text = custom_encrypt_string(elem.text.strip(), key)
-                encrypted_count += 1
+                slots.append((elem, None))
+                values.append(elem.text.strip())
             for attr in elem.attrib:
                 if len(elem.attrib[attr].strip()) > 0:
-                    elem.attrib[attr] = custom_encrypt_string(elem.attrib[attr], key)
-                    encrypted_count += 1
+                    slots.append((elem, attr))
+                    values.append(elem.attrib[attr])
+        for (elem, attr), encrypted in zip(slots, string_cipher(key).encrypt_many(values)):
+            if attr is None:
+                elem.text = encrypted
+            else:
+                elem.attrib[attr] = encrypted
+        encrypted_count = len(slots)
         base_path = os.path.splitext(path)[0]
         out_path = f"{base_path}_obfuscated.xml"
         tree.write(out_path, encoding='utf-8', xml_declaration=True)
@@ -627,23 +1356,67 @@ Saved: {out_path}
     except Exception as e:
         return f"# ❌ XML obfuscation error: {str(e)}"
 
+def xml_obfuscate_stream(path: str, key: str = "secret") -> str:
+    """Streaming xml_obfuscate for large XML manifests."""
+    try:
+        base_path = os.path.splitext(path)[0]
+        out_path = f"{base_path}_obfuscated.xml"
+        encrypted_count = rewrite_xml_stream(
+            path, out_path, key, lambda elem, parent, depth: ("", elem.text.strip()) if elem.text.strip() else None,
+            encrypt_attrs=True)
+        return f"""✅ XML Configuration Obfuscation
+📁 Source file: {os.path.basename(path)}
+📁 Obfuscated: {os.path.basename(out_path)}
+🔢 Encrypted elements: {encrypted_count}
+🔐 Algorithm: Custom XOR + Base64 (streamed)
+🔑 Key: {key[:8]}...
+---
+Saved: {out_path}
+"""
+    except Exception as e:
+        return f"# ❌ XML obfuscation error: {str(e)}"
+
 # -------------------------
 # Obfuscation of Network Data (№9)
 # -------------------------
+# URLs, IPs and API keys (long alphanumeric strings are assumed to be keys), in priority order.
+# A key stops where a URL starts, so "…789http://x" leaves the URL whole as the URL-first passes did.
+_IP_PATTERN = re.compile(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}')
+_NETWORK_DATA_PATTERN = re.compile(r'https?://[^\s\'"]+|\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}|'
+                                   r'(?P<key>(?:[A-Za-gi-z0-9]|h(?!ttps?://)){20,})')
+
+def _network_data_spans(text: str):
+    """Yield the (start, end) spans network_data_obfuscate encrypts, left to right.
+
+    A key can only run into an IP through its last digits (it cannot contain
+    the dot), so "…xyz192.168.1.1" is split into the key and the whole IP as
+    the IP-first pass did, instead of leaving ".168.1.1" in plaintext.
+    """
+    pos = 0
+    while m := _NETWORK_DATA_PATTERN.search(text, pos):
+        start, pos = m.span()
+        if m.lastgroup == "key" and text.startswith(".", pos):
+            ip = next(filter(None, (_IP_PATTERN.match(text, i) for i in range(max(start, pos - 3), pos))), None)
+            if ip:
+                if ip.start() - start >= 20:
+                    yield start, ip.start()
+                start, pos = ip.span()
+        yield start, pos
+
 def network_data_obfuscate(text: str, key: str = "secret") -> str:
-    """Obfuscate URLs, IPs, API keys in code"""
-    # Patterns for URLs, IPs, API keys (simple regex)
-    url_pattern = r'(https?://[^\s\'"]+)'
-    ip_pattern = r'(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'
-    api_key_pattern = r'([A-Za-z0-9]{20,})'  # Assume long alphanumeric strings are keys
-    
-    def encrypt_match(match):
-        return custom_encrypt_string(match.group(0), key)
-    
-    text = re.sub(url_pattern, encrypt_match, text)
-    text = re.sub(ip_pattern, encrypt_match, text)
-    text = re.sub(api_key_pattern, encrypt_match, text)
-    return text
+    """Obfuscate URLs, IPs, API keys in code
+
+    One left-to-right scan: at each position a URL wins over an IP, an IP over
+    a key, and encrypted output is never scanned again.
+    """
+    spans = list(_network_data_spans(text))
+    METHOD_COUNTERS["regex_subs"] += len(spans)
+    parts, pos = [], 0
+    for (start, end), encrypted in zip(spans, string_cipher(key).encrypt_many(text[a:b] for a, b in spans)):
+        parts += (text[pos:start], encrypted)
+        pos = end
+    parts.append(text[pos:])
+    return "".join(parts)
 
 # -------------------------
 # HTML/CSS Image Obfuscation
@@ -656,10 +1429,7 @@ def html_css_image_obfuscation(text: str, key: str = "secret") -> tuple[str, int
         img_data = match.group(2)
         try:
             img_bytes = base64.b64decode(img_data)
-            result = bytearray(len(img_bytes))
-            for i, b in enumerate(img_bytes):
-                result[i] = b ^ key_bytes[i % len(key_bytes)]
-            encrypted = base64.b64encode(result).decode("ascii")
+            encrypted = base64.b64encode(xor_bytes(img_bytes, key_bytes)).decode("ascii")
             nonlocal encrypted_images
             encrypted_images += 1
             return f'data:image/encrypted;base64,{encrypted}'
@@ -667,7 +1437,7 @@ def html_css_image_obfuscation(text: str, key: str = "secret") -> tuple[str, int
             return match.group(0)
     
     pattern = r'(data:image/(?:png|jpg|jpeg|gif);base64,)([A-Za-z0-9+/=]+)'
-    new_text = re.sub(pattern, encrypt_image_data, text)
+    new_text = regex_sub(pattern, encrypt_image_data, text)
     return new_text, encrypted_images
 
 # -------------------------
@@ -677,9 +1447,7 @@ def image_xor_encrypt(image_path: str, key: str) -> tuple[bytes, str]:
     try:
         key_bytes = key.encode("utf-8")
         data = read_bytes(image_path)
-        result = bytearray(len(data))
-        for i, b in enumerate(data):
-            result[i] = b ^ key_bytes[i % len(key_bytes)]
+        result = xor_bytes(data, key_bytes)
         out_path = f"{os.path.splitext(image_path)[0]}_obf{os.path.splitext(image_path)[1]}"
         write_bytes(out_path, result)
         return result, out_path
@@ -696,24 +1464,14 @@ def gen_decoder_for_images(image_path: str, key: str):
 # Generated automatically {time.strftime("%Y-%m-%d %H:%M:%S")}
 import sys, os, hashlib
 
-def verify_integrity():
-    code = open(__file__, 'rb').read()
-    hash_obj = hashlib.sha256(code.replace(b'placeholder', b''))
-    if hash_obj.hexdigest() != 'placeholder':
-        print("⚠️ Decoder tampering detected!")
-        os.remove(__file__)
-        sys.exit(1)
-
+{DECODER_XOR_SNIPPET}
+{DECODER_STREAM_SNIPPET}
+{DECODER_INTEGRITY_SNIPPET}
 def decode_image(input_path, output_path):
     try:
-        verify_integrity()
-        data = open(input_path, 'rb').read()
+        check_integrity()
         key = bytes([{key_array}])
-        result = bytearray(len(data))
-        for i, b in enumerate(data):
-            result[i] = b ^ key[i % len(key)]
-        with open(output_path, 'wb') as f:
-            f.write(result)
+        _write_chunks(output_path, _xor_stream(_read_file(input_path), key))
         print(f"✅ Decoded: {{output_path}}")
     except Exception as e:
         print(f"❌ Error: {{e}}")
@@ -729,12 +1487,8 @@ if __name__ == "__main__":
     output_path = os.path.splitext(input_path)[0] + "_decoded" + os.path.splitext(input_path)[1]
     decode_image(input_path, output_path)
 """
-    hash_line = "    if hash_obj.hexdigest() != 'placeholder':"
-    decoder_code_no_hash = decoder_code.replace(hash_line, "    if hash_obj.hexdigest() != '':")
-    calculated_hash = hashlib.sha256(decoder_code_no_hash.encode()).hexdigest()
-    decoder_code = decoder_code.replace("placeholder", calculated_hash)
     try:
-        write_text(decoder_path, decoder_code)
+        write_bytes(decoder_path, seal_decoder(decoder_code))
         return decoder_path
     except Exception as e:
         print(f"Error creating image decoder: {e}")
@@ -933,92 +1687,388 @@ def exe_base64(data: bytes, *_args) -> bytes:
 def exe_xor(data: bytes, key: bytes) -> bytes:
     if not key:
         return data
-    out = bytearray(len(data))
-    for i, b in enumerate(data):
-        out[i] = b ^ key[i % len(key)]
-    return bytes(out)
+    return xor_bytes(data, key)
 
-def exe_shuffle(data: bytes, *_args) -> bytes:
-    arr = list(data)
-    random.shuffle(arr)
-    return bytes(arr)
+def shuffle_bytes(buf: bytearray) -> bytearray:
+    """Shuffle a bytearray in place; same permutation and RNG draws as random.shuffle(buf).
+
+    Fisher-Yates with random._randbelow inlined: indices i+1 sharing a bit
+    length k take one getrandbits(k) draw each (redrawn while out of range),
+    so no per-byte list of int objects and no per-swap function call.
+    """
+    getrandbits = rng.getrandbits
+    hi = len(buf)
+    while hi > 1:
+        k = hi.bit_length()
+        lo = 1 << (k - 1)
+        for i in range(hi - 1, lo - 2, -1):
+            j = getrandbits(k)
+            while j > i:
+                j = getrandbits(k)
+            buf[i], buf[j] = buf[j], buf[i]
+        hi = lo - 1
+    return buf
+
+def exe_shuffle(data: bytes, *_args) -> bytearray:
+    return shuffle_bytes(bytearray(data))
 
 def exe_reverse_bytes(data: bytes, *_args) -> bytes:
     return data[::-1]
 
+def segment_table(n: int) -> tuple[int, list]:
+    """Draw the segment permutation for n bytes: (segment size, [(offset, length), ...] in output order)."""
+    segment_size = max(1, n // 8)
+    starts = list(range(0, n, segment_size))
+    rng.shuffle(starts)
+    return segment_size, [(start, min(segment_size, n - start)) for start in starts]
+
+def segment_header(segment_size: int, table: list) -> bytes:
+    """SEG:<count>:<size>:<i,j,...>: where the list gives the source segment index of each output slot,
+    so a decoder can seek to every segment instead of buffering the payload."""
+    order = ",".join(str(offset // segment_size) for offset, _ in table)
+    return f"SEG:{len(table)}:{segment_size}:{order}:".encode('utf-8')
+
 def exe_segment_bytes(data: bytes, *_args) -> bytes:
     if len(data) < 16:
         return data
-    segment_size = max(1, len(data) // 8)
-    segments = [data[i:i+segment_size] for i in range(0, len(data), segment_size)]
-    random.shuffle(segments)
-    header = f"SEG:{len(segments)}:{segment_size}:".encode('utf-8')
-    return header + b''.join(segments)
+    segment_size, table = segment_table(len(data))
+    view = memoryview(data)
+    return segment_header(segment_size, table) + b''.join(view[o:o + l] for o, l in table)
+
+def write_segments(f, buf) -> int:
+    """Write the segmented form of buf to the binary file f with vectored writes straight from buf.
+
+    Segments are passed as memoryview slices, so nothing is copied in Python;
+    os.writev is used where the platform has it. Returns the bytes written.
+    """
+    if len(buf) < 16:
+        f.write(buf)
+        return len(buf)
+    segment_size, table = segment_table(len(buf))
+    view = memoryview(buf)
+    try:
+        views = [segment_header(segment_size, table)] + [view[o:o + l] for o, l in table]
+        if not hasattr(os, "writev"):
+            for v in views:
+                f.write(v)
+            return sum(len(v) for v in views)
+        f.flush()
+        fd, written = f.fileno(), 0
+        while views:
+            done = os.writev(fd, views)
+            written += done
+            # Partial writes: drop the fully written views and trim the next one
+            while views and done >= len(views[0]):
+                done -= len(views.pop(0))
+            if done:
+                views[0] = views[0][done:]
+        return written
+    finally:
+        views = None
+        view.release()
 
 # -------------------------
-# Universal Methods
+# Streaming EXE Pipeline
 # -------------------------
-def uni_minify(text: str, *_args) -> str:
-    lines = [line.strip() for line in text.splitlines() if line.strip()]
-    return ' '.join(lines)
+STREAM_CHUNK = 1 << 20
+STREAM_THRESHOLD = 64 << 20
 
-def uni_base64(text: str, *_args) -> str:
-    return base64.b64encode(text.encode('utf-8')).decode('ascii')
+class FileChunks:
+    """Re-iterable chunk source over a file; random-access stages mmap the file directly."""
 
-def uni_xor_text(text: str, key: bytes) -> str:
-    if not key:
-        return text
-    data = text.encode('utf-8')
-    out = bytearray(len(data))
-    for i, b in enumerate(data):
-        out[i] = b ^ key[i % len(key)]
-    return base64.b64encode(bytes(out)).decode('ascii')
+    def __init__(self, path: str, chunk_size: int = STREAM_CHUNK):
+        self.path = path
+        self.chunk_size = chunk_size
 
-def uni_heavy_computation(text: str, *_args) -> str:
-    heavy = '''import time, math
-def _sandbox_check():
-    start = time.time()
-    result = sum(math.factorial(i%10) for i in range(10000))
-    end = time.time()
-    if end - start > 1.0:
-        import sys; sys.exit(1)
-_sandbox_check()
-'''
-    return heavy + "\n\n" + text
+    def __iter__(self):
+        with open(self.path, "rb") as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+@contextlib.contextmanager
+def _random_access(chunks):
+    """Expose a whole stage input as a read-only mmap, spooling to a temp file if needed."""
+    path = getattr(chunks, "path", None)
+    if path is None:
+        f = tempfile.TemporaryFile()
+        for chunk in chunks:
+            f.write(chunk)
+        f.flush()
+    else:
+        f = open(path, "rb")
+    try:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    finally:
+        f.close()
+    try:
+        yield buf
+    finally:
+        buf.close()
+
+def stream_base64(chunks, *_args):
+    carry = b""
+    for chunk in chunks:
+        if carry:
+            chunk = carry + chunk
+        cut = len(chunk) - len(chunk) % 3
+        if cut:
+            yield base64.b64encode(chunk[:cut])
+        carry = chunk[cut:]
+    if carry:
+        yield base64.b64encode(carry)
+
+def stream_xor(chunks, key: bytes):
+    if not key:
+        yield from chunks
+        return
+    offset = 0
+    for chunk in chunks:
+        phase = offset % len(key)
+        yield xor_bytes(chunk, key[phase:] + key[:phase])
+        offset += len(chunk)
+
+def stream_shuffle(chunks, *_args):
+    # A global byte permutation needs the whole buffer: one in-place copy, handed on in chunks
+    with _random_access(chunks) as buf:
+        out = shuffle_bytes(bytearray(buf))
+    for pos in range(0, len(out), STREAM_CHUNK):
+        yield out[pos:pos + STREAM_CHUNK]
+
+def stream_reverse_bytes(chunks, *_args):
+    with _random_access(chunks) as buf:
+        for end in range(len(buf), 0, -STREAM_CHUNK):
+            yield buf[max(0, end - STREAM_CHUNK):end][::-1]
+
+def stream_segment_bytes(chunks, *_args):
+    with _random_access(chunks) as buf:
+        n = len(buf)
+        if n < 16:
+            yield bytes(buf)
+            return
+        segment_size, table = segment_table(n)
+        yield segment_header(segment_size, table)
+        for start, length in table:
+            end = start + length
+            for pos in range(start, end, STREAM_CHUNK):
+                yield buf[pos:min(pos + STREAM_CHUNK, end)]
+
+# Preview windows: (open file, size, key, limit) -> (output size, first `limit` output bytes)
+def preview_base64(f, n, key, limit):
+    return (n + 2) // 3 * 4, base64.b64encode(f.read((limit + 3) // 4 * 3))[:limit]
+
+def preview_xor(f, n, key, limit):
+    return n, xor_bytes(f.read(limit), key)
+
+def preview_shuffle(f, n, key, limit):
+    # The head of a uniform permutation is a uniform sample without replacement
+    head = bytearray()
+    for pos in rng.sample(range(n), min(limit, n)):
+        f.seek(pos)
+        head += f.read(1)
+    return n, bytes(head)
+
+def preview_reverse_bytes(f, n, key, limit):
+    f.seek(max(0, n - limit))
+    return n, f.read()[::-1]
+
+def preview_segment_bytes(f, n, key, limit):
+    if n < 16:
+        return n, f.read(limit)
+    segment_size, table = segment_table(n)
+    header = segment_header(segment_size, table)
+    head = bytearray(header[:limit])
+    for start, length in table:
+        if len(head) >= limit:
+            break
+        f.seek(start)
+        head += f.read(min(length, limit - len(head)))
+    return len(header) + n, bytes(head)
+
+# -------------------------
+# Universal Methods
+# -------------------------
+def uni_minify(text: str, *_args) -> str:
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    return ' '.join(lines)
+
+def uni_base64(text: str, *_args) -> str:
+    return base64.b64encode(text.encode('utf-8')).decode('ascii')
+
+def uni_xor_text(text: str, key: bytes) -> str:
+    if not key:
+        return text
+    return base64.b64encode(xor_bytes(text.encode('utf-8'), key)).decode('ascii')
+
+def uni_heavy_computation(text: str, *_args) -> str:
+    heavy = '''import time, math
+def _sandbox_check():
+    start = time.time()
+    result = sum(math.factorial(i%10) for i in range(10000))
+    end = time.time()
+    if end - start > 1.0:
+        import sys; sys.exit(1)
+_sandbox_check()
+'''
+    return heavy + "\n\n" + text
+
+_BLANK_TAIL = re.compile(r'\s*\Z')
+
+class StreamMinifier:
+    """One-pass tokenizing minifier fed with text chunks.
+
+    feed() returns the output for every token that is complete so far and
+    keeps only an unfinished token buffered; close() flushes the rest.
+    An unclosed raw block (comment, string, <pre>...) is not retokenized
+    until its closer shows up, searched for from where the previous search
+    stopped; any other unfinished token is retried once the buffer has
+    doubled. Subclasses supply TOKEN, _emit() and _closer().
+    """
+    TOKEN = None
+
+    def __init__(self):
+        self.buf = ""
+        self.pending_ws = False
+        self.last = ""
+        self.closer = None
+        self.closer_len = 0
+        self.scan = 0
+        self.wait = 0
+
+    def feed(self, chunk: str) -> str:
+        self.buf += chunk
+        if self.closer is not None:
+            found = self.closer.search(self.buf, self.scan)
+            if found is None:
+                self.scan = max(self.scan, len(self.buf) - self.closer_len + 1)
+                return ""
+            # A candidate followed only by whitespace may still complete ("</pre  " + ">"): search it again
+            self.scan = found.start() + (_BLANK_TAIL.match(self.buf, found.end()) is None)
+        elif len(self.buf) < self.wait:
+            return ""
+        return self._run(False)
+
+    def close(self) -> str:
+        return self._run(True)
+
+    def minify(self, text: str) -> str:
+        return self.feed(text) + self.close()
+
+    def _need_more(self, tok: str, rest: str) -> bool:
+        return False
+
+    def _closer(self, tok: str, rest: str):
+        """Literal that ends the raw block tok opens, or None."""
+        return None
+
+    def _run(self, eof: bool) -> str:
+        buf, pos, out = self.buf, 0, []
+        match = self.TOKEN.match
+        waiting, self.closer, self.wait = self.closer, None, 0
+        while pos < len(buf):
+            m = match(buf, pos)
+            tok = m.group()
+            if not eof and (m.end() == len(buf) or self._need_more(tok, buf[pos:pos + 16])):
+                closer = self._closer(tok, buf[pos:pos + 16])
+                if closer is None:
+                    self.wait = 2 * (len(buf) - pos)
+                else:
+                    # Still the same block: keep searching past the closer candidate that failed
+                    if pos or waiting is None:
+                        self.scan = 1
+                    self.closer, self.closer_len = re.compile(re.escape(closer), re.I), len(closer)
+                break
+            pos = m.end()
+            self._emit(tok, out)
+        self.buf = buf[pos:]
+        return "".join(out)
+
+class HtmlMinifier(StreamMinifier):
+    """Drops comments, removes whitespace between tags and collapses other runs
+    to one space; <pre>, <script>, <style> and <textarea> bodies are kept verbatim."""
+    # Text runs swallow ordinary tags and single spaces that are not between tags
+    TEXT = r'(?:[^\s<]|<(?!!--|(?:pre|script|style|textarea)\b))+'
+    TOKEN = re.compile(rf'<!--.*?-->|<(pre|script|style|textarea)\b[^>]*>.*?</\1\s*>'
+                       rf'|{TEXT}(?:(?:(?<!>) | (?!<)){TEXT})*|\s+|<', re.S | re.I)
+    RAW_OPEN = re.compile(r'<!--|<(pre|script|style|textarea)\b', re.I)
+
+    def _need_more(self, tok, rest):
+        return tok == "<" and (len(rest) < 11 or self.RAW_OPEN.match(rest) is not None)
+
+    def _closer(self, tok, rest):
+        m = self.RAW_OPEN.match(rest) if tok == "<" else None
+        return None if m is None else "-->" if m.group(1) is None else "</" + m.group(1)
+
+    def _emit(self, tok, out):
+        if tok.startswith("<!--"):
+            return
+        if tok.isspace():
+            self.pending_ws = True
+            return
+        if self.pending_ws and self.last and not (self.last == ">" and tok[0] == "<"):
+            out.append(" ")
+        self.pending_ws = False
+        out.append(tok)
+        self.last = tok[-1]
+
+class CssMinifier(StreamMinifier):
+    """Drops comments, collapses whitespace and removes it around { } : ; ,
+    string literals are kept verbatim."""
+    TOKEN = re.compile(r'/\*.*?\*/|"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\''
+                       r'|[^\s{}:;,"\'/]+(?: [^\s{}:;,"\'/]+)*|\s+|[{}:;,]|.', re.S)
+
+    def _need_more(self, tok, rest):
+        return (tok == "/" and (len(rest) < 2 or rest.startswith("/*"))) or tok in ("\"", "'")
+
+    def _closer(self, tok, rest):
+        return "*/" if tok == "/" and rest.startswith("/*") else tok if tok in ("\"", "'") else None
+
+    def _emit(self, tok, out):
+        if tok.startswith("/*"):
+            return
+        if tok.isspace():
+            self.pending_ws = True
+            return
+        punct = tok in ("{", "}", ":", ";", ",")
+        if self.pending_ws and self.last and not punct and self.last not in "{}:;,":
+            out.append(" ")
+        self.pending_ws = False
+        out.append(tok)
+        self.last = tok[-1] if punct else "."
 
 def html_minify(text: str) -> str:
-    t = re.sub(r'<!--.*?-->', '', text, flags=re.S)
-    t = re.sub(r'>\s+<', '><', t)
-    t = re.sub(r'\s+', ' ', t)
-    return t.strip()
+    return HtmlMinifier().minify(text)
 
 def css_minify(text: str) -> str:
-    t = re.sub(r'/\*.*?\*/', '', text, flags=re.S)
-    t = re.sub(r'\s+', ' ', t)
-    t = re.sub(r'\s*([{}:;,])\s*', r'\1', t)
-    return t.strip()
+    return CssMinifier().minify(text)
+
+def html_css_minify(text: str, lang: str = "html") -> str:
+    return css_minify(text) if lang == "css" else html_minify(text)
 
 # -------------------------
 # Python Methods
 # -------------------------
+class PyRename(CountingTransformer):
+    def __init__(self):
+        self.map = {}
+    def fresh(self, orig):
+        if orig not in self.map:
+            self.map[orig] = gen_name(6)
+        return self.map[orig]
+    def visit_FunctionDef(self, node):
+        if not (node.name.startswith("__") and node.name.endswith("__")):
+            node.name = self.fresh(node.name)
+        self.generic_visit(node)
+        return node
+
 def py_rename_functions(text: str) -> str:
     try:
-        tree = ast.parse(text)
-        class PyRename(ast.NodeTransformer):
-            def __init__(self):
-                self.map = {}
-            def fresh(self, orig):
-                if orig not in self.map:
-                    self.map[orig] = gen_name(6)
-                return self.map[orig]
-            def visit_FunctionDef(self, node):
-                if not (node.name.startswith("__") and node.name.endswith("__")):
-                    node.name = self.fresh(node.name)
-                self.generic_visit(node)
-                return node
-        tree = PyRename().visit(tree)
-        ast.fix_missing_locations(tree)
-        return ast.unparse(tree)
+        return run_ast_passes(text, [("py_rename_functions", PyRename())])
     except Exception:
         return text
 
@@ -1034,27 +2084,25 @@ exec(base64.b64decode("{encoded}").decode("utf-8"))'''
 # C++ Obfuscation Methods
 # -------------------------
 def cpp_mba_transform(text: str) -> str:
-    text = re.sub(r'(\w+)\s*\+\s*(\w+)', r'((\1 ^ \2) + 2 * (\1 & \2))', text)
-    text = re.sub(r'(\w+)\s*-\s*(\w+)', r'((\1 ^ \2) - 2 * (~(\1) & \2))', text)
+    text = regex_sub(r'(\w+)\s*\+\s*(\w+)', r'((\1 ^ \2) + 2 * (\1 & \2))', text)
+    text = regex_sub(r'(\w+)\s*-\s*(\w+)', r'((\1 ^ \2) - 2 * (~(\1) & \2))', text)
     return text
 
 def cpp_control_flow_flatten(text: str) -> str:
-    if HAS_CLANG:
-        index = clang.cindex.Index.create()
+    cindex = optional_import("clang.cindex")
+    if cindex is not None:
+        index = cindex.Index.create()
         tu = index.parse('tmp.cpp', unsaved_files=[('tmp.cpp', text)], args=['-std=c++17'])
-    text = re.sub(r'if\s*\((.*?)\)\s*\{(.*?)\}', r'switch(rand() % 2) { case 0: if(!(\1)) break; \2 break; default: /* junk */; }', text, flags=re.S)
+    text = regex_sub(r'if\s*\((.*?)\)\s*\{(.*?)\}', r'switch(rand() % 2) { case 0: if(!(\1)) break; \2 break; default: /* junk */; }', text, flags=re.S)
     return text
 
 def cpp_dead_code_insert(text: str) -> str:
-    lines = text.splitlines()
-    for i in range(len(lines) // 5):
-        junk = f"if (false) {{ int {gen_name()} = {random.randint(1,100)}; /* dead code */ }}"
-        lines.insert(random.randint(0, len(lines)), junk)
-    return '\n'.join(lines)
+    """One junk statement per five lines, at a random place within those five (see stream_cpp_dead_code)."""
+    return "".join(stream_cpp_dead_code([text]))
 
 def cpp_string_encrypt(text: str, key: str) -> str:
     new_text, literals = extract_string_placeholders(text, "cpp")
-    encrypted = [custom_encrypt_string(lit.strip('"\''), key) for lit in literals]
+    encrypted = string_cipher(key).encrypt_many(lit.strip('"\'') for lit in literals)
     decoder = f'''#include <string>
 std::string decrypt(const std::string& s) {{
     std::string key = "{key}";
@@ -1068,9 +2116,105 @@ std::string decrypt(const std::string& s) {{
     def rep(m):
         idx = int(m.group(1))
         return f'decrypt("{encrypted[idx]}")'
-    new_text = re.sub(r'__STR(\d+)__', rep, new_text)
+    new_text = regex_sub(r'__STR(\d+)__', rep, new_text)
     return decoder + new_text
 
+# -------------------------
+# Streaming Text Pipeline
+# -------------------------
+# Line-local text methods as stages over str chunks: consecutive ones run as one
+# pass, block by block, instead of each making a full-size copy of the text.
+JS_CALL_PATTERN = r'\b([a-zA-Z_$][\w$]*)\s*\('
+PS_DEAD_CODE = '\nif ($false) { Write-Host "dead" }'
+
+# Where a block may end, as `.*<boundary>`: the match runs up to the last boundary of a buffer.
+# A line break (a \r only once the next character is known not to be \n) ...
+LINE_CUT = re.compile(r'.*(?:[\n\x0b\x0c\x1c-\x1e\x85\u2028\u2029]|\r(?=[^\n]))', re.S)
+# ... whitespace, which no URL, IP or key contains ...
+SPACE_CUT = re.compile(r'.*\s', re.S)
+# ... or a character that cannot be part of `name (`
+CALL_CUT = re.compile(r'.*[^\w$\s]', re.S)
+
+def iter_text_chunks(path: str, chunk_size: int = STREAM_CHUNK):
+    """read_text() in chunks, with the same decoding and newline translation."""
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+def text_blocks(chunks, cut, size: int = STREAM_CHUNK):
+    """Regroup str chunks into blocks of at least `size` characters that end where `cut` allows.
+
+    A method whose matches never cross such a boundary gives the same result
+    block by block as on the whole text. Text without a boundary (one huge
+    line) is held, re-scanning only its new tail, until one turns up.
+    """
+    pending, held, need, start = [], 0, size, 0
+    for chunk in chunks:
+        pending.append(chunk)
+        held += len(chunk)
+        if held < need:
+            continue
+        buf = "".join(pending)
+        m = cut.match(buf, start)
+        if m is None:
+            # Grow geometrically so a boundary-free run is joined O(log n) times
+            pending, need, start = [buf], 2 * held, max(0, held - 1)
+            continue
+        yield buf[:m.end()]
+        rest = buf[m.end():]
+        pending, held, need, start = [rest], len(rest), size, max(0, len(rest) - 1)
+    rest = "".join(pending)
+    if rest:
+        yield rest
+
+def stream_minify(chunks, *_args):
+    sep = ""
+    for block in text_blocks(chunks, LINE_CUT):
+        block = uni_minify(block)
+        if block:
+            yield sep + block
+            sep = " "
+
+def stream_network_data(chunks, key: str = "secret"):
+    for block in text_blocks(chunks, SPACE_CUT):
+        yield network_data_obfuscate(block, key)
+
+def stream_html_css_minify(chunks, lang: str = "html"):
+    minifier = CssMinifier() if lang == "css" else HtmlMinifier()
+    for chunk in chunks:
+        out = minifier.feed(chunk)
+        if out:
+            yield out
+    yield minifier.close()
+
+def stream_js_hide_calls(chunks, *_args):
+    for block in text_blocks(chunks, CALL_CUT):
+        yield regex_sub(JS_CALL_PATTERN, r'globalThis["\1"](', block)
+
+def stream_ps_dead_code(chunks, *_args):
+    yield from chunks
+    yield PS_DEAD_CODE
+
+def stream_cpp_dead_code(chunks, *_args):
+    sep, group = "", []
+    for block in text_blocks(chunks, LINE_CUT):
+        lines = []
+        for line in block.splitlines():
+            group.append(line)
+            if len(group) == 5:
+                junk = f"if (false) {{ int {gen_name()} = {rng.randint(1,100)}; /* dead code */ }}"
+                group.insert(rng.randint(0, 5), junk)
+                lines += group
+                group = []
+        if lines:
+            yield sep + "\n".join(lines)
+            sep = "\n"
+    if group:
+        yield sep + "\n".join(group)
+
 # -------------------------
 # Decoder Generators
 # -------------------------
@@ -1273,6 +2417,304 @@ def gen_decoder_for_html_css_images(html_css_path: str, key: str):
         print(f"Error creating HTML/CSS image decoder: {e}")
         return None
 
+def gen_decoder_for_text(obf_path: str, xor_key: bytes, advanced_security: bool = False):
+    base_name = os.path.splitext(obf_path)[0]
+    decoder_path = f"{base_name}_decoder.py"
+    key_hex = xor_key.hex() if xor_key else ""
+    anti_analysis_code = (py_anti_debug_full("") if advanced_security
+                          else "def _advanced_anti_analysis():\n    return False\n")
+    decoder_code = f'''#!/usr/bin/env python3
+# Decoder for obfuscated text file
+# Generated automatically {time.strftime("%Y-%m-%d %H:%M:%S")}
+import base64
+import os
+import sys
+import hashlib
+import ctypes
+import platform
+import time
+
+{DECODER_INTEGRITY_SNIPPET}
+{DECODER_XOR_SNIPPET}
+{DECODER_STREAM_SNIPPET}
+{anti_analysis_code}
+
+def decode_obfuscated_text():
+    """Decodes obfuscated text file"""
+    input_file = r"{os.path.abspath(obf_path)}"
+    output_file = r"{base_name}_restored{os.path.splitext(obf_path)[1]}"
+    try:
+        if _advanced_anti_analysis():
+            print("⚠️ Analysis environment detected!")
+            os.remove(__file__)
+            sys.exit(1)
+        check_integrity()
+        if _is_base64(_read_file(input_file)):
+            try:
+                _write_text(output_file, _b64_stream(_read_file(input_file)))
+                print(f"✅ Base64 decoding successful!")
+                print(f"📁 Saved: {{output_file}}")
+                return
+            except (ValueError, UnicodeDecodeError):
+                pass
+        if "{key_hex}":
+            key = bytes.fromhex("{key_hex}")
+            _write_text(output_file, _xor_stream(_utf8_clean(_read_file(input_file)), key), 'ignore')
+            print(f"✅ XOR decoding successful!")
+            print(f"📁 Saved: {{output_file}}")
+            return
+        with open(input_file, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read(1000)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(f"# Could not automatically decode\\n# Source file: {{input_file}}\\n# Try manual decoding\\n\\n{{content}}")
+        print(f"⚠️ Automatic decoding failed")
+        print(f"📁 Copy saved: {{output_file}}")
+    finally:
+        if os.path.exists(__file__):
+            print("🗑️ Self-destructing decoder...")
+            os.remove(__file__)
+
+if __name__ == "__main__":
+    decode_obfuscated_text()
+'''
+    try:
+        write_bytes(decoder_path, seal_decoder(decoder_code))
+        return decoder_path
+    except Exception as e:
+        print(f"Error creating text decoder: {e}")
+        return None
+
+def gen_decoder_for_exe(obf_path: str, xor_key: bytes, advanced_security: bool = False):
+    base_name = os.path.splitext(obf_path)[0]
+    decoder_path = f"{base_name}_decoder.py"
+    key_hex = xor_key.hex() if xor_key else ""
+    anti_analysis_code = (py_anti_debug_full("") if advanced_security
+                          else "def _advanced_anti_analysis():\n    return False\n")
+    decoder_code = f'''#!/usr/bin/env python3
+# Decoder for obfuscated EXE file
+# Generated automatically {time.strftime("%Y-%m-%d %H:%M:%S")}
+import base64
+import os
+import sys
+import hashlib
+import ctypes
+import platform
+import time
+
+{DECODER_INTEGRITY_SNIPPET}
+{DECODER_XOR_SNIPPET}
+{DECODER_STREAM_SNIPPET}
+{anti_analysis_code}
+
+{DECODER_SEGMENT_SNIPPET}
+def _reverse_file(path, size):
+    with open(path, 'rb') as src, open(path + ".tmp", 'wb') as dst:
+        for end in range(size, 0, -CHUNK):
+            src.seek(max(0, end - CHUNK))
+            dst.write(src.read(end - max(0, end - CHUNK))[::-1])
+    os.replace(path + ".tmp", path)
+
+def decode_obfuscated_exe():
+    """Decodes obfuscated executable file"""
+    input_file = r"{os.path.abspath(obf_path)}"
+    output_file = r"{base_name}_restored{os.path.splitext(obf_path)[1]}"
+    try:
+        if _advanced_anti_analysis():
+            print("⚠️ Analysis environment detected!")
+            os.remove(__file__)
+            sys.exit(1)
+        check_integrity()
+        original_size = os.path.getsize(input_file)
+        print(f"📏 Original size: {{original_size:,}} bytes")
+        table = None
+        with open(input_file, 'rb') as f:
+            head = f.read(4096)
+        if head.startswith(b"SEG:"):
+            try:
+                table = _segment_table(head, original_size)
+                print(f"✅ Removed segmentation header")
+                print(f"📏 After segmentation: {{sum(length for _, length in table):,}} bytes")
+            except Exception as e:
+                print(f"⚠️ Error processing segmentation: {{e}}")
+        data = _payload(input_file, table)
+        if _is_base64(_payload(input_file, table)):
+            data = _b64_stream(data)
+            print(f"✅ Base64 decoding")
+        else:
+            print("ℹ️ Base64 decoding not required")
+        if "{key_hex}":
+            key = bytes.fromhex("{key_hex}")
+            data = _xor_stream(data, key)
+            print(f"✅ XOR decoding (key: {{len(key)}} bytes)")
+        final_size = _write_chunks(output_file, data)
+        with open(output_file, 'rb') as f:
+            head = f.read(4)
+            f.seek(max(0, final_size - 4))
+            tail = f.read()
+        if final_size > 4 and head == tail[::-1]:
+            _reverse_file(output_file, final_size)
+            print(f"✅ Byte order reversed")
+            with open(output_file, 'rb') as f:
+                head = f.read(2)
+        size_change = ((final_size - original_size) / original_size * 100)
+        print(f"\\n🎉 DECODING COMPLETED!")
+        print(f"📁 Source: {{os.path.basename(input_file)}}")
+        print(f"📁 Restored: {{os.path.basename(output_file)}}")
+        print(f"📏 Size: {{original_size:,}} → {{final_size:,}} bytes")
+        print(f"📈 Change: {{size_change:+.1f}}%")
+        if head[:2] == b'MZ':
+            print(f"✅ File is executable (PE header found)")
+        else:
+            print(f"⚠️ PE header not found - possibly corrupted")
+    finally:
+        if os.path.exists(__file__):
+            print("🗑️ Self-destructing decoder...")
+            os.remove(__file__)
+
+if __name__ == "__main__":
+    decode_obfuscated_exe()
+'''
+    try:
+        write_bytes(decoder_path, seal_decoder(decoder_code))
+        return decoder_path
+    except Exception as e:
+        print(f"Error creating EXE decoder: {e}")
+        return None
+
+# How the batch decoder undoes each method; a chain is undone from its end up to the first method missing here
+BATCH_UNDO = {
+    "EXE · Base64 Encoding": "b64",
+    "EXE · XOR Encryption": "xor",
+    "EXE · Byte Order Reversal": "reverse",
+    "EXE · Byte Segmentation": "segments",
+    "UNI · Base64 Encoding": "b64",
+    "UNI · XOR + Base64": "xor_b64",
+    "IMG · XOR Encryption": "xor_custom",
+}
+MANIFEST_FIELDS = ["output", "restore", "chain", "sha256"]
+
+def manifest_entry(out_path: str, chain: list) -> list:
+    """One manifest row for an output; paths are made relative to the manifest when it is written."""
+    base, ext = os.path.splitext(os.path.abspath(out_path))
+    return [base + ext, f"{base}_restored{ext}", list(chain), file_digest(out_path)]
+
+def gen_batch_decoder(manifest_path: str, entries: list, xor_key: bytes, custom_key: str):
+    """Write the manifest for a whole batch and the one decoder module that restores every file in it.
+
+    The manifest lists each distinct method chain once; rows are
+    [output, restore, chain index, sha256] with paths relative to the manifest.
+    Returns the decoder path, or None on error.
+    """
+    root = os.path.dirname(os.path.abspath(manifest_path))
+    decoder_path = f"{os.path.splitext(manifest_path)[0]}_decoder.py"
+
+    def rel(path):
+        try:
+            return os.path.relpath(path, root)
+        except ValueError:
+            return path
+    chains, files = {}, []
+    for output, restore, chain, digest in entries:
+        files.append([rel(output), rel(restore), chains.setdefault(tuple(chain), len(chains)), digest])
+    manifest = {"version": VERSION, "keys": {"xor": xor_key.hex(), "custom": custom_key},
+                "chains": [list(chain) for chain in chains], "fields": MANIFEST_FIELDS, "files": files}
+    decoder_code = f'''#!/usr/bin/env python3
+# Batch decoder for the outputs listed in {os.path.basename(manifest_path)}
+# Generated automatically {time.strftime("%Y-%m-%d %H:%M:%S")}
+# Usage: python {os.path.basename(decoder_path)} [manifest.json]
+import os
+import sys
+import json
+import hashlib
+
+{DECODER_INTEGRITY_SNIPPET}
+{DECODER_XOR_SNIPPET}
+{DECODER_STREAM_SNIPPET}
+{DECODER_SEGMENT_SNIPPET}
+UNDO = {BATCH_UNDO!r}
+MANIFEST = {os.path.basename(manifest_path)!r}
+
+def _sha256(path):
+    h = hashlib.sha256()
+    for chunk in _read_file(path):
+        h.update(chunk)
+    return h.hexdigest()
+
+def _reversed_chunks(path):
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        for end in range(size, 0, -CHUNK):
+            f.seek(max(0, end - CHUNK))
+            yield f.read(end - max(0, end - CHUNK))[::-1]
+
+def restore(src, dst, chain, keys):
+    """Undo chain (methods in the order they were applied) from src into dst; returns the methods left undone"""
+    chain = list(chain)
+    path, data, spools = src, None, []
+    try:
+        while chain and chain[-1] in UNDO:
+            op = UNDO[chain.pop()]
+            if op in ("segments", "reverse"):
+                # Seeking stages read a file: spool what has been decoded so far
+                if data is not None:
+                    path = f"{{dst}}.part{{len(spools)}}"
+                    spools.append(path)
+                    _write_chunks(path, data)
+                if op == "segments":
+                    with open(path, 'rb') as f:
+                        data = _payload(path, _segment_table(f.read(4096), os.path.getsize(path)))
+                else:
+                    data = _reversed_chunks(path)
+                continue
+            if data is None:
+                data = _read_file(path)
+            if op == "b64":
+                data = _b64_stream(data)
+            elif op == "xor":
+                data = _xor_stream(data, keys["xor"])
+            elif op == "xor_b64" and keys["xor"]:
+                data = _xor_stream(_b64_stream(data), keys["xor"])
+            elif op == "xor_custom":
+                data = _xor_stream(data, keys["custom"])
+        _write_chunks(dst, _read_file(path) if data is None else data)
+    finally:
+        for spool in spools:
+            os.remove(spool)
+    return chain
+
+def main(argv):
+    check_integrity()
+    manifest_path = argv[1] if len(argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), MANIFEST)
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    root = os.path.dirname(os.path.abspath(manifest_path))
+    keys = {{"xor": bytes.fromhex(manifest["keys"]["xor"]), "custom": manifest["keys"]["custom"].encode('utf-8')}}
+    restored = failed = 0
+    for output, restore_to, chain, digest in manifest["files"]:
+        try:
+            src = os.path.join(root, output)
+            if _sha256(src) != digest:
+                raise ValueError("checksum mismatch")
+            left = restore(src, os.path.join(root, restore_to), manifest["chains"][chain], keys)
+            print(f"✅ {{restore_to}}" + (f" (not reversible: {{', '.join(left)}})" if left else ""))
+            restored += 1
+        except Exception as e:
+            print(f"❌ {{output}}: {{e}}")
+            failed += 1
+    print(f"\\n🎉 Restored {{restored}} file(s), {{failed}} failed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
+'''
+    try:
+        write_text(manifest_path, json.dumps(manifest, ensure_ascii=False, separators=(",", ":")))
+        write_bytes(decoder_path, seal_decoder(decoder_code))
+        return decoder_path
+    except Exception as e:
+        print(f"Error creating batch decoder: {e}")
+        return None
+
 # -------------------------
 # Methods registries
 # -------------------------
@@ -1287,21 +2729,21 @@ PYTHON_METHODS = {
 
 POWERSHELL_METHODS = {
     "PS · Anti-Debug: Debugger Detection": ps_detect_debugger,
-    "PS · Obfuscate Flow (dead code)": lambda t: t + '\nif ($false) { Write-Host "dead" }',
+    "PS · Obfuscate Flow (dead code)": lambda t: t + PS_DEAD_CODE,
 }
 
 JS_METHODS = {
     "JS · Anti-Debug: DevTools Detection": js_detect_debugger,
-    "JS · Hide Calls (globalThis)": lambda t: re.sub(r'\b([a-zA-Z_$][\w$]*)\s*\(', r'globalThis["\1"](', t),
+    "JS · Hide Calls (globalThis)": lambda t: regex_sub(JS_CALL_PATTERN, r'globalThis["\1"](', t),
 }
 
 DOTNET_METHODS = {
-    "NET · Member Renaming (Types/Methods)": lambda p: dotnet_rename_members(p, "obf_key"),
-    "NET · String Encryption + Decoder": lambda p: dotnet_encrypt_strings(p, "obf_key"),
-    "NET · Junk Code Addition": lambda p: dotnet_add_junk(p, "obf_key"),
-    "NET · Anti-Debug (Debugger.IsAttached)": lambda p: dotnet_anti_debug(p, "obf_key"),
-    "NET · Metadata Compression": lambda p: dotnet_compress_metadata(p, "obf_key"),
-    "RESX · String Encryption": lambda p: resx_encrypt_strings(p, "obf_key"),
+    "NET · Member Renaming (Types/Methods)": lambda p, k="obf_key": dotnet_rename_members(p, k),
+    "NET · String Encryption + Decoder": lambda p, k="obf_key": dotnet_encrypt_strings(p, k),
+    "NET · Junk Code Addition": lambda p, k="obf_key": dotnet_add_junk(p, k),
+    "NET · Anti-Debug (Debugger.IsAttached)": lambda p, k="obf_key": dotnet_anti_debug(p, k),
+    "NET · Metadata Compression": lambda p, k="obf_key": dotnet_compress_metadata(p, k),
+    "RESX · String Encryption": lambda p, k="obf_key": resx_encrypt_strings(p, k),
 }
 
 EXE_METHODS = {
@@ -1316,7 +2758,7 @@ CPP_METHODS = {
     "CPP · MBA Transformation": cpp_mba_transform,
     "CPP · Control Flow Flattening": cpp_control_flow_flatten,
     "CPP · Dead Code Insertion": cpp_dead_code_insert,
-    "CPP · String Encryption": lambda t: cpp_string_encrypt(t, "secret_key"),
+    "CPP · String Encryption": lambda t, k="secret_key": cpp_string_encrypt(t, k),
     "CPP · Anti-Debug: Debugger Detection": cpp_detect_debugger,
     "CPP · Anti-Debug Full": cpp_anti_debug_full,
 }
@@ -1333,10 +2775,33 @@ UNIVERSAL_METHODS = {
 }
 
 HTML_CSS_METHODS = {
-    "HTML/CSS · Minification": lambda t: html_minify(t) if detect_lang(t) == "html" else css_minify(t),
+    "HTML/CSS · Minification": html_css_minify,
     "HTML/CSS · Image Obfuscation": html_css_image_obfuscation,
 }
 
+EXE_STREAM_STAGES = {
+    "EXE · Base64 Encoding": stream_base64,
+    "EXE · XOR Encryption": stream_xor,
+    "EXE · Byte Shuffling": stream_shuffle,
+    "EXE · Byte Order Reversal": stream_reverse_bytes,
+    "EXE · Byte Segmentation": stream_segment_bytes,
+}
+TEXT_STREAM_STAGES = {
+    "UNI · Text Minification": stream_minify,
+    "UNI · Network Data Obfuscation (№9)": stream_network_data,
+    "JS · Hide Calls (globalThis)": stream_js_hide_calls,
+    "HTML/CSS · Minification": stream_html_css_minify,
+    "PS · Obfuscate Flow (dead code)": stream_ps_dead_code,
+    "CPP · Dead Code Insertion": stream_cpp_dead_code,
+}
+EXE_PREVIEW_WINDOWS = {
+    "EXE · Base64 Encoding": preview_base64,
+    "EXE · XOR Encryption": preview_xor,
+    "EXE · Byte Shuffling": preview_shuffle,
+    "EXE · Byte Order Reversal": preview_reverse_bytes,
+    "EXE · Byte Segmentation": preview_segment_bytes,
+}
+
 IMAGE_METHODS = {
     "IMG · XOR Encryption": image_xor_encrypt,
 }
@@ -1346,6 +2811,29 @@ CONFIG_METHODS = {
     "CFG · XML Obfuscation (№6)": xml_obfuscate,
 }
 
+# Methods that are a single NodeTransformer pass; consecutive ones share one parse/unparse
+AST_PASSES = {
+    "PY · Function Renaming (AST)": lambda key: PyRename(),
+    "AI · Custom Obfuscation": lambda key: AIObfuscator(),
+    "AI · Anti-Deobfuscation Traps": lambda key: AntiAITraps(),
+    "AI · Advanced Morphing (№4)": lambda key: AdvancedAIObfuscator(key),
+}
+# Emits IfExp nodes with statement bodies, which do not re-parse: later passes must see its text
+AST_TERMINAL_PASSES = {"AI · Advanced Morphing (№4)"}
+
+# Text methods whose output on the merged text equals their per-file outputs joined by
+# MERGE_SEPARATOR, so merge mode can run them file by file. The others rename across files,
+# wrap the whole text or add a prelude once; minification also collapses the separator and
+# picks HTML or CSS from the merged text, dead code counts its line groups across files and
+# flattening's lazy `if (...) {` match can run from a braceless if into the next file.
+FILE_LOCAL_METHODS = {
+    "JS · Hide Calls (globalThis)",
+    "CPP · MBA Transformation",
+    "HTML/CSS · Image Obfuscation",
+    "UNI · Network Data Obfuscation (№9)",
+}
+MERGE_SEPARATOR = "\n\n# === MERGED FILES ===\n\n"
+
 LANG_TEXT_METHODS = {
     "python": PYTHON_METHODS,
     "powershell": POWERSHELL_METHODS,
@@ -1371,48 +2859,922 @@ for k, v in HTML_CSS_METHODS.items(): ALL_METHODS[k] = (v, "text")
 for k, v in IMAGE_METHODS.items(): ALL_METHODS[k] = (v, "image")
 for k, v in CONFIG_METHODS.items(): ALL_METHODS[k] = (v, "config")
 
-# -------------------------
-# GUI App
-# -------------------------
-class AppBase:
-    def __init__(self, root):
-        self.root = root
-        self.theme = 'light'
-        self.files = []
-        self.output_path = tk.StringVar()
-        self.merge_files = tk.BooleanVar(value=False)
-        self.process_each = tk.BooleanVar(value=False)
-        self.generate_decoder = tk.BooleanVar(value=False)
-        self.advanced_security = tk.BooleanVar(value=False)
-        self.xor_key_str = tk.StringVar(value="")
-        self.custom_key = tk.StringVar(value="obf_key_123")
-        self.vars = {}
-        for grp in ("python", "powershell", "js", "dotnet", "exe", "html", "css", "cpp", "universal", "image", "config"):
-            self.vars[grp] = {}
-        self._build_ui()
-        self._apply_theme()
-        random.seed(42)
+class MethodSpec:
+    """Typed registry entry: how the engine calls a method and what it may do with it.
 
-    def _apply_theme(self):
-        if HAS_TTKTHEMES:
-            style = ttkthemes.ThemedStyle(self.root)
-            style.theme_use('equilux' if self.theme == 'dark' else 'clam')
-        else:
-            bg = '#2c2c2c' if self.theme == 'dark' else '#f8f9fa'
-            fg = '#ffffff' if self.theme == 'dark' else '#000000'
-            self.root.configure(bg=bg)
-            self.preview.configure(bg=bg, fg=fg)
-            self.status_lbl.configure(bg=bg, fg=fg)
+    kind is what func takes: "text", "binary" (EXE bytes), or a path for
+    "image", "dotnet", "resx" and "config". key is what is passed after the
+    input: None, the "xor" or "custom" engine key, or "lang", the language of
+    the file being processed; images marks text methods that
+    return (text, encrypted image count). local text methods never edit across
+    a file boundary. stage is the chunked EXE_STREAM_STAGES or
+    TEXT_STREAM_STAGES counterpart of func, or for a file method its
+    bounded-memory variant, which makes the method streamable.
+    cost is "linear", "ast" (parses the text: ast_pass builds its
+    NodeTransformer from the custom key, and a terminal pass ends a fused
+    run), "buffer" (needs the whole input at once; a writer writes its
+    output for a whole buffer straight to a file, so it ends a streamed run)
+    or "file" (reads and writes paths itself, to the output template filled
+    by output_path(), for inputs whose detect_lang() is lang; decoder
+    generates the script that restores that output).
+    """
+    __slots__ = ("name", "func", "kind", "key", "images", "local", "stage", "ast_pass", "terminal", "cost",
+                 "writer", "output", "lang", "decoder")
 
-    def _switch_theme(self):
-        self.theme = 'light' if self.theme == 'dark' else 'dark'
-        self._apply_theme()
+    def __init__(self, name, func, kind, key=None, images=False, local=False, stage=None, ast_pass=None,
+                 terminal=False, cost="linear", writer=None, output=None, lang=None, decoder=None):
+        self.name, self.func, self.kind, self.key = name, func, kind, key
+        self.images, self.local, self.stage, self.cost = images, local, stage, cost
+        self.ast_pass, self.terminal, self.writer = ast_pass, terminal, writer
+        self.output, self.lang, self.decoder = output, lang, decoder
 
-    def _build_ui(self):
-        self.root.title(t('title'))
-        top_frame = tk.Frame(self.root)
-        top_frame.pack(fill="x", padx=8, pady=6)
-        tk.Button(top_frame, text=t('select_files'), command=self.pick_files, 
+    @property
+    def streamable(self) -> bool:
+        return self.stage is not None
+
+    def output_path(self, path: str) -> str:
+        base, ext = os.path.splitext(path)
+        return self.output.format(base=base, ext=ext)
+
+    def args(self, xor_key: bytes, custom_key: str, lang: str = None) -> tuple:
+        return {"xor": (xor_key,), "custom": (custom_key,), "lang": (lang,)}.get(self.key, ())
+
+METHOD_KEYS = {
+    "UNI · XOR + Base64": "xor",
+    "EXE · XOR Encryption": "xor",
+    "CPP · String Encryption": "custom",
+    "HTML/CSS · Image Obfuscation": "custom",
+    "HTML/CSS · Minification": "lang",
+    "AI · Custom Obfuscation": "custom",
+    "AI · Anti-Deobfuscation Traps": "custom",
+    "AI · Advanced Morphing (№4)": "custom",
+    "UNI · Network Data Obfuscation (№9)": "custom",
+}
+BUFFER_METHODS = {"EXE · Byte Shuffling", "EXE · Byte Order Reversal", "EXE · Byte Segmentation"}
+BUFFER_WRITERS = {"EXE · Byte Segmentation": write_segments}
+IMAGE_TEXT_METHODS = {"HTML/CSS · Image Obfuscation"}
+# Where each method that writes its own file puts it, from the input's base path and extension
+FILE_OUTPUTS = {
+    "NET · Member Renaming (Types/Methods)": "{base}_renamed{ext}",
+    "NET · String Encryption + Decoder": "{base}_strings{ext}",
+    "NET · Junk Code Addition": "{base}_junk{ext}",
+    "NET · Anti-Debug (Debugger.IsAttached)": "{base}_antidebug{ext}",
+    "NET · Metadata Compression": "{base}_compressed{ext}",
+    "RESX · String Encryption": "{base}_encrypted.resx",
+    "CFG · JSON Obfuscation (№6)": "{base}_obfuscated.json",
+    "CFG · XML Obfuscation (№6)": "{base}_obfuscated.xml",
+    "IMG · XOR Encryption": "{base}_obf{ext}",
+}
+# File methods whose input type differs from their kind, and their variants for inputs above the stream threshold
+FILE_LANGS = {"CFG · JSON Obfuscation (№6)": "json", "CFG · XML Obfuscation (№6)": "xml"}
+FILE_STREAM_VARIANTS = {
+    "RESX · String Encryption": resx_encrypt_strings_stream,
+    "CFG · JSON Obfuscation (№6)": json_obfuscate_stream,
+    "CFG · XML Obfuscation (№6)": xml_obfuscate_stream,
+}
+FILE_DECODERS = {"RESX · String Encryption": gen_decoder_for_resx, "IMG · XOR Encryption": gen_decoder_for_images}
+
+METHOD_SPECS = {}
+for k, (v, kind) in ALL_METHODS.items():
+    path = kind not in ("text", "binary")
+    METHOD_SPECS[k] = MethodSpec(
+        k, v, kind,
+        key="custom" if path else METHOD_KEYS.get(k),
+        images=k in IMAGE_TEXT_METHODS,
+        local=k in FILE_LOCAL_METHODS,
+        stage=(FILE_STREAM_VARIANTS if path else EXE_STREAM_STAGES if kind == "binary" else TEXT_STREAM_STAGES).get(k),
+        ast_pass=AST_PASSES.get(k),
+        terminal=k in AST_TERMINAL_PASSES,
+        cost=("file" if path else "ast" if k in AST_PASSES
+              else "buffer" if k in BUFFER_METHODS else "linear"),
+        writer=BUFFER_WRITERS.get(k),
+        output=FILE_OUTPUTS.get(k),
+        lang=FILE_LANGS.get(k, kind) if path else None,
+        decoder=FILE_DECODERS.get(k))
+# Input types handled by file methods rather than as text or native binaries
+FILE_METHOD_LANGS = {spec.lang for spec in METHOD_SPECS.values() if spec.lang}
+
+# -------------------------
+# Headless Engine
+# -------------------------
+METHOD_GROUPS = {
+    "python": PYTHON_METHODS,
+    "powershell": POWERSHELL_METHODS,
+    "js": JS_METHODS,
+    "dotnet": DOTNET_METHODS,
+    "exe": EXE_METHODS,
+    "html": HTML_CSS_METHODS,
+    "css": HTML_CSS_METHODS,
+    "universal": UNIVERSAL_METHODS,
+    "cpp": CPP_METHODS,
+    "image": IMAGE_METHODS,
+    "config": CONFIG_METHODS,
+}
+
+MERGEABLE_LANGS = ("python", "powershell", "js", "cpp", "html", "css")
+DEFAULT_CACHE_BYTES = 1 << 30
+
+class ResultCache:
+    """Persistent content-addressed store of obfuscated outputs, bounded by LRU eviction.
+
+    Each entry is one file named by its key: a JSON header line followed by
+    the output bytes. A hit refreshes the entry's mtime, and trim() evicts by
+    oldest mtime until the directory fits in max_bytes.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def fetch(self, key: str, out_path: str):
+        """Copy a cached output to out_path and return its metadata, or None on a miss."""
+        path = os.path.join(self.directory, key)
+        try:
+            with open(path, "rb") as src:
+                meta = json.loads(src.readline())
+                with open(out_path, "wb") as dst:
+                    shutil.copyfileobj(src, dst, STREAM_CHUNK)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return meta
+
+    def store(self, key: str, out_path: str, meta: dict):
+        path = os.path.join(self.directory, key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as dst:
+                dst.write(json.dumps(meta).encode("utf-8") + b"\n")
+                with open(out_path, "rb") as src:
+                    shutil.copyfileobj(src, dst, STREAM_CHUNK)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Cache store error {key[:12]}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def trim(self) -> tuple[int, int]:
+        """Evict least recently used entries; returns (evicted count, remaining bytes)."""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+        entries.sort()
+        evicted = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+        return evicted, total
+
+def parse_xor_key(k: str) -> bytes:
+    k = k.strip()
+    if not k:
+        return b""
+    try:
+        ival = int(k)
+        if 0 <= ival <= 255:
+            return bytes([ival])
+    except ValueError:
+        pass
+    return k.encode("utf-8")
+
+def normalize_selection(methods) -> dict:
+    """Map selected method names onto the GUI tab groups, in registry order.
+
+    Accepts either a flat iterable of names from ALL_METHODS (each name is
+    enabled in every group that offers it) or a {group: names} dict.
+    """
+    if isinstance(methods, dict):
+        wanted = {grp: set(names) for grp, names in methods.items()}
+    else:
+        names = set(methods)
+        unknown = names - set(ALL_METHODS)
+        if unknown:
+            raise ValueError(t('method_not_found', sorted(unknown)[0]))
+        wanted = {grp: names for grp in METHOD_GROUPS}
+    return {grp: [m for m in registry if m in wanted.get(grp, ())]
+            for grp, registry in METHOD_GROUPS.items()}
+
+def _process_batch(engine, files):
+    """Process-pool worker: run one contiguous slice of the batch, records in input order."""
+    return [engine.process_file(f) for f in files]
+
+class ObfuscationEngine:
+    """GUI-free obfuscation pipeline used by both AppBase and the command line."""
+
+    def __init__(self, methods, xor_key: bytes = b"", custom_key: str = "obf_key_123",
+                 generate_decoder: bool = False, advanced_security: bool = False, workers: int = 1,
+                 stream_threshold: int = STREAM_THRESHOLD, cache: ResultCache = None, seed=None,
+                 decoder_manifest: str = ""):
+        self.selection = normalize_selection(methods)
+        self.xor_key = xor_key
+        self.custom_key = custom_key
+        # With a manifest path, EXE/text/image outputs share one batch decoder instead of a script each
+        self.decoder_manifest = decoder_manifest
+        self.generate_decoder = generate_decoder or bool(decoder_manifest)
+        self.advanced_security = advanced_security
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.stream_threshold = stream_threshold
+        self.cache = cache
+        self.seed = seed
+        self._plan = None
+
+    def selected(self, group: str) -> list:
+        return self.selection.get(group, [])
+
+    def apply_file_methods(self, filepath: str, record: dict) -> None:
+        """Run the plan's methods for a file they read and write by path, adding their reports to the record.
+
+        Each method goes through the cache, and above stream_threshold a
+        streamable one runs its bounded-memory variant. The record's output
+        is the last file written.
+        """
+        results = record["messages"]
+        steps = self.file_plan(record["lang"])["steps"]
+        if not steps:
+            results.append(f"# No method selected for {os.path.basename(filepath)}")
+            return
+        if record["lang"] == "dotnet" and not has_dep("dnlib"):
+            results.append(t('no_dotnet'))
+            return
+        for _, spec, args in steps:
+            out_path = spec.output_path(filepath)
+            size_in = os.path.getsize(filepath)
+            func = spec.stage if spec.streamable and size_in >= self.stream_threshold else spec.func
+            def run(spec=spec, func=func, args=args, out_path=out_path):
+                with trace_method(record["trace"], spec.name, size_in) as entry, method_rng(spec.name):
+                    report = func(filepath, *args)
+                    entry["size_out"] = _output_size(out_path)
+                if spec.kind == "image":
+                    # Image methods return (data, output path or error)
+                    data, written = report
+                    if not data:
+                        return written
+                    report = "\n".join([t('image_obf_success'), t('output_file_written', os.path.basename(written)),
+                                        t('size_change', size_in, len(data))])
+                return report
+            try:
+                report = self._run_file_method(record, filepath, spec.name, run)
+            except Exception as e:
+                results.append(f"# ❌ Error {spec.name}: {str(e)}")
+                continue
+            results.append(report)
+            if report.startswith("# ❌") or not os.path.exists(out_path):
+                continue
+            record.update(output=out_path, size_in=size_in, size_out=os.path.getsize(out_path))
+            if self.generate_decoder and spec.decoder is not None:
+                self._add_decoder(record, out_path, [spec.name], lambda: spec.decoder(filepath, self.custom_key),
+                                  batch=spec.name in BATCH_UNDO)
+
+    def _call_text_method(self, method_name: str, method_func, text: str, lang: str = None):
+        spec = METHOD_SPECS[method_name]
+        result = method_func(text, *spec.args(self.xor_key, self.custom_key, lang))
+        return result if spec.images else (result, 0)
+
+    def _apply_ast_passes(self, text: str, steps: list, trace: list = None) -> str:
+        """Run consecutive AST methods on one parse; replay them one by one if the fused run fails."""
+        if not steps:
+            return text
+        rng_state = rng.getstate()
+        try:
+            return run_ast_passes(text, [(spec.name, spec.ast_pass(self.custom_key)) for _, spec, _ in steps], trace)
+        except Exception:
+            rng.setstate(rng_state)
+        for _, spec, args in steps:
+            with trace_method(trace, spec.name, len(text)) as entry, method_rng(spec.name):
+                text = spec.func(text, *args)
+                entry["size_out"] = len(text)
+        return text
+
+    @property
+    def plan(self) -> dict:
+        """The selection compiled once per engine (and per worker process) into per-file call lists."""
+        if self._plan is None:
+            self._plan = self._compile_plan()
+        return self._plan
+
+    def __getstate__(self):
+        # Registry callables include lambdas: workers recompile the plan instead of unpickling it
+        return {**self.__dict__, "_plan": None}
+
+    def _compile_plan(self) -> dict:
+        """Resolve selected names to (label, MethodSpec, key args) steps.
+
+        "text" maps each language (None for the rest) and "exe" holds the
+        binary methods, each as its steps, the method chain and whether every
+        step is streamable; text plans also count their leading file-local steps.
+        "files" maps each input type of the file methods to the selected ones.
+        """
+        def step(label, name, lang=None):
+            spec = METHOD_SPECS[name]
+            return (label, spec, spec.args(self.xor_key, self.custom_key, lang))
+        def compiled(steps):
+            return {"steps": steps, "chain": [s[1].name for s in steps],
+                    "stream": all(s[1].streamable for s in steps)}
+        text = {}
+        for lang in list(LANG_TEXT_METHODS) + [None]:
+            methods = LANG_TEXT_METHODS.get(lang, {})
+            steps = ([step("Text", name, lang) for name in self.selected(lang) if name in methods]
+                     + [step("Universal", name, lang) for name in self.selected("universal")])
+            text[lang] = compiled(steps)
+            text[lang]["local"] = next((i for i, s in enumerate(steps) if not s[1].local), len(steps))
+        files = {lang: [] for lang in FILE_METHOD_LANGS}
+        for group in METHOD_GROUPS:
+            for name in self.selected(group):
+                if METHOD_SPECS[name].lang is not None:
+                    files[METHOD_SPECS[name].lang].append(step("File", name))
+        return {"text": text, "exe": compiled([step("EXE", name) for name in self.selected("exe")]),
+                "files": {lang: compiled(steps) for lang, steps in files.items()}}
+
+    def text_plan(self, lang: str) -> dict:
+        text = self.plan["text"]
+        return text.get(lang, text[None])
+
+    def file_plan(self, lang: str) -> dict:
+        return self.plan["files"][lang]
+
+    def _apply_step(self, text: str, step: tuple, trace: list = None) -> tuple[str, int]:
+        """Run one plan step; a failing method is reported and skipped."""
+        label, spec, args = step
+        try:
+            with trace_method(trace, spec.name, len(text)) as entry, method_rng(spec.name):
+                result = spec.func(text, *args)
+                result, images = result if spec.images else (result, 0)
+                entry["size_out"] = len(result)
+            return result, images
+        except Exception as e:
+            print(f"{label} method error {spec.name}: {e}")
+            return text, 0
+
+    def _stages(self, chunks, steps: list):
+        """Chain the stream stages of steps over an iterable of chunks."""
+        for _, spec, args in steps:
+            chunks = bind_method_rng(spec.name, spec.stage(chunks, *args))
+        return chunks
+
+    def _apply_text_stages(self, text: str, steps: list, trace: list = None) -> str:
+        """Run consecutive line-local methods as one pass over text, block by block.
+
+        If a stage fails the run is redone step by step, so the failing method
+        is skipped like anywhere else in apply_text_methods.
+        """
+        if len(steps) < 2:
+            for step in steps:
+                text, _ = self._apply_step(text, step, trace)
+            return text
+        chunks = (text[pos:pos + STREAM_CHUNK] for pos in range(0, len(text), STREAM_CHUNK))
+        try:
+            with trace_method(trace, "Text · streamed pipeline", len(text)) as entry:
+                result = "".join(self._stages(chunks, steps))
+                entry["size_out"] = len(result)
+            return result
+        except Exception:
+            pass
+        for step in steps:
+            text, _ = self._apply_step(text, step, trace)
+        return text
+
+    def apply_text_methods(self, text: str, lang: str, trace: list = None, steps: list = None) -> tuple[str, int]:
+        encrypted_images = 0
+        if steps is None:
+            steps = self.text_plan(lang)["steps"]
+        ast_run, stream_run = [], []
+        for step in steps:
+            spec = step[1]
+            if spec.streamable:
+                text = self._apply_ast_passes(text, ast_run, trace)
+                ast_run = []
+                stream_run.append(step)
+                continue
+            text = self._apply_text_stages(text, stream_run, trace)
+            stream_run = []
+            if spec.cost == "ast":
+                ast_run.append(step)
+                if spec.terminal:
+                    text = self._apply_ast_passes(text, ast_run, trace)
+                    ast_run = []
+                continue
+            text = self._apply_ast_passes(text, ast_run, trace)
+            ast_run = []
+            text, images = self._apply_step(text, step, trace)
+            encrypted_images = images or encrypted_images
+        text = self._apply_ast_passes(text, ast_run, trace)
+        text = self._apply_text_stages(text, stream_run, trace)
+        return text, encrypted_images
+
+    def stream_text_methods(self, filepath: str, out_path: str, steps: list) -> tuple[int, int]:
+        """Streaming counterpart of apply_text_methods for plans whose steps are all streamable.
+
+        A failing stage aborts the file, as in stream_exe_methods. Returns the
+        input and output sizes in characters.
+        """
+        size_in = size_out = 0
+        def source():
+            nonlocal size_in
+            for chunk in iter_text_chunks(filepath):
+                size_in += len(chunk)
+                yield chunk
+        with open(out_path, "w", encoding="utf-8") as f:
+            for chunk in self._stages(source(), steps):
+                f.write(chunk)
+                size_out += len(chunk)
+        return size_in, size_out
+
+    def apply_exe_methods(self, data: bytes, trace: list = None) -> bytes:
+        result = data
+        for _, spec, args in self.plan["exe"]["steps"]:
+            try:
+                with trace_method(trace, spec.name, len(result)) as entry, method_rng(spec.name):
+                    result = spec.func(result, *args)
+                    entry["size_out"] = len(result)
+            except Exception as e:
+                print(f"EXE method error {spec.name}: {e}")
+        return result
+
+    def stream_exe_methods(self, filepath: str, out_path: str) -> int:
+        """Streaming counterpart of apply_exe_methods: same bytes, written chunk by chunk.
+
+        A failing stage aborts the file instead of being skipped, since its
+        upstream chunks have already been consumed. Returns the output size.
+        """
+        steps = self.plan["exe"]["steps"]
+        # A final method with a writer is scatter-written straight from the mapped stage input
+        last = steps[-1][1] if steps else None
+        scatter = last is not None and last.writer is not None
+        chunks = self._stages(FileChunks(filepath), steps[:-1] if scatter else steps)
+        if scatter:
+            with _random_access(chunks) as buf, open(out_path, "wb") as f, method_rng(last.name):
+                return last.writer(f, buf)
+        written = 0
+        with open(out_path, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                written += len(chunk)
+        return written
+
+    def _begin_job(self, record: dict, paths: list, groups: list, out_path: str, method: str = None):
+        """Hash the inputs, seed the RNG and consult the cache.
+
+        The key covers the selection of groups, or the single method whose
+        output out_path is. Returns (key, meta): meta is the cached metadata
+        when out_path has been restored from the cache, and key is None when
+        caching is off.
+        """
+        if self.cache is None and self.seed is None:
+            return None, None
+        digests = [file_digest(p) for p in paths]
+        if self.seed is not None:
+            JOB_SEED.set(f"{self.seed}:{':'.join(digests)}")
+        if self.cache is None:
+            return None, None
+        payload = json.dumps([code_version(), digests, record["lang"], {g: self.selected(g) for g in groups},
+                              method, self.xor_key.hex(), self.custom_key, self.seed])
+        key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        meta = self.cache.fetch(key, out_path)
+        # A file with several cached outputs is a hit only if all of them were
+        record["cache"] = "hit" if meta is not None and record["cache"] != "miss" else "miss"
+        return key, meta
+
+    def _run_file_method(self, record: dict, filepath: str, name: str, run) -> str:
+        """Run a method that writes its own output file through the cache; returns its report.
+
+        run() performs the method. A report starting with "# ❌" is an error
+        and is not cached.
+        """
+        out_path = METHOD_SPECS[name].output_path(filepath)
+        key, meta = self._begin_job(record, [filepath], [], out_path, name)
+        if meta is not None:
+            # The method's own report names the paths it was first run on
+            return "\n".join([f"✅ {name}", t('output_file_written', os.path.basename(out_path)), t('cache_hit'),
+                              t('size_change', meta["size_in"], meta["size_out"])])
+        report = run()
+        if key and not report.startswith("# ❌") and os.path.exists(out_path):
+            self.cache.store(key, out_path, {"size_in": os.path.getsize(filepath),
+                                             "size_out": os.path.getsize(out_path)})
+        return report
+
+    def _add_decoder(self, record: dict, out_path: str, chain: list, generate, batch: bool = True) -> None:
+        """Generate the per-file decoder, or list out_path in the batch manifest when there is one.
+
+        batch=False keeps a per-file decoder for outputs the batch decoder cannot restore.
+        """
+        if self.decoder_manifest and batch:
+            record["manifest"] = manifest_entry(out_path, chain)
+            return
+        decoder_path = generate()
+        if decoder_path:
+            record["decoders"].append(decoder_path)
+            record["messages"].append(t('decoder_file', os.path.basename(decoder_path)))
+
+    def process_file(self, filepath: str) -> dict:
+        """Obfuscate one file. Errors are captured in the returned record, never raised."""
+        JOB_SEED.set(None)
+        filename = os.path.basename(filepath)
+        lang = detect_lang(filepath)
+        record = {"file": filepath, "lang": lang, "ok": True, "output": None, "decoders": [], "manifest": None,
+                  "size_in": None, "size_out": None, "error": None, "cache": None, "trace": [],
+                  "messages": []}
+        results = record["messages"]
+        results.append(f"\n{'='*70}")
+        results.append(t('processing', filename, lang.upper()))
+        results.append(t('path', filepath))
+        results.append(f"{'='*70}\n")
+        xor_key = self.xor_key
+        custom_key = self.custom_key
+        try:
+            if lang in FILE_METHOD_LANGS:
+                self.apply_file_methods(filepath, record)
+            elif lang in ["exe", "dll"]:
+                base_path = os.path.splitext(filepath)[0]
+                out_path = f"{base_path}_obfuscated{os.path.splitext(filepath)[1]}"
+                size_in = os.path.getsize(filepath)
+                key, meta = self._begin_job(record, [filepath], ["exe"], out_path)
+                if meta is not None:
+                    size_out = meta["size_out"]
+                elif size_in >= self.stream_threshold and self.plan["exe"]["stream"]:
+                    with trace_method(record["trace"], "EXE · streamed pipeline", size_in) as entry:
+                        size_out = self.stream_exe_methods(filepath, out_path)
+                        entry["size_out"] = size_out
+                else:
+                    processed_data = self.apply_exe_methods(read_bytes(filepath), record["trace"])
+                    write_bytes(out_path, processed_data)
+                    size_out = len(processed_data)
+                if key and meta is None:
+                    self.cache.store(key, out_path, {"size_in": size_in, "size_out": size_out})
+                record.update(output=out_path, size_in=size_in, size_out=size_out)
+                size_change = ((size_out - size_in) / size_in * 100)
+                results.append(t('text_obf_success', lang.upper()))
+                results.append(t('output_file_written', os.path.basename(out_path)))
+                if meta is not None:
+                    results.append(t('cache_hit'))
+                results.append(t('size_change', size_in, size_out))
+                results.append(t('size_delta', size_change))
+                if self.generate_decoder:
+                    self._add_decoder(record, out_path, self.plan["exe"]["chain"],
+                                      lambda: gen_decoder_for_exe(out_path, xor_key, self.advanced_security))
+            else:
+                base_path = os.path.splitext(filepath)[0]
+                out_path = f"{base_path}_obfuscated{os.path.splitext(filepath)[1]}"
+                key, meta = self._begin_job(record, [filepath], [lang, "universal"], out_path)
+                plan = self.text_plan(lang)
+                streamed = meta is None and plan["stream"] and os.path.getsize(filepath) >= self.stream_threshold
+                if meta is not None:
+                    size_in, size_out, encrypted_images = meta["size_in"], meta["size_out"], meta["images"]
+                elif streamed:
+                    with trace_method(record["trace"], "Text · streamed pipeline", os.path.getsize(filepath)) as entry:
+                        size_in, size_out = self.stream_text_methods(filepath, out_path, plan["steps"])
+                        entry["size_out"] = size_out
+                    encrypted_images = 0
+                else:
+                    text = read_text(filepath)
+                    processed_text, encrypted_images = self.apply_text_methods(text, lang, record["trace"])
+                    write_text(out_path, processed_text)
+                    size_in, size_out = len(text), len(processed_text)
+                if key and meta is None:
+                    self.cache.store(key, out_path, {"size_in": size_in, "size_out": size_out,
+                                                     "images": encrypted_images})
+                if meta is not None or streamed:
+                    with open(out_path, "r", encoding="utf-8") as f:
+                        processed_text = f.read(501)
+                record.update(output=out_path, size_in=size_in, size_out=size_out)
+                results.append(t('text_obf_success', lang.upper()))
+                results.append(t('output_file_written', os.path.basename(out_path)))
+                if meta is not None:
+                    results.append(t('cache_hit'))
+                results.append(t('size_change', size_in, size_out))
+                results.append(t('size_delta', ((size_out - size_in) / size_in * 100)))
+                if encrypted_images > 0:
+                    results.append(t('images_encrypted', encrypted_images))
+                if self.generate_decoder:
+                    self._add_decoder(record, out_path, self.text_plan(lang)["chain"],
+                                      lambda: gen_decoder_for_text(out_path, xor_key, self.advanced_security))
+                    if encrypted_images > 0:
+                        decoder_path = gen_decoder_for_html_css_images(filepath, custom_key)
+                        if decoder_path:
+                            record["decoders"].append(decoder_path)
+                            results.append(t('decoder_file', os.path.basename(decoder_path)))
+                if len(processed_text) > 500:
+                    preview = processed_text[:300] + t('preview_truncated')
+                else:
+                    preview = processed_text
+                results.append(f"\n📄 PREVIEW:\n{preview[:400]}")
+        except Exception as e:
+            record.update(ok=False, error=f"{type(e).__name__}: {e}")
+            error_msg = t('error_processing', filename)
+            error_msg += f"\n{t('error_type', lang)}"
+            error_msg += f"\n{t('error_details', str(e))}"
+            results.append(error_msg)
+            import traceback
+            results.append(f"\n{t('error_trace', traceback.format_exc()[:300])}")
+        return record
+
+    def _failed_record(self, filepath: str, exc: Exception) -> dict:
+        filename = os.path.basename(filepath)
+        lang = detect_lang(filepath)
+        error_msg = t('error_processing', filename)
+        error_msg += f"\n{t('error_type', lang)}"
+        error_msg += f"\n{t('error_details', str(exc))}"
+        return {"file": filepath, "lang": lang, "ok": False, "output": None, "decoders": [], "manifest": None,
+                "size_in": None, "size_out": None, "error": f"{type(exc).__name__}: {exc}",
+                "cache": None, "trace": [], "messages": [f"\n{'='*70}", t('processing', filename, lang.upper()),
+                             t('path', filepath), f"{'='*70}\n", error_msg]}
+
+    def process_files(self, files: list) -> list:
+        return list(self.iter_process_files(files))
+
+    def iter_process_files(self, files: list, cancel=None):
+        """Process files independently, across a process pool when workers > 1.
+
+        Records are yielded in input order as they complete. A worker that dies
+        only fails the files of its own slice, like the per-file try/except does
+        serially. Once cancel (a threading.Event) is set, no further file is
+        started and iteration stops.
+        """
+        files = list(files)
+        workers = min(self.workers, len(files))
+        if workers <= 1:
+            for f in files:
+                if cancel is not None and cancel.is_set():
+                    return
+                yield self.process_file(f)
+            return
+        from concurrent.futures import ProcessPoolExecutor
+        chunk = max(1, min(64, len(files) // (workers * 4)))
+        batches = [files[i:i + chunk] for i in range(0, len(files), chunk)]
+        pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = [pool.submit(_process_batch, self, batch) for batch in batches]
+            for batch, future in zip(batches, futures):
+                try:
+                    records = future.result()
+                except Exception as e:
+                    records = [self._failed_record(f, e) for f in batch]
+                yield from records
+                if cancel is not None and cancel.is_set():
+                    return
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    def _merge_parts(self, files: list, lang: str, steps: list, trace: list = None):
+        """Yield (input size, processed text) per file, separators included, one file in memory at a time."""
+        for i, path in enumerate(files):
+            text = read_text(path)
+            size_in = len(text)
+            if steps:
+                text, _ = self.apply_text_methods(text, lang, trace, steps)
+            if i:
+                size_in += len(MERGE_SEPARATOR)
+                text = MERGE_SEPARATOR + text
+            yield size_in, text
+
+    def process_merged(self, files: list, output_path: str = "") -> dict:
+        """Concatenate same-kind text files, obfuscate them as one and write a single output.
+
+        The leading run of FILE_LOCAL_METHODS is applied file by file and written as
+        it goes; only the methods from the first one needing a global view onwards
+        see the whole merged text.
+        """
+        JOB_SEED.set(None)
+        lang = detect_lang(files[0])
+        out_path = output_path or f"merged_obfuscated_{lang}_{int(time.time())}.txt"
+        record = {"file": list(files), "lang": lang, "ok": True, "output": out_path, "decoders": [], "manifest": None,
+                  "size_in": None, "size_out": None, "error": None, "cache": None, "trace": [],
+                  "messages": []}
+        results = record["messages"]
+        results.append(t('merge_mode', lang.upper()))
+        key, meta = self._begin_job(record, files, [lang, "universal"], out_path)
+        if meta is not None:
+            size_in, size_out = meta["size_in"], meta["size_out"]
+            with open(out_path, "r", encoding="utf-8") as f:
+                processed_text = f.read(800)
+        else:
+            plan = self.text_plan(lang)
+            steps, split = plan["steps"], plan["local"]
+            parts = self._merge_parts(files, lang, steps[:split], record["trace"])
+            if split < len(steps):
+                sizes, texts = zip(*parts)
+                merged_text, _ = self.apply_text_methods("".join(texts), lang, record["trace"], steps[split:])
+                parts = [(sum(sizes), merged_text)]
+            size_in = size_out = 0
+            processed_text = ""
+            with open(out_path, "w", encoding="utf-8") as out:
+                for part_size, part in parts:
+                    out.write(part)
+                    size_in += part_size
+                    size_out += len(part)
+                    if len(processed_text) < 800:
+                        processed_text += part[:800]
+            if key:
+                self.cache.store(key, out_path, {"size_in": size_in, "size_out": size_out})
+        record.update(size_in=size_in, size_out=size_out)
+        size_change = ((size_out - size_in) / size_in * 100)
+        results.append(t('output_file_written', os.path.basename(out_path)))
+        if meta is not None:
+            results.append(t('cache_hit'))
+        results.append(t('size_change', size_in, size_out))
+        results.append(t('size_delta', size_change))
+        if self.generate_decoder:
+            self._add_decoder(record, out_path, self.text_plan(lang)["chain"],
+                              lambda: gen_decoder_for_text(out_path, self.xor_key, self.advanced_security))
+        preview = processed_text[:800] + t('preview_truncated')
+        results.append(f"\n📄 PREVIEW:\n{preview}")
+        return record
+
+    def run(self, files: list, merge: bool = False, output_path: str = "",
+            progress=None, cancel=None) -> dict:
+        """Process a batch and return a report with per-file records and the GUI text lines.
+
+        progress(lines, record) is called from this thread whenever text lines
+        are added to the report, with the file record once it is complete.
+        Setting cancel (a threading.Event) stops the batch between files.
+        """
+        files = list(files)
+        report = {"started": time.strftime('%Y-%m-%d %H:%M:%S'), "mode": "individual",
+                  "workers": self.workers, "files": [], "execution_time": 0.0, "errors": 0,
+                  "cancelled": False, "cache": None, "decoder_manifest": None, "methods": {}, "messages": []}
+        results = report["messages"]
+        shown = 0
+
+        def emit(record=None):
+            nonlocal shown
+            if progress is not None:
+                progress(results[shown:], record)
+            shown = len(results)
+
+        start_time = time.time()
+        results.append(t('obf_started'))
+        results.append(t('start_time', report["started"]))
+        results.append(t('files_processed', len(files)))
+        results.append(t('xor_key_label', '*' * len(self.xor_key) if self.xor_key else 'none'))
+        results.append(t('obf_key_label', '*' * min(8, len(self.custom_key)) if self.custom_key else 'none'))
+        results.append(f"{'='*80}\n")
+        try:
+            if merge and files and all(detect_lang(f) in MERGEABLE_LANGS for f in files):
+                report["mode"] = "merge"
+                emit()
+                record = self.process_merged(files, output_path)
+                report["files"].append(record)
+                results.extend(record["messages"])
+                emit(record)
+            else:
+                results.append(t('individual_mode'))
+                emit()
+                for record in self.iter_process_files(files, cancel):
+                    report["files"].append(record)
+                    results.extend(record["messages"])
+                    emit(record)
+                if len(report["files"]) < len(files) and cancel is not None and cancel.is_set():
+                    report["cancelled"] = True
+                    results.append(f"\n{t('obf_cancelled', len(report['files']), len(files))}")
+        except Exception as e:
+            report["errors"] += 1
+            results.append(f"\n{t('error_critical')}")
+            results.append(t('error_details', str(e)))
+            import traceback
+            results.append(t('error_trace', traceback.format_exc()))
+        report["errors"] += sum(1 for r in report["files"] if not r["ok"])
+        entries = [r["manifest"] for r in report["files"] if r["manifest"]]
+        if self.decoder_manifest and entries:
+            decoder_path = gen_batch_decoder(self.decoder_manifest, entries, self.xor_key, self.custom_key)
+            if decoder_path:
+                report["decoder_manifest"] = {"manifest": self.decoder_manifest, "decoder": decoder_path,
+                                              "files": len(entries)}
+                results.append(f"\n{t('decoder_file', os.path.basename(decoder_path))}")
+                results.append(t('decoder_manifest', os.path.basename(self.decoder_manifest), len(entries)))
+        if self.cache is not None:
+            evicted, total = self.cache.trim()
+            hits = sum(1 for r in report["files"] if r["cache"] == "hit")
+            misses = sum(1 for r in report["files"] if r["cache"] == "miss")
+            report["cache"] = {"dir": self.cache.directory, "hits": hits, "misses": misses,
+                               "evicted": evicted, "bytes": total}
+            results.append(f"\nCache: {hits} hit(s), {misses} miss(es), {evicted} evicted, {total} bytes")
+        report["methods"] = summarize_trace(e for r in report["files"] for e in r["trace"])
+        if report["methods"]:
+            results.append("")
+            for method, stats in report["methods"].items():
+                results.append(t('method_stats', method, stats["seconds"], stats["calls"]))
+        duration = time.time() - start_time
+        report["execution_time"] = duration
+        results.append(f"\n{'='*80}")
+        results.append(t('obf_completed_footer'))
+        results.append(t('execution_time', duration))
+        results.append(t('files_processed', len(files)))
+        emit()
+        return report
+
+# -------------------------
+# Method Preview
+# -------------------------
+PREVIEW_BYTES = 100
+PREVIEW_CHARS = 500
+PREVIEW_SAMPLE = 64 << 10
+PREVIEW_CACHE_SIZE = 64
+_PREVIEW_CACHE = collections.OrderedDict()
+
+def compute_preview(path: str, method_name: str, custom_key: str = "obf_key_123", xor_key: bytes = b"") -> dict:
+    """Run one method on just enough of a file to show its preview.
+
+    Binary methods read a PREVIEW_BYTES window (the tail for reversal, random
+    positions for shuffling) and compute the output size arithmetically. Text
+    methods run on the first PREVIEW_SAMPLE characters, cut at a line end
+    (the whole file for AST methods whose sample does not parse). Results are memoized
+    per (file identity, method, keys); the identity is path, size and mtime,
+    so an unchanged file is never re-read.
+    """
+    st = os.stat(path)
+    cache_key = (os.path.realpath(path), st.st_size, st.st_mtime_ns, method_name, custom_key, xor_key)
+    cached = _PREVIEW_CACHE.get(cache_key)
+    if cached is not None:
+        _PREVIEW_CACHE.move_to_end(cache_key)
+        return cached
+    spec = METHOD_SPECS[method_name]
+    method_func, method_type = spec.func, spec.kind
+    file_lang = detect_lang(path)
+    if method_type in ("dotnet", "resx", "config"):
+        preview = {"kind": "file", "result": method_func(path, custom_key)}
+    elif method_type == "binary":
+        with open(path, "rb") as f:
+            size_out, head = EXE_PREVIEW_WINDOWS[method_name](f, st.st_size, xor_key, PREVIEW_BYTES)
+        preview = {"kind": "binary", "size_in": st.st_size, "size_out": size_out, "head": head}
+    else:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            text = f.read(PREVIEW_SAMPLE)
+            sampled = len(text) == PREVIEW_SAMPLE and f.read(1) != ""
+            if sampled:
+                text += f.readline()
+        if sampled and spec.cost == "ast":
+            # AST methods return their input unchanged when it does not parse
+            try:
+                ast.parse(text)
+            except SyntaxError:
+                text, sampled = read_text(path), False
+        result, _ = ObfuscationEngine({}, xor_key, custom_key)._call_text_method(method_name, method_func, text, file_lang)
+        preview = {"kind": "text", "lang": file_lang, "sampled": sampled, "size_in": st.st_size,
+                   "len_in": len(text), "len_out": len(result),
+                   "before": text[:PREVIEW_CHARS] + t('preview_truncated') if len(text) > PREVIEW_CHARS else text,
+                   "after": result[:PREVIEW_CHARS] + t('preview_truncated') if len(result) > PREVIEW_CHARS else result}
+    _PREVIEW_CACHE[cache_key] = preview
+    if len(_PREVIEW_CACHE) > PREVIEW_CACHE_SIZE:
+        _PREVIEW_CACHE.popitem(last=False)
+    return preview
+
+# -------------------------
+# GUI App
+# -------------------------
+# Every GUI run is reproducible: per-file RNG streams derive from this seed and the file content
+GUI_SEED = 42
+
+class AppBase:
+    def __init__(self, root):
+        self.root = root
+        self.theme = 'light'
+        self.files = []
+        self.output_path = tk.StringVar()
+        self.merge_files = tk.BooleanVar(value=False)
+        self.process_each = tk.BooleanVar(value=False)
+        self.generate_decoder = tk.BooleanVar(value=False)
+        self.advanced_security = tk.BooleanVar(value=False)
+        self.xor_key_str = tk.StringVar(value="")
+        self.custom_key = tk.StringVar(value="obf_key_123")
+        self.vars = {}
+        self._worker = None
+        self._cancel = None
+        for grp in ("python", "powershell", "js", "dotnet", "exe", "html", "css", "cpp", "universal", "image", "config"):
+            self.vars[grp] = {}
+        self._build_ui()
+        self._apply_theme()
+
+    def _apply_theme(self):
+        ttkthemes = optional_import("ttkthemes")
+        if ttkthemes is not None:
+            style = ttkthemes.ThemedStyle(self.root)
+            style.theme_use('equilux' if self.theme == 'dark' else 'clam')
+        else:
+            bg = '#2c2c2c' if self.theme == 'dark' else '#f8f9fa'
+            fg = '#ffffff' if self.theme == 'dark' else '#000000'
+            self.root.configure(bg=bg)
+            self.preview.configure(bg=bg, fg=fg)
+            self.status_lbl.configure(bg=bg, fg=fg)
+
+    def _switch_theme(self):
+        self.theme = 'light' if self.theme == 'dark' else 'dark'
+        self._apply_theme()
+
+    def _build_ui(self):
+        self.root.title(t('title'))
+        top_frame = tk.Frame(self.root)
+        top_frame.pack(fill="x", padx=8, pady=6)
+        tk.Button(top_frame, text=t('select_files'), command=self.pick_files, 
                  bg="#4CAF50", fg="white", font=("Arial", 10, "bold")).pack(side="left")
         tk.Checkbutton(top_frame, text=t('merge_files'), variable=self.merge_files, 
                       command=self._update_status).pack(side="left", padx=(10, 0))
@@ -1450,7 +3812,7 @@ class AppBase:
         for tab_title, group_key, methods_dict in tabs_config:
             tab_frame = tk.Frame(self.notebook)
             self.notebook.add(tab_frame, text=tab_title)
-            if group_key == "dotnet" and not HAS_DNLIB:
+            if group_key == "dotnet" and not has_dep("dnlib"):
                 warning_label = tk.Label(
                     tab_frame, text=t('no_dotnet'), fg="orange", bg="lightyellow",
                     font=("Arial", 10), pady=10)
@@ -1462,7 +3824,7 @@ class AppBase:
                     cb.pack(fill="x", padx=20, pady=2)
                     self.vars[group_key][method_name] = var
                 continue
-            if group_key == "cpp" and not HAS_CLANG:
+            if group_key == "cpp" and not has_dep("clang.cindex"):
                 warning_label = tk.Label(
                     tab_frame, text=t('no_clang'), fg="orange", bg="lightyellow",
                     font=("Arial", 10), pady=10)
@@ -1483,9 +3845,18 @@ class AppBase:
                  bg="#2196F3", fg="white").pack(side="left", padx=5)
         execute_frame = tk.Frame(self.root)
         execute_frame.pack(fill="x", pady=10)
-        tk.Button(execute_frame, text=t('run_obf'), command=self.run, bg="#FF5722", 
-                 fg="white", font=("Arial", 12, "bold"), width=30, height=2, 
-                 cursor="hand2").pack()
+        self.run_btn = tk.Button(execute_frame, text=t('run_obf'), command=self.run, bg="#FF5722", 
+                                 fg="white", font=("Arial", 12, "bold"), width=30, height=2, 
+                                 cursor="hand2")
+        self.run_btn.pack()
+        progress_frame = tk.Frame(execute_frame)
+        progress_frame.pack(fill="x", padx=8, pady=(6, 0))
+        self.progress = ttk.Progressbar(progress_frame, mode="determinate")
+        self.progress.pack(side="left", fill="x", expand=True)
+        self.progress_lbl = tk.Label(progress_frame, text="", width=44, anchor="w", font=("Consolas", 9))
+        self.progress_lbl.pack(side="left", padx=5)
+        self.cancel_btn = tk.Button(progress_frame, text=t('cancel'), command=self.cancel_run, state="disabled")
+        self.cancel_btn.pack(side="right")
         self.status_lbl = tk.Label(self.root, text=t('status_ready'), fg="#4CAF50", 
                                   anchor="w", justify="left", relief="sunken", font=("Arial", 9))
         self.status_lbl.pack(fill="x", padx=8, pady=(0, 5))
@@ -1494,8 +3865,8 @@ class AppBase:
         self.preview = scrolledtext.ScrolledText(self.root, wrap="word", font=("Consolas", 9), 
                                                height=12, bg="#f8f9fa")
         self.preview.pack(fill="both", expand=True, padx=8, pady=(0, 8))
-        if HAS_DND:
-            self.root.drop_target_register(DND_FILES)
+        if has_dep("tkinterdnd2"):
+            self.root.drop_target_register(optional_import("tkinterdnd2").DND_FILES)
             self.root.dnd_bind('<<Drop>>', self._handle_drop)
 
     def _handle_drop(self, event):
@@ -1578,90 +3949,16 @@ class AppBase:
             status_parts.append(f" | {t('process_each')}")
         if self.advanced_security.get():
             status_parts.append(f" | {t('advanced_security')}")
-        if not HAS_DNLIB and any(detect_lang(f) in ["dotnet", "resx"] for f in self.files):
+        if not has_dep("dnlib") and any(detect_lang(f) in ["dotnet", "resx"] for f in self.files):
             status_parts.append(f" | {t('no_dotnet')}")
-        if not HAS_CLANG and any(detect_lang(f) == "cpp" for f in self.files):
+        if not has_dep("clang.cindex") and any(detect_lang(f) == "cpp" for f in self.files):
             status_parts.append(f" | {t('no_clang')}")
-        if not HAS_DND:
+        if not has_dep("tkinterdnd2"):
             status_parts.append(f" | {t('no_dnd')}")
         self.status_lbl.config(text=" | ".join(status_parts), fg="#4CAF50")
 
     def _parse_xor_key(self):
-        k = self.xor_key_str.get().strip()
-        if not k:
-            return b""
-        try:
-            ival = int(k)
-            if 0 <= ival <= 255:
-                return bytes([ival])
-        except ValueError:
-            pass
-        return k.encode("utf-8")
-
-    def _gen_decoder_for_exe(self, exe_path: str, key: bytes):
-        base_name = os.path.splitext(exe_path)[0]
-        decoder_path = f"{base_name}_decoder.py"
-        key_str = ','.join(str(b) for b in key) if key else ''
-        decoder_code = f"""#!/usr/bin/env python3
-# EXE Decoder
-# Generated automatically {time.strftime("%Y-%m-%d %H:%M:%S")}
-import base64, sys, os
-import hashlib
-
-def verify_integrity():
-    code = open(__file__, 'rb').read()
-    hash_obj = hashlib.sha256(code.replace(b'placeholder', b''))
-    if hash_obj.hexdigest() != 'placeholder':
-        print("⚠️ Decoder tampering detected!")
-        os.remove(__file__)
-        sys.exit(1)
-
-def decode_exe(input_path, output_path):
-    try:
-        verify_integrity()
-        data = open(input_path, 'rb').read()
-        key = bytes([{key_str}])
-        if data.startswith(b'SEG:'):
-            header, segments = data.split(b':', 3)[:3], data.split(b':', 3)[3]
-            num_segs, seg_size = int(header[1]), int(header[2])
-            result = bytearray()
-            for i in range(num_segs):
-                start = i * seg_size
-                result.extend(segments[start:start+seg_size])
-        else:
-            result = data
-        if key:
-            result = bytearray(len(result))
-            for i, b in enumerate(data):
-                if i < len(data):
-                    result[i] = b ^ key[i % len(key)]
-        with open(output_path, 'wb') as f:
-            f.write(result)
-        print(f"✅ Decoded: {{output_path}}")
-    except Exception as e:
-        print(f"❌ Error: {{e}}")
-    finally:
-        print("🗑️ Self-destructing decoder...")
-        os.remove(__file__)
-
-if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python {os.path.basename(decoder_path)} <input_exe>")
-        sys.exit(1)
-    input_path = sys.argv[1]
-    output_path = os.path.splitext(input_path)[0] + "_decoded" + os.path.splitext(input_path)[1]
-    decode_exe(input_path, output_path)
-"""
-        hash_line = "    if hash_obj.hexdigest() != 'placeholder':"
-        decoder_code_no_hash = decoder_code.replace(hash_line, "    if hash_obj.hexdigest() != '':")
-        calculated_hash = hashlib.sha256(decoder_code_no_hash.encode()).hexdigest()
-        decoder_code = decoder_code.replace("placeholder", calculated_hash)
-        try:
-            write_text(decoder_path, decoder_code)
-            return decoder_path
-        except Exception as e:
-            print(f"Error creating EXE decoder: {e}")
-            return None
+        return parse_xor_key(self.xor_key_str.get())
 
     def preview_method(self):
         method_name = self.preview_combo.get()
@@ -1671,75 +3968,51 @@ if __name__ == "__main__":
         if not self.files:
             messagebox.showwarning(t('preview_error'), t('no_files'))
             return
-        method_info = ALL_METHODS.get(method_name, (None, None))
-        if method_info[0] is None:
+        spec = METHOD_SPECS.get(method_name)
+        if spec is None:
             messagebox.showerror(t('preview_error'), t('method_not_found', method_name))
             return
-        method_func, method_type = method_info
         first_file = self.files[0]
         file_lang = detect_lang(first_file)
         custom_key = self.custom_key.get()
-        xor_key = self._parse_xor_key()
         try:
             self.preview.delete("1.0", "end")
-            if method_type == "dotnet" and file_lang == "dotnet":
-                result = method_func(first_file, custom_key)
-                preview_text = f"🔗 .NET PREVIEW\n{'='*50}\n"
+            preview = compute_preview(first_file, method_name, custom_key, self._parse_xor_key())
+            if preview["kind"] == "file":
+                title = {"dotnet": "🔗 .NET PREVIEW", "resx": "📋 .RESX PREVIEW"}.get(spec.kind, "📋 CONFIG PREVIEW")
+                preview_text = f"{title}\n{'='*50}\n"
                 preview_text += f"📄 File: {os.path.basename(first_file)}\n"
                 preview_text += f"🔧 Method: {method_name}\n"
                 preview_text += f"🔑 Key: {custom_key[:8]}...\n\n"
-                preview_text += result
+                preview_text += preview["result"]
                 self.preview.insert("1.0", preview_text)
-            elif method_type == "resx" and file_lang == "resx":
-                result = method_func(first_file, custom_key)
-                preview_text = f"📋 .RESX PREVIEW\n{'='*50}\n"
-                preview_text += f"📄 File: {os.path.basename(first_file)}\n"
-                preview_text += f"🔧 Method: {method_name}\n"
-                preview_text += f"🔑 Key: {custom_key[:8]}...\n\n"
-                preview_text += result
-                self.preview.insert("1.0", preview_text)
-            elif method_type == "config" and file_lang in ["json", "xml"]:
-                result = method_func(first_file, custom_key)
-                preview_text = f"📋 CONFIG PREVIEW\n{'='*50}\n"
-                preview_text += f"📄 File: {os.path.basename(first_file)}\n"
-                preview_text += f"🔧 Method: {method_name}\n"
-                preview_text += f"🔑 Key: {custom_key[:8]}...\n\n"
-                preview_text += result
-                self.preview.insert("1.0", preview_text)
-            elif method_type == "binary":
-                data = read_bytes(first_file)
-                if "XOR" in method_name:
-                    result = method_func(data, xor_key)
-                else:
-                    result = method_func(data)
+            elif preview["kind"] == "binary":
+                head = preview["head"]
                 preview_text = f"⚙️ BINARY PREVIEW\n{'='*50}\n"
                 preview_text += f"📄 File: {os.path.basename(first_file)}\n"
                 preview_text += f"🔧 Method: {method_name}\n"
-                preview_text += f"📏 Original size: {len(data):,} bytes\n"
-                preview_text += f"📏 Obfuscated: {len(result):,} bytes\n"
-                if len(result) > 100:
-                    preview_text += f"\n🔍 First 50 bytes (hex):\n{result[:50].hex().upper()}\n"
-                    preview_text += f"🔍 Base64 preview:\n{base64.b64encode(result[:64]).decode()[:100]}..."
+                preview_text += f"📏 Original size: {preview['size_in']:,} bytes\n"
+                preview_text += f"📏 Obfuscated: {preview['size_out']:,} bytes\n"
+                if preview["size_out"] > 100:
+                    preview_text += f"\n🔍 First 50 bytes (hex):\n{head[:50].hex().upper()}\n"
+                    preview_text += f"🔍 Base64 preview:\n{base64.b64encode(head[:64]).decode()[:100]}..."
                 else:
-                    preview_text += f"\n🔍 Full data (hex): {result.hex().upper()}"
+                    preview_text += f"\n🔍 Full data (hex): {head.hex().upper()}"
                 self.preview.insert("1.0", preview_text)
             else:
-                text_content = read_text(first_file)
-                before = text_content[:500] + t('preview_truncated') if len(text_content) > 500 else text_content
-                if method_name == "UNI · XOR + Base64":
-                    result = uni_xor_text(text_content, xor_key)
-                elif method_name == "HTML/CSS · Image Obfuscation":
-                    result, encrypted_images = method_func(text_content, custom_key)
-                elif "Encryption" in method_name or "AI" in method_name or "Network" in method_name:
-                    result = method_func(text_content, custom_key)
-                else:
-                    result = method_func(text_content)
-                after = result[:500] + t('preview_truncated') if len(result) > 500 else result
+                before, after = preview["before"], preview["after"]
                 preview_text = f"📝 TEXT PREVIEW\n{'='*50}\n"
                 preview_text += f"📄 File: {os.path.basename(first_file)} ({file_lang})\n"
                 preview_text += f"🔧 Method: {method_name}\n"
-                preview_text += f"📏 Length: {len(text_content):,} → {len(result):,} chars\n\n"
-                if HAS_PYGMENTS:
+                if preview["sampled"]:
+                    preview_text += (f"📏 Length: first {preview['len_in']:,} chars of {preview['size_in']:,} bytes"
+                                     f" → {preview['len_out']:,} chars\n\n")
+                else:
+                    preview_text += f"📏 Length: {preview['len_in']:,} → {preview['len_out']:,} chars\n\n"
+                if has_dep("pygments"):
+                    from pygments import highlight
+                    from pygments.lexers import PythonLexer, CppLexer, JavascriptLexer, PowerShellLexer, HtmlLexer, CssLexer
+                    from pygments.formatters import HtmlFormatter
                     lexer = {
                         'python': PythonLexer(),
                         'cpp': CppLexer(),
@@ -1762,465 +4035,112 @@ if __name__ == "__main__":
             error_msg += f"💥 {t('error_details', str(e))}\n"
             self.preview.insert("1.0", error_msg)
 
-    def apply_dotnet_methods(self, filepath: str, custom_key: str) -> list:
-        results = []
-        dotnet_vars = self.vars.get("dotnet", {})
-        file_lang = detect_lang(filepath)
-        if file_lang == "resx":
-            if "RESX · String Encryption" in dotnet_vars and dotnet_vars["RESX · String Encryption"].get():
-                try:
-                    result = resx_encrypt_strings(filepath, custom_key)
-                    results.append(result)
-                    if self.generate_decoder.get():
-                        decoder_path = gen_decoder_for_resx(filepath, custom_key)
-                        if decoder_path:
-                            results.append(t('decoder_file', os.path.basename(decoder_path)))
-                except Exception as e:
-                    results.append(f"# ❌ RESX encryption error: {str(e)}")
-            else:
-                results.append(f"# RESX · String Encryption not selected for {os.path.basename(filepath)}")
-        elif file_lang == "dotnet":
-            if not HAS_DNLIB:
-                results.append(t('no_dotnet'))
-                return results
-            for method_name, var in dotnet_vars.items():
-                if var.get() and method_name != "RESX · String Encryption":
-                    try:
-                        method_func = DOTNET_METHODS[method_name]
-                        result = method_func(filepath, custom_key)
-                        results.append(result)
-                    except Exception as e:
-                        results.append(f"# ❌ Error {method_name}: {str(e)}")
-        else:
-            results.append(f"# {os.path.basename(filepath)} is not a .NET assembly or .resx file")
-        return results
-
-    def apply_config_methods(self, filepath: str, custom_key: str) -> list:
-        results = []
-        config_vars = self.vars.get("config", {})
-        file_lang = detect_lang(filepath)
-        if file_lang == "json":
-            if "CFG · JSON Obfuscation (№6)" in config_vars and config_vars["CFG · JSON Obfuscation (№6)"].get():
-                try:
-                    result = json_obfuscate(filepath, custom_key)
-                    results.append(result)
-                except Exception as e:
-                    results.append(f"# ❌ JSON obfuscation error: {str(e)}")
-        elif file_lang == "xml":
-            if "CFG · XML Obfuscation (№6)" in config_vars and config_vars["CFG · XML Obfuscation (№6)"].get():
-                try:
-                    result = xml_obfuscate(filepath, custom_key)
-                    results.append(result)
-                except Exception as e:
-                    results.append(f"# ❌ XML obfuscation error: {str(e)}")
-        return results
-
-    def apply_text_methods(self, text: str, lang: str, xor_key: bytes) -> tuple[str, int]:
-        custom_key = self.custom_key.get()
-        encrypted_images = 0
-        if lang in LANG_TEXT_METHODS:
-            methods = LANG_TEXT_METHODS[lang]
-            group_vars = self.vars.get(lang, {})
-            for method_name, var in group_vars.items():
-                if var.get():
-                    method_func = methods.get(method_name)
-                    if method_func:
-                        try:
-                            if method_name == "HTML/CSS · Image Obfuscation":
-                                text, encrypted_images = method_func(text, custom_key)
-                            elif "Encryption" in method_name:
-                                text = method_func(text, custom_key)
-                            else:
-                                text = method_func(text)
-                        except Exception as e:
-                            print(f"Text method error {method_name}: {e}")
-        uni_vars = self.vars.get("universal", {})
-        for method_name, var in uni_vars.items():
-            if var.get():
-                method_func = UNIVERSAL_METHODS.get(method_name)
-                if method_func:
-                    try:
-                        if method_name == "UNI · XOR + Base64":
-                            text = uni_xor_text(text, xor_key)
-                        elif "AI" in method_name or "Network" in method_name:
-                            text = method_func(text, custom_key)
-                        else:
-                            text = method_func(text)
-                    except Exception as e:
-                        print(f"Universal method error {method_name}: {e}")
-        return text, encrypted_images
-
-    def apply_exe_methods(self, data: bytes, xor_key: bytes) -> bytes:
-        exe_vars = self.vars.get("exe", {})
-        result = data
-        for method_name, var in exe_vars.items():
-            if var.get():
-                method_func = EXE_METHODS.get(method_name)
-                if method_func:
-                    try:
-                        if "XOR" in method_name:
-                            result = method_func(result, xor_key)
-                        else:
-                            result = method_func(result)
-                    except Exception as e:
-                        print(f"EXE method error {method_name}: {e}")
-        return result
-
-    def _process_single_file(self, filepath: str, xor_key: bytes, results: list):
-        filename = os.path.basename(filepath)
-        lang = detect_lang(filepath)
-        results.append(f"\n{'='*70}")
-        results.append(t('processing', filename, lang.upper()))
-        results.append(t('path', filepath))
-        results.append(f"{'='*70}\n")
-        try:
-            if lang == "dotnet" or lang == "resx":
-                dotnet_results = self.apply_dotnet_methods(filepath, self.custom_key.get())
-                results.extend(dotnet_results)
-            elif lang in ["json", "xml"]:
-                config_results = self.apply_config_methods(filepath, self.custom_key.get())
-                results.extend(config_results)
-            elif lang in ["exe", "dll"] and lang != "dotnet":
-                data = read_bytes(filepath)
-                processed_data = self.apply_exe_methods(data, xor_key)
-                base_path = os.path.splitext(filepath)[0]
-                out_path = f"{base_path}_obfuscated{os.path.splitext(filepath)[1]}"
-                write_bytes(out_path, processed_data)
-                size_change = ((len(processed_data) - len(data)) / len(data) * 100)
-                results.append(t('text_obf_success', lang.upper()))
-                results.append(t('output_file_written', os.path.basename(out_path)))
-                results.append(t('size_change', len(data), len(processed_data)))
-                results.append(t('size_delta', size_change))
-                if self.generate_decoder.get():
-                    decoder_path = self._gen_decoder_for_exe(out_path, xor_key)
-                    if decoder_path:
-                        results.append(t('decoder_file', os.path.basename(decoder_path)))
-            elif lang == "image":
-                image_vars = self.vars.get("image", {})
-                if "IMG · XOR Encryption" in image_vars and image_vars["IMG · XOR Encryption"].get():
-                    result, out_path = image_xor_encrypt(filepath, self.custom_key.get())
-                    results.append(t('image_obf_success'))
-                    results.append(t('output_file_written', os.path.basename(out_path)))
-                    results.append(t('size_change', os.path.getsize(filepath), len(result)))
-                    results.append(t('size_delta', ((len(result) - os.path.getsize(filepath)) / os.path.getsize(filepath) * 100)))
-                    if self.generate_decoder.get():
-                        decoder_path = gen_decoder_for_images(filepath, self.custom_key.get())
-                        if decoder_path:
-                            results.append(t('decoder_file', os.path.basename(decoder_path)))
-                else:
-                    results.append(f"# IMG · XOR Encryption not selected for {filename}")
-            else:
-                text = read_text(filepath)
-                processed_text, encrypted_images = self.apply_text_methods(text, lang, xor_key)
-                base_path = os.path.splitext(filepath)[0]
-                out_path = f"{base_path}_obfuscated{os.path.splitext(filepath)[1]}"
-                write_text(out_path, processed_text)
-                results.append(t('text_obf_success', lang.upper()))
-                results.append(t('output_file_written', os.path.basename(out_path)))
-                results.append(t('size_change', len(text), len(processed_text)))
-                results.append(t('size_delta', ((len(processed_text) - len(text)) / len(text) * 100)))
-                if encrypted_images > 0:
-                    results.append(t('images_encrypted', encrypted_images))
-                if self.generate_decoder.get():
-                    decoder_path = self._gen_decoder_for_text(out_path, xor_key)
-                    if decoder_path:
-                        results.append(t('decoder_file', os.path.basename(decoder_path)))
-                    if encrypted_images > 0:
-                        decoder_path = gen_decoder_for_html_css_images(filepath, self.custom_key.get())
-                        if decoder_path:
-                            results.append(t('decoder_file', os.path.basename(decoder_path)))
-                if len(processed_text) > 500:
-                    preview = processed_text[:300] + t('preview_truncated')
-                else:
-                    preview = processed_text
-                results.append(f"\n📄 PREVIEW:\n{preview[:400]}")
-        except Exception as e:
-            error_msg = t('error_processing', filename)
-            error_msg += f"\n{t('error_type', lang)}"
-            error_msg += f"\n{t('error_details', str(e))}"
-            results.append(error_msg)
-            import traceback
-            results.append(f"\n{t('error_trace', traceback.format_exc()[:300])}")
-
-    def _gen_decoder_for_text(self, obf_path: str, xor_key: bytes):
-        base_name = os.path.splitext(obf_path)[0]
-        decoder_path = f"{base_name}_decoder.py"
-        key_hex = xor_key.hex() if xor_key else ""
-        anti_analysis_code = py_anti_debug_full("") if self.advanced_security.get() else ""
-        decoder_code = f'''#!/usr/bin/env python3
-# Decoder for obfuscated text file
-# Generated automatically {time.strftime("%Y-%m-%d %H:%M:%S")}
-import base64
-import os
-import sys
-import hashlib
-import ctypes
-import platform
-import time
+    def _make_engine(self) -> ObfuscationEngine:
+        selection = {grp: [name for name, var in group_vars.items() if var.get()]
+                     for grp, group_vars in self.vars.items()}
+        return ObfuscationEngine(selection, self._parse_xor_key(), self.custom_key.get(),
+                                 self.generate_decoder.get(), self.advanced_security.get(), seed=GUI_SEED)
 
-def check_integrity():
-    """Verify decoder script integrity using SHA-256 hash"""
-    with open(__file__, 'rb') as f:
-        code = f.read()
-    expected_hash = "placeholder"  # Self-hash (placeholder, will be replaced)
-    if hashlib.sha256(code).hexdigest() != expected_hash:
-        print("⚠️ Decoder tampering detected!")
-        os.remove(__file__)
-        sys.exit(1)
-
-{anti_analysis_code}
-
-def decode_obfuscated_text():
-    """Decodes obfuscated text file"""
-    input_file = r"{os.path.abspath(obf_path)}"
-    output_file = r"{base_name}_restored{os.path.splitext(obf_path)[1]}"
-    try:
-        if _advanced_anti_analysis():
-            print("⚠️ Analysis environment detected!")
-            os.remove(__file__)
-            sys.exit(1)
-        check_integrity()
-        with open(input_file, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-        try:
-            decoded = base64.b64decode(content.encode('utf-8')).decode('utf-8')
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(decoded)
-            print(f"✅ Base64 decoding successful!")
-            print(f"📁 Saved: {output_file}")
+    def run(self):
+        """Start the batch on a worker thread; _poll_run() feeds its progress to the widgets."""
+        if not self.files:
+            messagebox.showwarning(t('run_obf'), t('no_files'))
             return
-        except:
-            pass
-        if "{key_hex}":
-            key = bytes.fromhex("{key_hex}")
-            data = content.encode('utf-8')
-            decoded = bytearray(len(data))
-            for i, b in enumerate(data):
-                decoded[i] = b ^ key[i % len(key)]
-            try:
-                result = decoded.decode('utf-8', errors='ignore')
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(result)
-                print(f"✅ XOR decoding successful!")
-                print(f"📁 Saved: {output_file}")
-                return
-            except:
-                pass
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(f"# Could not automatically decode\\n# Source file: {input_file}\\n# Try manual decoding\\n\\n{content[:1000]}")
-        print(f"⚠️ Automatic decoding failed")
-        print(f"📁 Copy saved: {output_file}")
-    finally:
-        if os.path.exists(__file__):
-            print("🗑️ Self-destructing decoder...")
-            os.remove(__file__)
-
-if __name__ == "__main__":
-    decode_obfuscated_text()
-'''
-        # Calculate self-hash excluding the expected_hash line
-        hash_line = '    expected_hash = "placeholder"  # Self-hash (placeholder, will be replaced)'
-        decoder_code_no_hash = decoder_code.replace(hash_line, '    expected_hash = ""')
-        calculated_hash = hashlib.sha256(decoder_code_no_hash.encode()).hexdigest()
-        decoder_code = decoder_code.replace('placeholder', calculated_hash)
-        try:
-            write_text(decoder_path, decoder_code)
-            return decoder_path
-        except Exception as e:
-            print(f"Error creating text decoder: {e}")
-            return None
-
-    def _gen_decoder_for_exe(self, obf_path: str, xor_key: bytes):
-        base_name = os.path.splitext(obf_path)[0]
-        decoder_path = f"{base_name}_decoder.py"
-        key_hex = xor_key.hex() if xor_key else ""
-        anti_analysis_code = py_anti_debug_full("") if self.advanced_security.get() else ""
-        decoder_code = f'''#!/usr/bin/env python3
-# Decoder for obfuscated EXE file
-# Generated automatically {time.strftime("%Y-%m-%d %H:%M:%S")}
-import base64
-import os
-import sys
-import hashlib
-import ctypes
-import platform
-import time
-
-def check_integrity():
-    """Verify decoder script integrity using SHA-256 hash"""
-    with open(__file__, 'rb') as f:
-        code = f.read()
-    expected_hash = "placeholder"  # Self-hash (placeholder, will be replaced)
-    if hashlib.sha256(code).hexdigest() != expected_hash:
-        print("⚠️ Decoder tampering detected!")
-        os.remove(__file__)
-        sys.exit(1)
-
-{anti_analysis_code}
+        if self._worker is not None and self._worker.is_alive():
+            return
+        import threading, queue
+        engine = self._make_engine()
+        files = list(self.files)
+        merge, output_path = self.merge_files.get(), self.output_path.get()
+        self._run_queue = queue.Queue()
+        self._cancel = threading.Event()
+        self._run_stats = {"total": len(files), "done": 0, "bytes": 0, "start": time.time()}
 
-def decode_obfuscated_exe():
-    """Decodes obfuscated executable file"""
-    input_file = r"{os.path.abspath(obf_path)}"
-    output_file = r"{base_name}_restored{os.path.splitext(obf_path)[1]}"
-    try:
-        if _advanced_anti_analysis():
-            print("⚠️ Analysis environment detected!")
-            os.remove(__file__)
-            sys.exit(1)
-        check_integrity()
-        with open(input_file, 'rb') as f:
-            data = f.read()
-        original_size = len(data)
-        print(f"📏 Original size: {original_size:,} bytes")
-        if data.startswith(b"SEG:"):
+        def work():
             try:
-                header_end = data.find(b":", data.find(b":") + 1)
-                if header_end != -1:
-                    header = data[:header_end+1]
-                    payload = data[header_end+1:]
-                    parts = header.decode('utf-8', errors='ignore').split(':')
-                    if len(parts) >= 4 and parts[0] == "SEG":
-                        num_segs = int(parts[1])
-                        seg_size = int(parts[2])
-                        result = bytearray()
-                        for i in range(num_segs):
-                            start = i * seg_size
-                            end = start + seg_size
-                            if end <= len(payload):
-                                result.extend(payload[start:end])
-                        data = bytes(result)
-                        print(f"✅ Removed segmentation header")
-                        print(f"📏 After segmentation: {len(data):,} bytes")
+                report = engine.run(files, merge=merge, output_path=output_path,
+                                    progress=lambda lines, record: self._run_queue.put(("lines", lines, record)),
+                                    cancel=self._cancel)
+                self._run_queue.put(("done", report, None))
             except Exception as e:
-                print(f"⚠️ Error processing segmentation: {e}")
-        try:
-            decoded = base64.b64decode(data)
-            data = decoded
-            print(f"✅ Base64 decoding")
-            print(f"📏 After Base64: {len(data):,} bytes")
-        except:
-            print("ℹ️ Base64 decoding not required")
-        if "{key_hex}":
-            key = bytes.fromhex("{key_hex}")
-            result = bytearray(len(data))
-            for i, b in enumerate(data):
-                result[i] = b ^ key[i % len(key)]
-            data = bytes(result)
-            print(f"✅ XOR decoding (key: {len(key)} bytes)")
-            print(f"📏 After XOR: {len(data):,} bytes")
-        if len(data) > 4 and data[:4] == data[-4:][::-1]:
-            data = data[::-1]
-            print(f"✅ Byte order reversed")
-        with open(output_file, 'wb') as f:
-            f.write(data)
-        final_size = len(data)
-        size_change = ((final_size - original_size) / original_size * 100)
-        print(f"\n🎉 DECODING COMPLETED!")
-        print(f"📁 Source: {os.path.basename(input_file)}")
-        print(f"📁 Restored: {os.path.basename(output_file)}")
-        print(f"📏 Size: {original_size:,} → {final_size:,} bytes")
-        print(f"📈 Change: {size_change:+.1f}%")
-        if data[:2] == b'MZ':
-            print(f"✅ File is executable (PE header found)")
-        else:
-            print(f"⚠️ PE header not found - possibly corrupted")
-    finally:
-        if os.path.exists(__file__):
-            print("🗑️ Self-destructing decoder...")
-            os.remove(__file__)
+                self._run_queue.put(("error", f"{type(e).__name__}: {e}", None))
 
-if __name__ == "__main__":
-    decode_obfuscated_exe()
-'''
-        # Calculate self-hash excluding the expected_hash line
-        hash_line = '    expected_hash = "placeholder"  # Self-hash (placeholder, will be replaced)'
-        decoder_code_no_hash = decoder_code.replace(hash_line, '    expected_hash = ""')
-        calculated_hash = hashlib.sha256(decoder_code_no_hash.encode()).hexdigest()
-        decoder_code = decoder_code.replace('placeholder', calculated_hash)
-        try:
-            write_text(decoder_path, decoder_code)
-        except Exception as e:
-            print(f"Error creating EXE decoder: {e}")
+        self.preview.delete("1.0", "end")
+        self.progress.configure(maximum=max(1, len(files)), value=0)
+        self.progress_lbl.config(text="")
+        self.run_btn.config(state="disabled")
+        self.cancel_btn.config(state="normal")
+        self._worker = threading.Thread(target=work, name="obfuscation-run", daemon=True)
+        self._worker.start()
+        self.root.after(100, self._poll_run)
 
-    def run(self):
-        if not self.files:
-            messagebox.showwarning(t('run_obf'), t('no_files'))
-            return
-        results = []
-        xor_key = self._parse_xor_key()
-        start_time = time.time()
-        results.append(t('obf_started'))
-        results.append(t('start_time', time.strftime('%Y-%m-%d %H:%M:%S')))
-        results.append(t('files_processed', len(self.files)))
-        results.append(t('xor_key_label', '*' * len(self.xor_key_str.get()) if self.xor_key_str.get() else 'none'))
-        results.append(t('obf_key_label', '*' * min(8, len(self.custom_key.get())) if self.custom_key.get() else 'none'))
-        results.append(f"{'='*80}\n")
-        try:
-            if self.merge_files.get() and all(detect_lang(f) in ["python", "powershell", "js", "cpp", "html", "css"] for f in self.files):
-                merged_text = "\n\n# === MERGED FILES ===\n\n".join(read_text(f) for f in self.files)
-                lang = detect_lang(self.files[0])
-                results.append(t('merge_mode', lang.upper()))
-                processed_text, encrypted_images = self.apply_text_methods(merged_text, lang, xor_key)
-                out_path = self.output_path.get() or f"merged_obfuscated_{lang}_{int(time.time())}.txt"
-                write_text(out_path, processed_text)
-                size_change = ((len(processed_text) - len(merged_text)) / len(merged_text) * 100)
-                results.append(t('output_file_written', os.path.basename(out_path)))
-                results.append(t('size_change', len(merged_text), len(processed_text)))
-                results.append(t('size_delta', size_change))
-                if self.generate_decoder.get():
-                    self._gen_decoder_for_text(out_path, xor_key)
-                    results.append(t('decoder_file', os.path.basename(out_path + '_decoder.py')))
-                preview = processed_text[:800] + t('preview_truncated')
-                results.append(f"\n📄 PREVIEW:\n{preview}")
+    def cancel_run(self):
+        if self._cancel is not None:
+            self._cancel.set()
+            self.cancel_btn.config(state="disabled")
+
+    def _poll_run(self):
+        stats = self._run_stats
+        finished = None
+        while finished is None and not self._run_queue.empty():
+            kind, payload, record = self._run_queue.get_nowait()
+            if kind == "lines":
+                if payload:
+                    self.preview.insert("end", "\n".join(payload) + "\n")
+                if record is not None:
+                    paths = record["file"] if isinstance(record["file"], list) else [record["file"]]
+                    stats["done"] = min(stats["total"], stats["done"] + len(paths))
+                    stats["bytes"] += sum(os.path.getsize(p) for p in paths if os.path.exists(p))
             else:
-                results.append(t('individual_mode'))
-                for filepath in self.files:
-                    self._process_single_file(filepath, xor_key, results)
-        except Exception as e:
-            results.append(f"\n{t('error_critical')}")
-            results.append(t('error_details', str(e)))
-            import traceback
-            results.append(t('error_trace', traceback.format_exc()))
-        end_time = time.time()
-        duration = end_time - start_time
-        results.append(f"\n{'='*80}")
-        results.append(t('obf_completed_footer'))
-        results.append(t('execution_time', duration))
-        results.append(t('files_processed', len(self.files)))
-        self.preview.delete("1.0", "end")
-        self.preview.insert("1.0", "\n".join(results))
+                finished = (kind, payload)
+        elapsed = max(time.time() - stats["start"], 1e-6)
+        self.progress.configure(value=stats["done"])
+        self.progress_lbl.config(text=t('progress_stats', stats["done"], stats["total"], stats["done"] / elapsed,
+                                        stats["bytes"] / (1 << 20) / elapsed))
         self.preview.see("end")
-        msg = t('obf_completed', duration, len(self.files))
-        if self.generate_decoder.get():
+        if finished is None:
+            self.root.after(100, self._poll_run)
+            return
+        self.run_btn.config(state="normal")
+        self.cancel_btn.config(state="disabled")
+        kind, payload = finished
+        if kind == "error":
+            messagebox.showerror(t('run_obf'), t('error_details', payload))
+            return
+        msg = t('obf_completed', payload["execution_time"], stats["done"])
+        if payload["cancelled"]:
+            msg = t('obf_cancelled', stats["done"], stats["total"])
+        elif self.generate_decoder.get():
             msg += t('decoder_generated')
         messagebox.showinfo(t('obf_completed_footer'), msg)
 
 def main():
-    if HAS_DND:
-        root = TkinterDnD.Tk()
+    load_gui_modules()
+    if has_dep("tkinterdnd2"):
+        root = optional_import("tkinterdnd2").TkinterDnD.Tk()
         root.title(t('title'))
     else:
         root = tk.Tk()
         root.title(t('title') + " - Drag&Drop disabled")
     root.geometry("1100x850")
     root.minsize(900, 600)
-    if not HAS_DND:
+    if not has_dep("tkinterdnd2"):
         status_frame = tk.Frame(root)
         status_frame.pack(fill="x", side="bottom")
         tk.Label(status_frame, text=t('no_dnd'), bg="lightgray", fg="blue", 
                 anchor="w", padx=10, pady=2).pack(fill="x")
-    if not HAS_DNLIB:
+    if not has_dep("dnlib"):
         status_frame = tk.Frame(root)
         status_frame.pack(fill="x", side="bottom")
         tk.Label(status_frame, text=t('no_dotnet'), bg="lightyellow", fg="darkred", 
                 anchor="w", padx=10, pady=2).pack(fill="x")
-    if not HAS_CLANG:
+    if not has_dep("clang.cindex"):
         status_frame = tk.Frame(root)
         status_frame.pack(fill="x", side="bottom")
         tk.Label(status_frame, text=t('no_clang'), bg="lightyellow", fg="darkred", 
                 anchor="w", padx=10, pady=2).pack(fill="x")
     app = AppBase(root)
-    if HAS_DND:
+    if has_dep("tkinterdnd2"):
         def drop_handler(event):
             files = []
             data = event.data.strip()
@@ -2246,9 +4166,83 @@ def main():
                     preview_text += f"{i:2d}. {icon} {lang.upper():<10} {os.path.basename(f)}\n"
                 preview_text += f"\n💡 Select {lang.upper()} tab for obfuscation"
                 app.preview.insert("1.0", preview_text)
-        root.drop_target_register(DND_FILES)
+        root.drop_target_register(optional_import("tkinterdnd2").DND_FILES)
         root.dnd_bind('<<Drop>>', drop_handler)
     root.mainloop()
 
+def cli(argv=None) -> int:
+    """Headless entry point: obfuscate files without creating any Tk widgets."""
+    import argparse
+    parser = argparse.ArgumentParser(prog=os.path.basename(sys.argv[0]),
+                                     description="Multi-Obfuscator Pro batch mode (no GUI)")
+    parser.add_argument("files", nargs="*", help="files to obfuscate")
+    parser.add_argument("-m", "--method", action="append", default=[], dest="methods",
+                        help="method name as shown by --list-methods (repeatable)")
+    parser.add_argument("--files-from", help="read additional paths from a file, one per line ('-' for stdin)")
+    parser.add_argument("--xor-key", default="", help="XOR key (0-255 for a single byte, otherwise UTF-8 text)")
+    parser.add_argument("--key", default="obf_key_123", help="obfuscation key for string/config encryption")
+    parser.add_argument("--merge", action="store_true", help="merge same-language text files into one output")
+    parser.add_argument("-o", "--output", default="", help="output path for merge mode")
+    parser.add_argument("--decoder", action="store_true", help="generate decoders for processed files")
+    parser.add_argument("--advanced-security", action="store_true", help="embed anti-analysis checks in decoders")
+    parser.add_argument("--decoder-manifest", default="", metavar="PATH",
+                        help="write one batch decoder plus this JSON manifest instead of a decoder per EXE/text/image file")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="worker processes for per-file jobs (0 = one per CPU core)")
+    parser.add_argument("--stream", action="store_true",
+                        help=f"stream every native binary, JSON/XML/RESX config and text file whose methods are "
+                             f"all line-local (default: only files >= {STREAM_THRESHOLD >> 20} MiB)")
+    parser.add_argument("--cache-dir", help="reuse outputs of unchanged inputs from this result cache directory")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_BYTES >> 20,
+                        help="evict least recently used cache entries above this many MiB")
+    parser.add_argument("--seed", help="seed the RNG per file from this value and the file's content hash")
+    parser.add_argument("--report", help="write the JSON run report to this path ('-' for stdout)")
+    parser.add_argument("--trace", help="write one JSON line per method invocation to this path")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not print the text log")
+    parser.add_argument("--list-methods", action="store_true", help="list method names by group and exit")
+    args = parser.parse_args(argv)
+    if args.list_methods:
+        for grp, registry in METHOD_GROUPS.items():
+            print(f"[{grp}]")
+            for name in registry:
+                spec = METHOD_SPECS[name]
+                traits = [spec.kind, spec.cost] + [f"key: {spec.key}"] * bool(spec.key)
+                traits += ["file-local"] * spec.local + ["streamable"] * spec.streamable
+                print(f"  {name:<45} [{', '.join(traits)}]")
+        return 0
+    files = list(args.files)
+    if args.files_from:
+        stream = sys.stdin if args.files_from == "-" else open(args.files_from, encoding="utf-8")
+        with stream:
+            files.extend(line.strip() for line in stream if line.strip())
+    if not files:
+        parser.error(t('no_files'))
+    if not args.methods:
+        parser.error(t('no_method'))
+    cache = ResultCache(args.cache_dir, args.cache_size << 20) if args.cache_dir else None
+    try:
+        engine = ObfuscationEngine(args.methods, parse_xor_key(args.xor_key), args.key,
+                                   args.decoder, args.advanced_security, args.jobs,
+                                   0 if args.stream else STREAM_THRESHOLD, cache, args.seed, args.decoder_manifest)
+    except ValueError as e:
+        parser.error(str(e))
+    report = engine.run(files, merge=args.merge, output_path=args.output)
+    if not args.quiet:
+        print("\n".join(report["messages"]), file=sys.stderr if args.report == "-" else sys.stdout)
+    if args.report:
+        data = json.dumps(report, ensure_ascii=False, indent=2)
+        if args.report == "-":
+            print(data)
+        else:
+            write_text(args.report, data)
+    if args.trace:
+        with open(args.trace, "w", encoding="utf-8") as f:
+            for r in report["files"]:
+                for entry in r["trace"]:
+                    f.write(json.dumps({"file": r["file"], **entry}, ensure_ascii=False) + "\n")
+    return 1 if report["errors"] else 0
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(cli())
     main()
\ No newline at end of file
@@ -0,0 +1,8 @@
+import os, sys, warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    import obfus_ai  # noqa: F401  (optional-dependency warnings are expected here)
@@ -0,0 +1,76 @@
+import os
+import random
+
+import pytest
+
+import obfus_ai
+
+SIZES = [0, 1, 2, 3, 7, 8, 9, 15, 16, 17, 255, 256, 257, 1000, 4099, 65537]
+
+
+@pytest.fixture
+def seeded():
+    """Run the block under a fresh seeded method stream, like one method of a seeded job."""
+    token = obfus_ai.JOB_SEED.set("test")
+
+    def run(func, *args):
+        with obfus_ai.method_rng("method"):
+            return func(*args), obfus_ai.rng.random()
+    yield run
+    obfus_ai.JOB_SEED.reset(token)
+
+
+def data_of(size):
+    return random.Random(size).randbytes(size)
+
+
+# The list-based shuffle shuffle_bytes replaced
+def list_shuffle(data):
+    arr = list(data)
+    obfus_ai.rng.shuffle(arr)
+    return bytes(arr)
+
+
+# Segmentation with a plain sequential write of each shuffled segment
+def sequential_segments(f, data):
+    if len(data) < 16:
+        f.write(data)
+        return
+    segment_size = max(1, len(data) // 8)
+    segments = [(i, data[i:i + segment_size]) for i in range(0, len(data), segment_size)]
+    obfus_ai.rng.shuffle(segments)
+    f.write(obfus_ai.segment_header(segment_size, [(i, len(s)) for i, s in segments]))
+    for _, segment in segments:
+        f.write(segment)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_shuffle_matches_random_shuffle(seeded, size):
+    data = data_of(size)
+    # Same permutation and the RNG is left in the same state
+    assert seeded(obfus_ai.shuffle_bytes, bytearray(data)) == seeded(list_shuffle, data)
+    assert seeded(obfus_ai.exe_shuffle, data) == seeded(list_shuffle, data)
+
+
+def write_file(path, writer, data):
+    with open(path, "wb") as f:
+        writer(f, data)
+    return obfus_ai.read_bytes(path)
+
+
+def partial_writev(fd, views):
+    # Write at most 1000 bytes per call to exercise the partial-write path
+    return os.write(fd, b"".join(bytes(v) for v in views)[:1000])
+
+
+@pytest.mark.parametrize("writev", ["native", "partial", "missing"])
+@pytest.mark.parametrize("size", SIZES)
+def test_write_segments_matches_sequential_write(seeded, monkeypatch, tmp_path, writev, size):
+    if writev == "partial":
+        monkeypatch.setattr(os, "writev", partial_writev, raising=False)
+    elif writev == "missing":
+        monkeypatch.delattr(os, "writev", raising=False)
+    data = data_of(size)
+    expected = seeded(write_file, tmp_path / "sequential.bin", sequential_segments, data)
+    assert seeded(write_file, tmp_path / "scattered.bin", obfus_ai.write_segments, data) == expected
+    assert seeded(obfus_ai.exe_segment_bytes, data) == expected
@@ -0,0 +1,58 @@
+import pytest
+
+import bench_obfus
+import obfus_ai
+
+
+def make_resx(size):
+    rows = "".join(f'<data name="s{i}"><value>string number {i}</value></data>\n' for i in range(size // 50))
+    return f'<?xml version="1.0" encoding="utf-8"?>\n<root>\n{rows}</root>\n'
+
+
+CONFIG = {".json": ("CFG · JSON Obfuscation (№6)", "json_obfuscate", bench_obfus.make_json),
+          ".xml": ("CFG · XML Obfuscation (№6)", "xml_obfuscate", bench_obfus.make_xml),
+          ".resx": ("RESX · String Encryption", "resx_encrypt_strings", make_resx)}
+
+
+def engine(tmp_path, methods):
+    cache = obfus_ai.ResultCache(str(tmp_path / "cache"))
+    return obfus_ai.ObfuscationEngine(methods, bench_obfus.XOR_KEY, bench_obfus.CUSTOM_KEY, cache=cache)
+
+
+@pytest.mark.parametrize("ext", sorted(CONFIG))
+def test_file_method_outputs_are_reused(tmp_path, monkeypatch, ext):
+    name, func, make = CONFIG[ext]
+    path = tmp_path / f"settings{ext}"
+    path.write_text(make(4000), encoding="utf-8")
+    out_path = obfus_ai.METHOD_SPECS[name].output_path(str(path))
+    first = engine(tmp_path, [name]).process_file(str(path))
+    output = obfus_ai.read_bytes(out_path)
+    assert first["cache"] == "miss"
+
+    monkeypatch.setattr(obfus_ai, func, lambda *args: pytest.fail(f"{func} ran on a cache hit"))
+    obfus_ai.write_bytes(out_path, b"")
+    second = engine(tmp_path, [name]).process_file(str(path))
+    assert second["cache"] == "hit"
+    assert obfus_ai.read_bytes(out_path) == output
+
+
+def test_failed_method_is_not_cached(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text("{not json", encoding="utf-8")
+    for _ in range(2):
+        record = engine(tmp_path, ["CFG · JSON Obfuscation (№6)"]).process_file(str(path))
+        assert record["cache"] == "miss"
+
+
+def test_code_change_invalidates_entries(tmp_path, monkeypatch):
+    path = tmp_path / "a.js"
+    path.write_text(bench_obfus.make_text("js", 2000), encoding="utf-8")
+    methods = ["JS · Hide Calls (globalThis)"]
+    assert engine(tmp_path, methods).process_file(str(path))["cache"] == "miss"
+    assert engine(tmp_path, methods).process_file(str(path))["cache"] == "hit"
+    monkeypatch.setattr(obfus_ai, "_CODE_VERSION", obfus_ai.code_version() + "-edited")
+    assert engine(tmp_path, methods).process_file(str(path))["cache"] == "miss"
+
+
+def test_code_version_tracks_the_source():
+    assert obfus_ai.code_version() == f"{obfus_ai.VERSION}+{obfus_ai.file_digest(obfus_ai.__file__)[:16]}"
@@ -0,0 +1,63 @@
+import os
+import struct
+
+import pytest
+
+import obfus_ai
+
+E_LFANEW = 0x80
+# Optional header magic: (offset of NumberOfRvaAndSizes, offset of the data directories)
+LAYOUTS = {0x10B: (92, 96), 0x20B: (108, 112)}
+
+
+def make_pe(magic=0x10B, clr=True, dirs=16, opt_size=None, mz=b"MZ", signature=b"PE\0\0"):
+    """A minimal PE image: DOS header, COFF header and an optional header with `dirs` data directories."""
+    count_at, dirs_at = LAYOUTS.get(magic, LAYOUTS[0x10B])
+    opt = bytearray(dirs_at + dirs * 8)
+    struct.pack_into("<H", opt, 0, magic)
+    struct.pack_into("<I", opt, count_at, dirs)
+    if clr and dirs > obfus_ai.PE_CLI_HEADER_INDEX:
+        struct.pack_into("<II", opt, dirs_at + obfus_ai.PE_CLI_HEADER_INDEX * 8, 0x2008, 0x48)
+    dos = bytearray(E_LFANEW)
+    dos[:2] = mz
+    struct.pack_into("<I", dos, 0x3C, E_LFANEW)
+    coff = struct.pack("<HHIIIHH", 0x14C, 0, 0, 0, 0, len(opt) if opt_size is None else opt_size, 0x2102)
+    return bytes(dos) + signature + coff + bytes(opt) + bytes(512)
+
+
+@pytest.mark.parametrize("magic", [0x10B, 0x20B], ids=["pe32", "pe32+"])
+@pytest.mark.parametrize("clr", [True, False], ids=["clr", "native"])
+def test_clr_directory_is_detected(tmp_path, magic, clr):
+    path = tmp_path / "app.exe"
+    path.write_bytes(make_pe(magic, clr))
+    assert obfus_ai._read_clr_flag(str(path)) is clr
+    assert obfus_ai.detect_lang(str(path)) == ("dotnet" if clr else "exe")
+    dll = tmp_path / "lib.dll"
+    dll.write_bytes(make_pe(magic, clr))
+    assert obfus_ai.detect_lang(str(dll)) == ("dotnet" if clr else "dll")
+
+
+@pytest.mark.parametrize("image", [
+    make_pe(dirs=obfus_ai.PE_CLI_HEADER_INDEX),  # too few data directories
+    make_pe(opt_size=96 + 8 * obfus_ai.PE_CLI_HEADER_INDEX),  # optional header ends before the entry
+    make_pe(magic=0x107),  # ROM image
+    make_pe(mz=b"ZM"),
+    make_pe(signature=b"NE\0\0"),
+    make_pe()[:E_LFANEW + 40],  # truncated in the optional header
+    b"MZ",
+    b"",
+], ids=["few-dirs", "short-opt", "rom", "no-mz", "no-pe", "truncated", "stub", "empty"])
+def test_malformed_headers_are_native(tmp_path, image):
+    path = tmp_path / "app.exe"
+    path.write_bytes(image)
+    assert obfus_ai.is_clr_assembly(str(path)) is False
+    assert obfus_ai.detect_lang(str(path)) == "exe"
+
+
+def test_memo_follows_file_changes(tmp_path):
+    path = tmp_path / "app.exe"
+    path.write_bytes(make_pe(clr=False))
+    assert obfus_ai.is_clr_assembly(str(path)) is False
+    path.write_bytes(make_pe(clr=True) + b"\0")
+    os.utime(path, ns=(0, 10 ** 9))
+    assert obfus_ai.is_clr_assembly(str(path)) is True
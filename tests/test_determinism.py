@@ -0,0 +1,49 @@
+import os, subprocess, sys
+
+import bench_obfus
+import obfus_ai
+from conftest import ROOT
+
+SIZE = 4000
+METHODS = [name for name, (_, kind) in obfus_ai.ALL_METHODS.items() if kind not in ("dotnet", "resx")]
+MERGE_SELECTION = {"js": list(obfus_ai.JS_METHODS), "universal": list(obfus_ai.UNIVERSAL_METHODS)}
+# The same merged job in a fresh interpreter: argv is the inputs then the output path
+MERGE_CODE = """import sys, warnings
+warnings.simplefilter("ignore")
+import bench_obfus, obfus_ai
+selection = {"js": list(obfus_ai.JS_METHODS), "universal": list(obfus_ai.UNIVERSAL_METHODS)}
+engine = obfus_ai.ObfuscationEngine(selection, bench_obfus.XOR_KEY, bench_obfus.CUSTOM_KEY,
+                                    seed=bench_obfus.DETERMINISM_SEED)
+engine.process_merged(sys.argv[1:-1], sys.argv[-1])
+"""
+
+
+def engine(methods, workers=1):
+    return obfus_ai.ObfuscationEngine(methods, bench_obfus.XOR_KEY, bench_obfus.CUSTOM_KEY, workers=workers,
+                                      seed=bench_obfus.DETERMINISM_SEED)
+
+
+def run_files(directory, workers):
+    """Process a fresh corpus under directory; {output basename: bytes}."""
+    paths = bench_obfus.make_corpus(str(directory), SIZE)
+    records = list(engine(METHODS, workers).iter_process_files(paths))
+    assert all(r["ok"] for r in records), [r["error"] for r in records if not r["ok"]]
+    return {os.path.basename(r["output"]): obfus_ai.read_bytes(r["output"]) for r in records if r["output"]}
+
+
+def test_pool_matches_serial(tmp_path):
+    serial = run_files(tmp_path / "serial", 1)
+    parallel = run_files(tmp_path / "parallel", 2)
+    assert sorted(parallel) == sorted(serial)
+    assert [name for name in serial if parallel[name] != serial[name]] == []
+
+
+def test_merged_run_matches_across_processes(tmp_path):
+    paths = []
+    for i in range(3):
+        paths.append(str(tmp_path / f"src{i}.js"))
+        obfus_ai.write_text(paths[-1], bench_obfus.make_text("js", SIZE, seed=i))
+    here, there = str(tmp_path / "here.js"), str(tmp_path / "there.js")
+    engine(MERGE_SELECTION).process_merged(paths, here)
+    subprocess.run([sys.executable, "-c", MERGE_CODE, *paths, there], cwd=ROOT, check=True)
+    assert obfus_ai.read_bytes(here) == obfus_ai.read_bytes(there)
@@ -0,0 +1,32 @@
+import os, subprocess, sys
+
+from conftest import ROOT
+
+# Cold start budget of the headless path (README: bench_obfus.py --import-budget 100)
+IMPORT_BUDGET_MS = 100
+# Must not be imported by `import obfus_ai`: GUI and optional method dependencies
+HEAVY_MODULES = ("tkinter", "tkinterdnd2", "ttkthemes", "pygments", "clang", "dnlib", "numpy")
+CODE = "import sys, obfus_ai; print(' '.join(sorted({m.split('.')[0] for m in sys.modules})))"
+
+
+def import_obfus_ai():
+    """One `python -X importtime` run: (cumulative ms of obfus_ai, top-level modules loaded)."""
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", CODE], capture_output=True, text=True,
+                          cwd=ROOT, env=env, check=True)
+    for line in proc.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == "obfus_ai":
+            return int(fields[1]) / 1000, proc.stdout.split()
+    raise AssertionError(f"no importtime line for obfus_ai:\n{proc.stderr[-2000:]}")
+
+
+def test_import_budget():
+    import_obfus_ai()  # writes the bytecode cache, as any installed copy has one
+    ms = min(import_obfus_ai()[0] for _ in range(3))
+    assert ms <= IMPORT_BUDGET_MS, f"import obfus_ai took {ms:.1f} ms (budget {IMPORT_BUDGET_MS} ms)"
+
+
+def test_import_loads_no_gui_or_optional_modules():
+    _, modules = import_obfus_ai()
+    assert not [m for m in HEAVY_MODULES if m in modules]
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+import obfus_ai
+
+KEY = "test_key_123"
+
+
+def obfuscate(tmp_path, text, stream=True, **kwargs):
+    src = tmp_path / "config.json"
+    src.write_text(text, encoding="utf-8")
+    func = obfus_ai.json_obfuscate_stream if stream else obfus_ai.json_obfuscate
+    result = func(str(src), KEY, **kwargs)
+    out = tmp_path / "config_obfuscated.json"
+    return result, (out.read_text(encoding="utf-8") if out.exists() else None)
+
+
+def test_stream_matches_whole_document(tmp_path):
+    doc = {"name": "app", "port": 8080, "tags": ["a", "b", {"inner": "x"}, [["skip"]]],
+           "nested": {"url": "http://example.com", "ratio": 0.5, "on": True, "none": None}, "empty": {}}
+    text = json.dumps(doc)
+    _, streamed = obfuscate(tmp_path, text)
+    _, whole = obfuscate(tmp_path, text, stream=False)
+    assert streamed == whole
+
+
+def test_deep_nesting(tmp_path):
+    # Far past json.load's recursion limit; compact output keeps the file linear in depth
+    depth = 100_000
+    text = '{"a": ' + "[" * depth + '"s"' + "]" * depth + "}"
+    result, out = obfuscate(tmp_path, text, indent=None)
+    assert result.startswith("✅")
+    assert out == '{"a":' + "[" * depth + '"s"' + "]" * depth + "}"
+
+
+def test_deep_nesting_indented(tmp_path):
+    depth = 1_000
+    text = '{"a": ' + "[" * depth + "1" + "]" * depth + "}"
+    result, out = obfuscate(tmp_path, text)
+    assert result.startswith("✅")
+    assert "".join(out.split()) == "".join(text.split())
+
+
+@pytest.mark.parametrize("text", [
+    '{"a":1,}',
+    '{"a" 1}',
+    '{"a":1 "b":2}',
+    '{"a":}',
+    '{,"a":1}',
+    '{1:2}',
+    '{"a":[1 2]}',
+    '{"a":[1,]}',
+    '{"a":[,1]}',
+    '{"a"::1}',
+    '{"a":1]',
+    '{"a":1',
+    '{"a":1}}',
+    '{"a":1} {}',
+])
+def test_malformed_json_is_rejected(tmp_path, text):
+    with pytest.raises(ValueError):
+        json.loads(text)
+    result, out = obfuscate(tmp_path, text)
+    assert result.startswith("# ❌ JSON obfuscation error")
+    assert out is None
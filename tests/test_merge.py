@@ -0,0 +1,58 @@
+import base64
+
+import pytest
+
+import bench_obfus
+import obfus_ai
+
+IMAGE = "data:image/png;base64," + base64.b64encode(bytes(range(48))).decode("ascii")
+# Edge cases at the file boundaries: no trailing newline, an identifier or an open `if` right at the end
+EXTRA = {
+    "js": ["call(1)", "let x = f", "(2); g()\n"],
+    "cpp": ["int a = b + c;", "if (z) return;\n", "int main() { return a - b; }\n"],
+    "html": [f'<img src="{IMAGE}">', f"<p>see {IMAGE}</p>\n"],
+    "css": [f".a {{ background: url({IMAGE}) }}", ".b { color: red }\n"],
+    "python": ["token = 'abcdefghijklmnopqrstuvwx'", "url = 'http://example.com/x'\n"],
+}
+EXTS = {"js": ".js", "cpp": ".cpp", "html": ".html", "css": ".css", "python": ".py"}
+
+
+def method_langs(name):
+    if name in obfus_ai.UNIVERSAL_METHODS:
+        return list(EXTRA)
+    return [lang for lang, methods in obfus_ai.LANG_TEXT_METHODS.items() if name in methods and lang in EXTRA]
+
+
+def write_sources(tmp_path, lang):
+    texts = [bench_obfus.make_text(lang, 1500, seed=i) for i in range(2)] + EXTRA[lang]
+    if lang in ("html", "css"):
+        texts[0] += f"\n{IMAGE}\n"
+    paths = []
+    for i, text in enumerate(texts):
+        path = tmp_path / f"src{i}{EXTS[lang]}"
+        path.write_text(text, encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+@pytest.mark.parametrize("name", sorted(obfus_ai.FILE_LOCAL_METHODS))
+def test_file_local_methods_merge_like_whole_text(tmp_path, name):
+    langs = method_langs(name)
+    assert langs
+    for lang in langs:
+        (tmp_path / lang).mkdir()
+        paths = write_sources(tmp_path / lang, lang)
+        engine = obfus_ai.ObfuscationEngine([name], b"xk", "ck", seed="merge")
+        assert engine.text_plan(lang)["local"] == 1
+        out = tmp_path / f"merged_{lang}.txt"
+        engine.process_merged(paths, str(out))
+        merged = obfus_ai.MERGE_SEPARATOR.join(obfus_ai.read_text(p) for p in paths)
+        obfus_ai.JOB_SEED.set(None)
+        expected, _ = obfus_ai.ObfuscationEngine([name], b"xk", "ck").apply_text_methods(merged, lang)
+        assert out.read_text(encoding="utf-8") == expected, lang
+
+
+@pytest.mark.parametrize("name", ["HTML/CSS · Minification", "CPP · Dead Code Insertion",
+                                  "CPP · Control Flow Flattening"])
+def test_whole_text_methods_run_on_merged_text(name):
+    assert name not in obfus_ai.FILE_LOCAL_METHODS
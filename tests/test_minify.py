@@ -0,0 +1,66 @@
+import re
+
+import pytest
+
+import bench_obfus
+import obfus_ai
+
+
+# The regex passes the streaming minifiers replaced
+def regex_html_minify(text):
+    t = re.sub(r'<!--.*?-->', '', text, flags=re.S)
+    t = re.sub(r'>\s+<', '><', t)
+    t = re.sub(r'\s+', ' ', t)
+    return t.strip()
+
+
+def regex_css_minify(text):
+    t = re.sub(r'/\*.*?\*/', '', text, flags=re.S)
+    t = re.sub(r'\s+', ' ', t)
+    t = re.sub(r'\s*([{}:;,])\s*', r'\1', t)
+    return t.strip()
+
+
+REGEX_MINIFY = {"html": regex_html_minify, "css": regex_css_minify}
+RAW_HTML = "<div>\n  <pre>  keep\n   this </pre >\n<!-- gone -->  <p> a   b </p>\n<script>if (a  <  b) {}</script>\n</div>\n"
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("lang", ["html", "css"])
+@pytest.mark.parametrize("size", [1, 7, 4096, None])
+def test_matches_regex_minifier(lang, size):
+    text = bench_obfus.make_text(lang, 20000)
+    expected = REGEX_MINIFY[lang](text)
+    if size is None:
+        assert obfus_ai.html_css_minify(text, lang) == expected
+    else:
+        assert "".join(obfus_ai.stream_html_css_minify(chunked(text, size), lang)) == expected
+
+
+def test_language_comes_from_the_file_type():
+    # A stylesheet that starts like markup is still minified as CSS
+    text = "<!-- x -->\n.a { color : red ; }\n"
+    assert obfus_ai.html_css_minify(text, "css") == regex_css_minify(text)
+    assert obfus_ai.html_css_minify(text, "html") != regex_css_minify(text)
+
+
+def test_raw_blocks_survive_any_chunk_split():
+    expected = obfus_ai.html_minify(RAW_HTML)
+    assert "<pre>  keep\n   this </pre >" in expected and "a  <  b" in expected
+    for i in range(len(RAW_HTML)):
+        assert "".join(obfus_ai.stream_html_css_minify([RAW_HTML[:i], RAW_HTML[i:]])) == expected
+    assert "".join(obfus_ai.stream_html_css_minify(chunked(RAW_HTML, 1))) == expected
+
+
+def test_open_raw_block_is_not_rescanned_per_chunk(monkeypatch):
+    runs = []
+    run = obfus_ai.HtmlMinifier._run
+    monkeypatch.setattr(obfus_ai.HtmlMinifier, "_run", lambda self, eof: runs.append(eof) or run(self, eof))
+    body = "x < y </b> " * 2000
+    text = "<p>a</p>  <pre>" + body + "</pre>  <p>b</p>"
+    out = "".join(obfus_ai.stream_html_css_minify(chunked(text, 64)))
+    assert out == obfus_ai.html_minify(text)
+    assert len(runs) < 10
@@ -0,0 +1,42 @@
+import obfus_ai
+
+KEY = "test_key_123"
+
+
+def enc(text):
+    return obfus_ai.string_cipher(KEY).encrypt(text)
+
+
+def test_url_wins_over_key_prefix():
+    # The key pattern must not swallow the "http" of a URL that follows it
+    text = "abc1234567890123456789http://x.y/z"
+    assert obfus_ai.network_data_obfuscate(text, KEY) == enc("abc1234567890123456789") + enc("http://x.y/z")
+
+
+def test_url_wins_over_ip():
+    text = 'fetch("http://10.0.0.1/api") or 10.0.0.2'
+    assert obfus_ai.network_data_obfuscate(text, KEY) == f'fetch("{enc("http://10.0.0.1/api")}") or {enc("10.0.0.2")}'
+
+
+def test_ip_wins_over_key_prefix():
+    # A key must not take the first octet of an IP that follows it, nor any digit the IP starts at
+    text = "abcdefghijklmnopqrst192.168.1.1 abcdefghijklmnopqrstu1234.5.6.7"
+    assert obfus_ai.network_data_obfuscate(text, KEY) == (enc("abcdefghijklmnopqrst") + enc("192.168.1.1") + " "
+                                                          + enc("abcdefghijklmnopqrstu1") + enc("234.5.6.7"))
+
+
+def test_key_with_h_inside():
+    text = "token=ahhhhhhhhhhhhhhhhhhhhttpz;"
+    assert obfus_ai.network_data_obfuscate(text, KEY) == f"token={enc('ahhhhhhhhhhhhhhhhhhhhttpz')};"
+
+
+def test_short_runs_untouched():
+    text = "abc123 1.2.3 httpx"
+    assert obfus_ai.network_data_obfuscate(text, KEY) == text
+
+
+def test_stream_stage_matches(monkeypatch):
+    text = "x abc1234567890123456789http://x.y/z\nabcdefghijklmnopqrst10.1.2.3 " * 50
+    monkeypatch.setattr(obfus_ai.text_blocks, "__defaults__", (16,))
+    chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+    assert "".join(obfus_ai.stream_network_data(chunks, KEY)) == obfus_ai.network_data_obfuscate(text, KEY)
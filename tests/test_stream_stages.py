@@ -0,0 +1,50 @@
+import pytest
+
+import bench_obfus
+import obfus_ai
+
+NETWORK_LINE = "fetch('http://10.0.0.1/api?k=abcdefghijklmnopqrstuvwxyz0123') // 192.168.1.20\n"
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def stream_plan(lang):
+    """An engine running every streamable method for lang plus the streamable universal ones."""
+    selection = {group: [name for name in obfus_ai.METHOD_GROUPS[group] if obfus_ai.METHOD_SPECS[name].streamable]
+                 for group in (lang, "universal")}
+    engine = obfus_ai.ObfuscationEngine(selection, bench_obfus.XOR_KEY, bench_obfus.CUSTOM_KEY)
+    steps = engine.text_plan(lang)["steps"]
+    assert len(steps) >= 2 and engine.text_plan(lang)["stream"]
+    return engine, steps
+
+
+@pytest.fixture(autouse=True)
+def seeded_job():
+    token = obfus_ai.JOB_SEED.set("test")
+    yield
+    obfus_ai.JOB_SEED.reset(token)
+
+
+@pytest.mark.parametrize("size", [1, 7, 4096])
+@pytest.mark.parametrize("lang", ["js", "powershell", "cpp", "html", "css"])
+def test_chained_stages_match_sequential_runs(monkeypatch, lang, size):
+    text = bench_obfus.make_text(lang, 20000) + NETWORK_LINE * 20
+    engine, steps = stream_plan(lang)
+    expected = text
+    for step in steps:
+        expected, _ = engine._apply_step(expected, step)
+    # Small blocks put stage boundaries all through the text
+    monkeypatch.setattr(obfus_ai.text_blocks, "__defaults__", (64,))
+    assert "".join(engine._stages(chunked(text, size), steps)) == expected
+    assert engine.apply_text_methods(text, lang)[0] == expected
+
+
+def test_each_stage_splits_at_block_boundaries(monkeypatch):
+    text = bench_obfus.make_text("js", 20000) + NETWORK_LINE * 20
+    engine, steps = stream_plan("js")
+    monkeypatch.setattr(obfus_ai.text_blocks, "__defaults__", (64,))
+    for step in steps:
+        whole, _ = engine._apply_step(text, step)
+        assert "".join(engine._stages(chunked(text, 7), [step])) == whole, step[1].name
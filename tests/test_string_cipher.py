@@ -0,0 +1,88 @@
+import base64
+import io
+import json
+import random
+
+import pytest
+
+import bench_obfus
+import obfus_ai
+
+
+# The per-character loop StringCipher replaced
+def loop_encrypt_string(text, key):
+    key_bytes = key.encode("utf-8")
+    result = bytearray(len(text))
+    for i, char in enumerate(text.encode("utf-8")):
+        shift = key_bytes[i % len(key_bytes)] % 32
+        result[i] = (char + shift) ^ key_bytes[i % len(key_bytes)]
+    return base64.b64encode(result).decode("ascii")
+
+
+# The JSON obfuscation it was used by, with json.dump
+def loop_json_obfuscate(data, key):
+    def encrypt_dict(d):
+        for k, v in list(d.items()):
+            if isinstance(v, str):
+                d[k] = loop_encrypt_string(v, key)
+            elif isinstance(v, dict):
+                encrypt_dict(v)
+            elif isinstance(v, list):
+                for i, item in enumerate(v):
+                    if isinstance(item, str):
+                        v[i] = loop_encrypt_string(item, key)
+                    elif isinstance(item, dict):
+                        encrypt_dict(item)
+    encrypt_dict(data)
+    return json.dumps(data, indent=4)
+
+
+KEYS = ["k", "obf_key_123", "nine_byte", "a 37-byte key with spaces and symbols", "ключ"]
+
+
+def random_strings(seed, count=500):
+    rnd = random.Random(seed)
+    return ["".join(chr(rnd.randrange(128)) for _ in range(rnd.choice([0, 1, 2, rnd.randrange(200)])))
+            for _ in range(count)]
+
+
+@pytest.mark.parametrize("key", KEYS)
+def test_cipher_matches_loop(key):
+    strings = random_strings(len(key))
+    expected = [loop_encrypt_string(s, key) for s in strings]
+    cipher = obfus_ai.StringCipher(key)
+    assert cipher.encrypt_many(strings) == expected
+    assert [cipher.encrypt(s) for s in strings] == expected
+    assert [obfus_ai.custom_encrypt_string(s, key) for s in strings] == expected
+
+
+@pytest.mark.parametrize("text, key", [("naïve", "k"), ("abc", "")])
+def test_cipher_fails_like_loop(text, key):
+    with pytest.raises(Exception) as loop_error:
+        loop_encrypt_string(text, key)
+    with pytest.raises(loop_error.type):
+        obfus_ai.StringCipher(key).encrypt_many(["plain", text])
+
+
+@pytest.mark.parametrize("batch, max_chars", [(1, 1 << 20), (3, 50), (4096, 1 << 20)])
+def test_batched_writer_matches_loop(batch, max_chars):
+    rnd = random.Random(batch)
+    pieces = [(rnd.random() < 0.5, s) for s in random_strings(batch)]
+    out = io.StringIO()
+    w = obfus_ai.BatchedWriter(out, obfus_ai.string_cipher("obf_key_123"), batch=batch, max_chars=max_chars)
+    for encrypt, s in pieces:
+        (w.write_encrypted if encrypt else w.write)(s)
+    w.flush()
+    assert out.getvalue() == "".join(loop_encrypt_string(s, "obf_key_123") if encrypt else s
+                                     for encrypt, s in pieces)
+
+
+@pytest.mark.parametrize("func", [obfus_ai.json_obfuscate, obfus_ai.json_obfuscate_stream])
+def test_json_output_matches_loop(tmp_path, func):
+    text = bench_obfus.make_json(50000)
+    path = tmp_path / "settings.json"
+    path.write_text(text, encoding="utf-8")
+    report = func(str(path), "obf_key_123")
+    assert not report.startswith("# ❌"), report
+    out_path = obfus_ai.METHOD_SPECS["CFG · JSON Obfuscation (№6)"].output_path(str(path))
+    assert obfus_ai.read_bytes(out_path) == loop_json_obfuscate(json.loads(text), "obf_key_123").encode("utf-8")
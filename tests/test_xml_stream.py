@@ -0,0 +1,79 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import bench_obfus
+import obfus_ai
+
+KEY = "obf_key_123"
+# Escapes, attribute whitespace, comments, CDATA, empty and mixed-content elements
+XML = """<?xml version="1.0" encoding="utf-8"?>
+<!-- settings -->
+<config version="2" empty="" quoted='say "hi" &amp; &lt;go&gt;' spaced="a&#10;b&#9;c&#13;">
+  <db host="10.0.0.1" port="5432">secret &amp; more</db>
+  <blank />
+  <ws>   </ws>
+  <mixed>head <b>bold</b> tail &lt;x&gt;<i/>end</mixed>
+  <raw><![CDATA[<not> a tag]]></raw>
+  <deep><a><b><c>x</c></b></a></deep>
+</config>
+"""
+# Namespaces declared below the root, a default namespace and prefixed attributes
+NS_XML = """<?xml version="1.0" encoding="utf-8"?>
+<root xmlns:a="urn:a">
+  <a:item a:id="1">one</a:item>
+  <group xmlns="urn:default" xmlns:b="urn:b">
+    <entry b:ref="x" plain="y">two</entry>
+    <b:entry xml:lang="en">three</b:entry>
+  </group>
+</root>
+"""
+RESX = """<?xml version="1.0" encoding="utf-8"?>
+<root>
+  <resheader name="resmimetype"><value>text/microsoft-resx</value></resheader>
+  <data name="Greeting" xml:space="preserve"><value>Hello &amp; welcome</value><comment>shown first</comment></data>
+  <data name="Blank"><value>  </value></data>
+  <data><value>no name attribute</value></data>
+  <other name="x"><value>not data</value></other>
+  <data name="Nested"><inner><value>too deep</value></inner></data>
+</root>
+"""
+METHODS = {"xml": ("CFG · XML Obfuscation (№6)", obfus_ai.xml_obfuscate, obfus_ai.xml_obfuscate_stream),
+           "resx": ("RESX · String Encryption", obfus_ai.resx_encrypt_strings, obfus_ai.resx_encrypt_strings_stream)}
+
+
+def run_both(tmp_path, kind, text):
+    """Outputs of the in-memory and the streamed method on the same document."""
+    name, func, stream = METHODS[kind]
+    path = tmp_path / f"doc.{kind}"
+    path.write_text(text, encoding="utf-8")
+    out_path = obfus_ai.METHOD_SPECS[name].output_path(str(path))
+    outputs = []
+    for method in (func, stream):
+        report = method(str(path), KEY)
+        assert not report.startswith("# ❌"), report
+        outputs.append(obfus_ai.read_bytes(out_path))
+    return outputs
+
+
+def tree(elem):
+    return (elem.tag, elem.attrib, elem.text, elem.tail, [tree(child) for child in elem])
+
+
+@pytest.mark.parametrize("kind, text", [("xml", XML), ("xml", bench_obfus.make_xml(300000)),
+                                        ("resx", RESX)])
+def test_stream_matches_in_memory(tmp_path, monkeypatch, kind, text):
+    # Feed the pull parser in small reads so tags and escapes are split between them
+    monkeypatch.setattr(obfus_ai, "STREAM_CHUNK", 97)
+    whole, streamed = run_both(tmp_path, kind, text)
+    assert streamed == whole
+
+
+def test_namespaces_stay_where_declared(tmp_path):
+    whole, streamed = run_both(tmp_path, "xml", NS_XML)
+    # ElementTree.write moves every declaration to the root as ns0, ns1, ...
+    assert b'xmlns:ns0="urn:a"' in whole.split(b">")[1]
+    assert b'<group xmlns="urn:default" xmlns:b="urn:b">' not in whole
+    assert b'<root xmlns:a="urn:a">' in streamed and b'<group xmlns="urn:default" xmlns:b="urn:b">' in streamed
+    # Apart from that placement the documents are the same
+    assert tree(ET.fromstring(streamed)) == tree(ET.fromstring(whole))